@@ -0,0 +1,655 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - Benchmarks
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   Benchmarks for every public DipoleToolKit_v7 function, scalar (one call)
+#   and bulk (a whole batch per call), so a change that slows down batch work
+#   shows up before it ships. Each benchmark reports ops/sec, p50/p99 latency
+#   and allocations per call; results are saved as JSON to compare commits.
+#   Run with:  python DipoleToolKit_Benchmark.py [-o results.json] [--compare old.json] [--quick]
+#   or, to check only the `length` command's import cost (exit status 1 if
+#   over budget):  python DipoleToolKit_Benchmark.py --check-imports
+#
+# ------------------------------------------------------------------------------
+
+import argparse
+import datetime
+import functools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+import DipoleToolKit_v7 as toolkit
+
+RESULTS_VERSION = 1  # Bump when the JSON layout changes
+
+
+def linear_scan_band(frequency_mhz):
+    """
+    Reference frequency -> band lookup that walks every band segment in turn.
+
+    Args:
+        frequency_mhz (float): The frequency in MHz.
+
+    Returns:
+        tuple: (band, segment number), or None if the frequency is outside every band.
+    """
+    for band, band_entry in toolkit.rac_band_table.items():
+        for segment, (low, high) in enumerate(band_entry['segments']):
+            if low <= frequency_mhz <= high:
+                return band, segment
+    return None
+
+
+def uncached_band_frequency(band):
+    """
+    Reference band -> center frequency lookup that parses the band plan entry on every call.
+
+    Args:
+        band (str): The amateur radio band (e.g., '20m').
+
+    Returns:
+        float: The center of the band's first segment in MHz, or None if the band is not found.
+    """
+    frequency_range = toolkit.rac_band_plan.get(band)
+    if frequency_range is None:
+        return None
+    try:
+        segments = toolkit.parse_band_range(frequency_range)
+    except (ValueError, IndexError):
+        return None
+    low, high = segments[0]
+    return low + (high - low) / 2
+
+
+def sample_frequencies(count, seed=73):
+    """
+    Builds a reproducible mix of in-band and out-of-band frequencies.
+
+    Args:
+        count (int): How many frequencies to make.
+        seed (int): Random seed, so runs can be compared.
+
+    Returns:
+        list: Frequencies in MHz.
+    """
+    rng = random.Random(seed)
+    segments = [segment for band_entry in toolkit.rac_band_table.values()
+                for segment in band_entry['segments']]
+    frequencies = []
+    for _ in range(count):
+        if rng.random() < 0.8:
+            low, high = rng.choice(segments)
+            frequencies.append(rng.uniform(low, high))
+        else:
+            frequencies.append(rng.uniform(1.0, 250000.0))
+    return frequencies
+
+
+def time_per_call(function, arguments, repeat=5):
+    """
+    Times a function over a list of arguments.
+
+    Args:
+        function (callable): The function to time, called with one argument.
+        arguments (list): The arguments to call it with.
+        repeat (int): How many passes to time; the fastest is kept.
+
+    Returns:
+        float: Seconds per call.
+    """
+    def run():
+        for argument in arguments:
+            function(argument)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(arguments)
+
+
+def benchmark_band_lookup(count=100000):
+    """
+    Compares band_for_frequency against a linear scan over the band table.
+
+    Args:
+        count (int): How many frequencies to look up per pass.
+
+    Returns:
+        dict: Seconds per call for each lookup and the speed-up factor.
+    """
+    frequencies = sample_frequencies(count)
+    for frequency in frequencies:  # Both lookups must agree before timing them
+        if toolkit.band_for_frequency(frequency) != linear_scan_band(frequency):
+            raise AssertionError(f"Lookups disagree at {frequency} MHz")
+
+    indexed = time_per_call(toolkit.band_for_frequency, frequencies)
+    linear = time_per_call(linear_scan_band, frequencies)
+    results = {
+        'band_for_frequency': indexed,
+        'linear_scan': linear,
+        'speedup': linear / indexed,
+    }
+
+    try:
+        import numpy as np
+    except ImportError:
+        return results  # Batch lookups need NumPy
+    frequency_array = np.array(frequencies)
+    batch = min(timeit.repeat(lambda: toolkit.bands_for_frequencies(frequency_array),
+                              number=1, repeat=5))
+    results['bands_for_frequencies'] = batch / count
+    return results
+
+
+def benchmark_vectorized(count=1000000):
+    """
+    Compares the array length/correction functions against a Python loop.
+
+    Args:
+        count (int): How many frequencies per pass.
+
+    Returns:
+        dict: Seconds per pass for the loop and array forms and the speed-ups.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(73)
+    frequencies = rng.uniform(1.8, 450.0, count)
+    frequencies[::1000] = 0.0  # Keep some invalid entries in the mix
+    frequency_list = frequencies.tolist()
+    target = 14.175
+
+    def loop_lengths():
+        return [toolkit.calculate_dipole_length(f) for f in frequency_list]
+
+    def loop_corrections():
+        return [toolkit.calculate_length_correction(target, f) for f in frequency_list]
+
+    if not np.allclose(toolkit.calculate_dipole_lengths(frequencies), loop_lengths()):
+        raise AssertionError("calculate_dipole_lengths disagrees with calculate_dipole_length")
+
+    results = {
+        'lengths_loop': min(timeit.repeat(loop_lengths, number=1, repeat=3)),
+        'lengths_array': min(timeit.repeat(
+            lambda: toolkit.calculate_dipole_lengths(frequencies), number=1, repeat=5)),
+        'corrections_loop': min(timeit.repeat(loop_corrections, number=1, repeat=3)),
+        'corrections_array': min(timeit.repeat(
+            lambda: toolkit.calculate_length_corrections(target, frequencies), number=1, repeat=5)),
+    }
+    results['lengths_speedup'] = results['lengths_loop'] / results['lengths_array']
+    results['corrections_speedup'] = results['corrections_loop'] / results['corrections_array']
+    return results
+
+
+# Run in a fresh interpreter: import the toolkit, then time having every plan compiled
+_COLD_START_SCRIPT = """
+import sys, time
+import DipoleToolKit_v7 as toolkit
+toolkit.BAND_PLAN_DIRECTORY = sys.argv[1]
+started = time.perf_counter()
+if len(sys.argv) > 2:
+    toolkit.load_band_plan_cache(sys.argv[2])
+for key in toolkit.list_band_plans():
+    toolkit.get_band_table(key)
+print(time.perf_counter() - started)
+"""
+
+
+def benchmark_band_plan_loading(plans=50, runs=5, budget_ms=20.0):
+    """
+    Cold start with many band plans: parsing every plan file against the binary cache.
+
+    Copies of the plan files in BandPlans/ are written to a temporary directory
+    under made-up keys and a cache is built for them (under a name of its own,
+    so the parsing runs do not find it); each run starts a new interpreter
+    that loads every plan.
+
+    Args:
+        plans (int): How many band plans to load.
+        runs (int): Fresh interpreters per way of loading (the median is kept).
+        budget_ms (float): Cold start budget for the cached load.
+
+    Returns:
+        dict: Median milliseconds to load every plan 'parsed' and 'cached', and 'within_budget'.
+    """
+    import shutil
+    import statistics
+    import tempfile
+
+    sources = sorted(path for path in (os.path.join(toolkit.BAND_PLAN_DIRECTORY, name)
+                                       for name in os.listdir(toolkit.BAND_PLAN_DIRECTORY))
+                     if path.endswith('.txt') and not path.endswith('regions.txt'))
+    directory = tempfile.mkdtemp(prefix='bandplans-')
+    cache_path = os.path.join(directory, 'benchmark.cache')
+    try:
+        for number in range(plans):
+            shutil.copyfile(sources[number % len(sources)], os.path.join(directory, f'X{number:02d}.txt'))
+        saved_directory, saved_files = toolkit.BAND_PLAN_DIRECTORY, toolkit._band_plan_files
+        toolkit.BAND_PLAN_DIRECTORY, toolkit._band_plan_files = directory, None
+        try:
+            toolkit.build_band_plan_cache(cache_path)
+        finally:
+            toolkit._close_band_plan_cache()
+            toolkit.BAND_PLAN_DIRECTORY, toolkit._band_plan_files = saved_directory, saved_files
+
+        here = os.path.dirname(os.path.abspath(toolkit.__file__))
+        results = {}
+        for mode, arguments in (('parsed', [directory]), ('cached', [directory, cache_path])):
+            times = [float(subprocess.run([sys.executable, '-c', _COLD_START_SCRIPT] + arguments,
+                                          cwd=here, capture_output=True, text=True, check=True).stdout)
+                     for _ in range(runs)]
+            results[mode] = statistics.median(times) * 1000
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    results['within_budget'] = results['cached'] <= budget_ms
+    return results
+
+
+IMPORT_BUDGET_MS = 15.0  # Import cost budget for the `length` command, the toolkit's own import included
+# Modules the `length` command has no use for; importing any of them means a lazy import was lost
+LENGTH_UNWANTED_IMPORTS = ('numpy', 'asyncio', 'concurrent', 'json', 'shutil', 'mmap', 'zlib',
+                           'DipoleToolKit_Logs', 'DipoleToolKit_Cluster', 'DipoleToolKit_Service')
+
+
+def _import_times(arguments):
+    """
+    Runs a fresh interpreter with -X importtime.
+
+    Returns:
+        dict: Top-level module name -> cumulative import time in microseconds.
+    """
+    stderr = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=os.path.dirname(
+        os.path.abspath(__file__)), capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('| imported package'):  # Or the header
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):  # Indented names were imported by another module
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+# A `length` run as a fresh interpreter sees it: the toolkit imported as a module, then the command
+_LENGTH_COMMAND_SCRIPT = "import sys, DipoleToolKit_v7 as toolkit; sys.exit(toolkit.run_command(sys.argv[1:]))"
+
+
+def check_import_budget(budget_ms=IMPORT_BUDGET_MS, runs=5):
+    """
+    Import cost of a one-row `length` batch run, as measured by python -X importtime.
+
+    The toolkit is imported as a module (as `python -m DipoleToolKit_v7` does),
+    so its own import counts: its module-level setup (compiling the RAC band
+    plan and so on) plus everything it and the command pull in. Modules every
+    interpreter imports at startup (those a bare `python -c pass` also imports)
+    are left out. The bytecode cache is written first, as any normal import
+    would, and the cheapest of several runs is kept.
+
+    Running the file as a script (`python DipoleToolKit_v7.py`) also compiles
+    its source on every call; that is reported as 'compile_ms' but not held
+    to the budget, since `python -m` avoids it.
+
+    Args:
+        budget_ms (float): Most the command's imports may cost.
+        runs (int): Fresh interpreters to measure.
+
+    Returns:
+        dict: 'import_ms', 'slowest' (the five costliest top-level imports as
+              (name, ms)), 'unwanted' (modules from LENGTH_UNWANTED_IMPORTS that got
+              imported), 'compile_ms' and 'within_budget' (within budget and nothing unwanted).
+    """
+    import py_compile
+    import tempfile
+
+    source_path = os.path.abspath(toolkit.__file__)
+    py_compile.compile(source_path, doraise=True)
+    with open(source_path, encoding='utf-8') as source_file:
+        source = source_file.read()
+    compile_ms = min(timeit.repeat(lambda: compile(source, source_path, 'exec'), number=1, repeat=3)) * 1000
+
+    with tempfile.TemporaryDirectory() as directory:
+        rows = os.path.join(directory, 'rows.csv')
+        with open(rows, 'w', newline='') as rows_file:
+            rows_file.write('band,frequency_mhz\n40m,\n')
+        command = ['-c', _LENGTH_COMMAND_SCRIPT, 'length', rows, '-o', os.devnull]
+        startup = set(_import_times(['-c', 'pass']))
+        measured = []
+        for _ in range(runs):
+            times = {name: microseconds for name, microseconds in _import_times(command).items()
+                     if name not in startup}
+            measured.append((sum(times.values()) / 1000, times))
+    import_ms, times = min(measured, key=lambda item: item[0])
+    unwanted = sorted(name for name in times if name.split('.')[0] in LENGTH_UNWANTED_IMPORTS)
+    slowest = sorted(times.items(), key=lambda item: -item[1])[:5]
+    return {'import_ms': import_ms, 'slowest': [(name, microseconds / 1000) for name, microseconds in slowest],
+            'unwanted': unwanted, 'compile_ms': compile_ms,
+            'within_budget': import_ms <= budget_ms and not unwanted}
+
+
+def measure(call, calls_per_sample, samples):
+    """
+    Times a zero-argument callable.
+
+    Calls are timed in groups of calls_per_sample so the clock's own cost stays
+    out of the way; each group gives one latency sample (its mean per call).
+
+    Args:
+        call (callable): One operation.
+        calls_per_sample (int): Calls per timed group.
+        samples (int): Number of timed groups.
+
+    Returns:
+        dict: 'mean_ns', 'p50_ns' and 'p99_ns' per call.
+    """
+    for _ in range(calls_per_sample):  # Warm up caches before timing
+        call()
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        for _ in range(calls_per_sample):
+            call()
+        timings.append((time.perf_counter_ns() - start) / calls_per_sample)
+    timings.sort()
+    return {
+        'mean_ns': sum(timings) / len(timings),
+        'p50_ns': timings[len(timings) // 2],
+        'p99_ns': timings[int(0.99 * (len(timings) - 1))],
+    }
+
+
+def count_allocations(call, calls=200):
+    """
+    Measures how much memory a callable allocates.
+
+    Python does not count allocations directly, so two views are reported:
+    the peak bytes traced during one call (its temporary objects) and the
+    memory blocks still held after many calls, per call (growth, e.g. caches).
+
+    Args:
+        call (callable): One operation.
+        calls (int): Calls used for the held-blocks figure.
+
+    Returns:
+        dict: 'peak_bytes_per_call' and 'held_blocks_per_call'.
+    """
+    call()
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(calls):
+        call()
+    held_blocks = (sys.getallocatedblocks() - blocks_before) / calls
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'peak_bytes_per_call': peak - baseline, 'held_blocks_per_call': held_blocks}
+
+
+def build_suite(quick=False):
+    """
+    Lists the benchmarks to run.
+
+    Args:
+        quick (bool): Use smaller batches (for a fast sanity run).
+
+    Returns:
+        list: (name, kind, call, items per call) tuples; kind is 'scalar' or 'bulk'.
+    """
+    bulk_size = 1000 if quick else 10000
+    array_size = 10000 if quick else 1000000
+    rng = random.Random(73)
+    band_names = list(toolkit.rac_band_plan) + ['11m', '', '20 m']  # A few misses too
+    bands = [rng.choice(band_names) for _ in range(bulk_size)]
+    frequencies = [rng.uniform(1.8, 450.0) for _ in range(bulk_size)]
+    frequency_strings = [edge.strip() for frequency_range in toolkit.rac_band_plan.values()
+                         for edge in frequency_range.split('/')[0].split('-')]
+    frequency_strings = (frequency_strings * (bulk_size // len(frequency_strings) + 1))[:bulk_size]
+    lookup_frequencies = sample_frequencies(bulk_size)
+
+    def loop(function, arguments):
+        def run():
+            for argument in arguments:
+                function(argument)
+        return run
+
+    def loop_corrections():
+        for frequency in frequencies:
+            toolkit.calculate_length_correction(14.175, frequency)
+
+    def draw_bands():
+        toolkit.display_bands(toolkit.rac_band_plan)
+
+    band_table = toolkit.get_band_table()
+
+    def table_band_frequency():
+        # The plain compiled-table read the lookup fronts: get_band_frequency should stay close to it
+        return band_table['20m']['center']
+
+    def format_bands_uncached():
+        toolkit._format_band_grid.cache_clear()
+        toolkit.display_bands(toolkit.rac_band_plan, as_string=True)
+
+    suite = [
+        ('calculate_dipole_length', 'scalar', functools.partial(toolkit.calculate_dipole_length, 14.175), 1),
+        ('calculate_dipole_length', 'bulk', loop(toolkit.calculate_dipole_length, frequencies), bulk_size),
+        ('calculate_length_correction', 'scalar',
+         functools.partial(toolkit.calculate_length_correction, 14.175, 14.0), 1),
+        ('calculate_length_correction', 'bulk', loop_corrections, bulk_size),
+        ('convert_frequency_to_mhz', 'scalar', functools.partial(toolkit.convert_frequency_to_mhz, '5.650 GHz'), 1),
+        ('convert_frequency_to_mhz', 'bulk', loop(toolkit.convert_frequency_to_mhz, frequency_strings), bulk_size),
+        ('get_band_frequency', 'scalar', functools.partial(toolkit.get_band_frequency, '20m'), 1),
+        ('get_band_frequency', 'bulk', loop(toolkit.get_band_frequency, bands), bulk_size),
+        ('get_band_frequency(uncached)', 'scalar', functools.partial(uncached_band_frequency, '20m'), 1),
+        ('get_band_frequency(uncached)', 'bulk', loop(uncached_band_frequency, bands), bulk_size),
+        ('get_band_frequency(table)', 'scalar', table_band_frequency, 1),
+        ('get_band_resonance_center_frequency', 'scalar',
+         functools.partial(toolkit.get_band_resonance_center_frequency, '40m'), 1),
+        ('get_band_resonance_center_frequency', 'bulk',
+         loop(toolkit.get_band_resonance_center_frequency, bands), bulk_size),
+        ('get_band_dipole_length', 'scalar', functools.partial(toolkit.get_band_dipole_length, '2m'), 1),
+        ('get_band_segments', 'scalar', functools.partial(toolkit.get_band_segments, '1.25m'), 1),
+        ('band_for_frequency', 'scalar', functools.partial(toolkit.band_for_frequency, 14.074), 1),
+        ('band_for_frequency', 'bulk', loop(toolkit.band_for_frequency, lookup_frequencies), bulk_size),
+        ('display_bands', 'scalar', draw_bands, 1),
+        ('display_bands(as_string)', 'scalar',
+         functools.partial(toolkit.display_bands, toolkit.rac_band_plan, as_string=True), 1),
+        ('display_bands(uncached)', 'scalar', format_bands_uncached, 1),
+    ]
+
+    try:
+        import numpy as np
+    except ImportError:
+        return suite  # The array forms need NumPy
+    array_rng = np.random.default_rng(73)
+    frequency_array = array_rng.uniform(1.8, 450.0, array_size)
+    lookup_array = np.array(sample_frequencies(array_size if quick else 100000) * (1 if quick else 10))
+    suite += [
+        ('calculate_dipole_lengths', 'bulk',
+         functools.partial(toolkit.calculate_dipole_lengths, frequency_array), array_size),
+        ('calculate_length_corrections', 'bulk',
+         functools.partial(toolkit.calculate_length_corrections, 14.175, frequency_array), array_size),
+        ('bands_for_frequencies', 'bulk',
+         functools.partial(toolkit.bands_for_frequencies, lookup_array), len(lookup_array)),
+    ]
+    return suite
+
+
+def run_suite(quick=False):
+    """
+    Runs every benchmark in the suite.
+
+    Args:
+        quick (bool): Use smaller batches and fewer samples.
+
+    Returns:
+        dict: Benchmark name ('function [scalar|bulk]') -> results; per-call figures
+              are per operation call, 'items_per_sec' counts the items in a bulk call.
+    """
+    results = {}
+    real_stream = toolkit.screen.stream
+    toolkit.screen.stream = open(os.devnull, 'w')  # display_bands draws somewhere harmless
+    try:
+        for name, kind, call, items in build_suite(quick):
+            if kind == 'scalar':
+                timing = measure(call, calls_per_sample=100 if quick else 1000, samples=50 if quick else 200)
+            else:
+                timing = measure(call, calls_per_sample=1, samples=5 if quick else 30)
+            result = {
+                'kind': kind,
+                'items_per_call': items,
+                'ops_per_sec': 1e9 / timing['mean_ns'],
+                'items_per_sec': 1e9 * items / timing['mean_ns'],
+            }
+            result.update(timing)
+            result.update(count_allocations(call, calls=20 if kind == 'bulk' else 200))
+            results[f"{name} [{kind}]"] = result
+    finally:
+        toolkit.screen.stream.close()
+        toolkit.screen.stream = real_stream
+    return results
+
+
+def git_commit():
+    """Returns the current git commit of the toolkit, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results, path):
+    """
+    Saves benchmark results as JSON, with enough context to compare runs.
+
+    Args:
+        results (dict): From run_suite.
+        path (str): The JSON file to write.
+    """
+    document = {
+        'version': RESULTS_VERSION,
+        'commit': git_commit(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w') as results_file:
+        json.dump(document, results_file, indent=2)
+
+
+def compare_results(results, path):
+    """
+    Prints each benchmark's speed against a saved run.
+
+    Args:
+        results (dict): From run_suite.
+        path (str): A JSON file written by save_results.
+    """
+    with open(path) as results_file:
+        baseline = json.load(results_file)
+    print(f"\nCompared with {path} (commit {baseline.get('commit')}); above 1.00x is faster now:")
+    for name, result in results.items():
+        old = baseline['results'].get(name)
+        if old is None:
+            print(f"\t {name:50s}        new")
+            continue
+        print(f"\t {name:50s} {old['mean_ns'] / result['mean_ns']:8.2f}x")
+
+
+def print_results(results):
+    """Prints the results as a table."""
+    print(f"\n\t {'Benchmark':50s} {'ops/sec':>12s} {'p50':>10s} {'p99':>10s} {'peak B':>9s} {'held':>6s}")
+    for name, result in results.items():
+        print(f"\t {name:50s} {result['ops_per_sec']:12.0f} {_format_ns(result['p50_ns']):>10s} "
+              f"{_format_ns(result['p99_ns']):>10s} {result['peak_bytes_per_call']:9d} "
+              f"{result['held_blocks_per_call']:6.2f}")
+
+
+def _format_ns(nanoseconds):
+    """Formats a duration in the most readable unit."""
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if nanoseconds >= scale:
+            return f"{nanoseconds / scale:.2f} {unit}"
+    return f"{nanoseconds:.0f} ns"
+
+
+def main():
+    """
+    Runs the benchmark suite, prints and saves the results.
+
+    Returns:
+        int: The exit status (1 if --check-imports finds the import cost over budget).
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks for DipoleToolKit_v7.")
+    parser.add_argument('-o', '--output', help="JSON file for the results (default: benchmark-<commit>.json)")
+    parser.add_argument('--compare', help="Earlier results JSON to compare against")
+    parser.add_argument('--quick', action='store_true', help="Smaller batches, for a fast sanity run")
+    parser.add_argument('--check-imports', action='store_true',
+                        help=f"Only check the `length` command's import cost against its "
+                             f"{IMPORT_BUDGET_MS:g} ms budget (exit status 1 if over)")
+    args = parser.parse_args()
+
+    if args.check_imports:
+        imports = check_import_budget()
+        print(f"Import cost of `length`: {imports['import_ms']:.2f} ms (budget {IMPORT_BUDGET_MS:g} ms)")
+        for name, milliseconds in imports['slowest']:
+            print(f"\t {name:<24} {milliseconds:8.2f} ms")
+        if imports['unwanted']:
+            print(f"Imported but not needed: {', '.join(imports['unwanted'])}")
+        print(f"Running it as a script also compiles the source: {imports['compile_ms']:.2f} ms a call"
+              " (python -m DipoleToolKit_v7 uses the cached bytecode)")
+        return 0 if imports['within_budget'] else 1
+
+    results = run_suite(quick=args.quick)
+    print_results(results)
+    if args.compare:
+        compare_results(results, args.compare)
+
+    output = args.output or f"benchmark-{git_commit() or 'local'}.json"
+    save_results(results, output)
+    print(f"\nResults saved to {output}")
+
+    lookup = benchmark_band_lookup(10000 if args.quick else 100000)
+    print("\nFrequency -> band lookup (per call):")
+    print(f"\t Linear scan:            {lookup['linear_scan'] * 1e9:10.1f} ns")
+    print(f"\t band_for_frequency:     {lookup['band_for_frequency'] * 1e9:10.1f} ns"
+          f"  ({lookup['speedup']:.1f}x faster)")
+    if 'bands_for_frequencies' in lookup:
+        vectorized = benchmark_vectorized(100000 if args.quick else 1000000)
+        print("\nArray forms against a Python loop:")
+        print(f"\t calculate_dipole_lengths:      {vectorized['lengths_speedup']:6.0f}x faster")
+        print(f"\t calculate_length_corrections:  {vectorized['corrections_speedup']:6.0f}x faster")
+
+    loading = benchmark_band_plan_loading(runs=3 if args.quick else 9)
+    print("\nCold start with 50 band plans (fresh interpreter, after import):")
+    print(f"\t Parsing the plan files:  {loading['parsed']:8.2f} ms")
+    print(f"\t Binary cache:            {loading['cached']:8.2f} ms"
+          f"  ({'within' if loading['within_budget'] else 'OVER'} the 20 ms budget)")
+    imports = check_import_budget(runs=3 if args.quick else 5)
+    print(f"Import cost of `length`:   {imports['import_ms']:8.2f} ms"
+          f"  ({'within' if imports['within_budget'] else 'OVER'} the {IMPORT_BUDGET_MS:g} ms budget)")
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
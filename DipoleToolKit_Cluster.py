@@ -0,0 +1,349 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - DX Cluster Spot Filter
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   Connects to a telnet DX cluster, reads the spot lines
+#     DX de VE3ABC:    14025.0  JA1XYZ       CW 599                  1234Z
+#   looks each spot's frequency up in the RAC band table, and passes on only
+#   the spots on bands (and close enough to the resonance of the antennas)
+#   we actually have. Matching spots go to any number of subscribers, each
+#   with its own bounded queue: a slow subscriber makes the client stop
+#   reading (and TCP slows the cluster) instead of piling up memory.
+#
+#   A local replay server plays recorded spot files at a chosen rate, so the
+#   client's throughput (spots/sec) and end-to-end latency can be measured
+#   without a live cluster:
+#     python DipoleToolKit_v7.py replay spots.txt --rate 5000
+#     python DipoleToolKit_v7.py cluster localhost 7300 --bands 40m 20m --antenna 65.5
+#     benchmark_replay('spots.txt', rate=20000)
+#
+# ------------------------------------------------------------------------------
+
+import asyncio
+import re
+import time
+
+import DipoleToolKit_v7 as toolkit
+
+DEFAULT_REPLAY_PORT = 7300
+READ_BYTES = 65536  # Bytes read from the cluster at a time
+QUEUE_SIZE = 1024  # Spots a subscriber may fall behind by before the client waits for it
+REPLAY_TICK = 0.005  # Seconds between paced replay batches
+
+SPOT_PATTERN = re.compile(r'DX de\s+([^:\s]+):?\s+(\d+(?:\.\d*)?)\s+(\S+)\s*(.*?)\s*(\d{4})Z')
+
+
+def parse_spot(line):
+    """
+    Reads one DX cluster spot line.
+
+    Args:
+        line (str): A line from the cluster.
+
+    Returns:
+        dict: 'spotter', 'frequency_mhz', 'dx', 'comment' and 'time' (HHMM UTC),
+              or None if the line is not a spot.
+    """
+    match = SPOT_PATTERN.match(line)
+    if match is None:
+        return None
+    spotter, frequency_khz, dx, comment, utc = match.groups()
+    return {'spotter': spotter, 'frequency_mhz': float(frequency_khz) / 1000, 'dx': dx,
+            'comment': comment, 'time': utc}
+
+
+class SpotFilter:
+    """
+    Decides which spots are worth passing on.
+
+    Args:
+        bands (iterable): Bands to keep (e.g. ['40m', '20m']). Default None keeps every band in the plan.
+        antenna_lengths_feet (iterable): Lengths of the dipoles we have up. When given, only
+                                         spots within `coverage` of one of them are kept.
+        coverage (float): How far from an antenna's resonance still counts as covered,
+                          as a fraction of its length (0.03 is about a 2:1 SWR span).
+        per_band (dict): Band -> callable(spot) returning True to keep the spot
+                         (e.g. {'20m': lambda spot: 'CW' in spot['comment']}).
+        plan: Band plan the bands come from: country code, IARU region or band plan dict
+              (see resolve_band_plan). Default None: RAC.
+    """
+
+    def __init__(self, bands=None, antenna_lengths_feet=(), coverage=0.03, per_band=None, plan=None):
+        self.bands = set(bands) if bands is not None else None
+        self.plan = plan
+        self.antenna_lengths_feet = tuple(antenna_lengths_feet)
+        self.coverage = coverage
+        self.per_band = per_band or {}
+
+    def covered(self, frequency_mhz):
+        """True if one of the antennas is close enough to resonant at the frequency."""
+        if not self.antenna_lengths_feet:
+            return True
+        resonant_feet = toolkit.calculate_dipole_length(frequency_mhz)
+        return any(abs(resonant_feet - length) <= self.coverage * length for length in self.antenna_lengths_feet)
+
+    def __call__(self, spot):
+        """
+        Adds the spot's 'band' and says whether to keep it.
+
+        Args:
+            spot (dict): From parse_spot.
+
+        Returns:
+            bool: True to pass the spot on.
+        """
+        found = toolkit.band_for_frequency(spot['frequency_mhz'], self.plan)
+        if found is None:
+            return False
+        spot['band'] = band = found[0]
+        if self.bands is not None and band not in self.bands:
+            return False
+        if not self.covered(spot['frequency_mhz']):
+            return False
+        keep = self.per_band.get(band)
+        return keep is None or bool(keep(spot))
+
+
+class ClusterClient:
+    """
+    Reads a DX cluster line stream and fans the spots that pass a filter out to subscribers.
+
+    Args:
+        spot_filter (callable): Takes a spot dict, returns True to keep it (default: any RAC band).
+    """
+
+    def __init__(self, spot_filter=None):
+        self.spot_filter = spot_filter or SpotFilter()
+        self.subscribers = []
+        self.lines = 0
+        self.spots = 0
+        self.passed = 0
+
+    def subscribe(self, maxsize=QUEUE_SIZE):
+        """
+        Adds a subscriber.
+
+        Args:
+            maxsize (int): How many spots it may fall behind by before the client waits.
+
+        Returns:
+            asyncio.Queue: Spot dicts, then None when the feed ends.
+        """
+        queue = asyncio.Queue(maxsize)
+        self.subscribers.append(queue)
+        return queue
+
+    async def _publish(self, spot):
+        """Hands a spot to every subscriber, waiting on any that are full (backpressure)."""
+        for queue in self.subscribers:
+            await queue.put(spot)
+
+    async def run(self, reader):
+        """
+        Reads the stream until it ends; each subscriber gets None at the end.
+
+        Spots get a 'sequence' (line number in the stream) and 'received'
+        (time.perf_counter() when read) besides the parse_spot fields.
+
+        Args:
+            reader (asyncio.StreamReader): The cluster connection.
+        """
+        spot_filter = self.spot_filter
+        leftover = b''
+        try:
+            while True:
+                block = await reader.read(READ_BYTES)
+                if not block:
+                    break
+                received = time.perf_counter()
+                lines = (leftover + block).split(b'\n')
+                leftover = lines.pop()
+                for line in lines:
+                    self.lines += 1
+                    spot = parse_spot(line.decode('latin-1'))
+                    if spot is None:
+                        continue
+                    self.spots += 1
+                    if spot_filter(spot):
+                        self.passed += 1
+                        spot['sequence'] = self.lines - 1
+                        spot['received'] = received
+                        await self._publish(spot)
+        finally:
+            for queue in self.subscribers:
+                await queue.put(None)
+
+    async def connect(self, host, port, login=None):
+        """
+        Connects to a cluster, logs in and runs until the connection closes.
+
+        Args:
+            host (str): The cluster's host name.
+            port (int): The cluster's telnet port.
+            login (str): Callsign to log in with (sent as the first line), if the cluster asks.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            if login:
+                writer.write(login.encode('ascii') + b'\r\n')
+                await writer.drain()
+            await self.run(reader)
+        finally:
+            writer.close()
+
+
+def read_spot_file(path):
+    """
+    Reads a recorded spot file (one cluster line per line) for replaying.
+
+    Args:
+        path (str): The file.
+
+    Returns:
+        list: The lines as bytes, each ending in CR LF.
+    """
+    with open(path, 'rb') as spot_file:
+        return [line.rstrip(b'\r\n') + b'\r\n' for line in spot_file if line.strip()]
+
+
+async def start_replay_server(lines, host='127.0.0.1', port=DEFAULT_REPLAY_PORT, rate=None, repeat=1,
+                              sent_times=None):
+    """
+    Starts a local stand-in cluster that plays recorded lines to every client that connects.
+
+    Args:
+        lines (list): Lines to play (see read_spot_file).
+        host (str): Address to listen on (default localhost only).
+        port (int): Port to listen on; 0 picks a free one.
+        rate (float): Lines per second. Default None sends as fast as the client reads.
+        repeat (int): Times to play the lines before closing the connection.
+        sent_times (list): If given, time.perf_counter() at which each line was written
+                           is appended (for latency measurements).
+
+    Returns:
+        asyncio.Server: The listening server; the caller runs the event loop.
+    """
+    async def play(reader, writer):
+        writer.write(b'DipoleToolKit replay cluster\r\n')
+        try:
+            for _ in range(repeat):
+                if rate is None:
+                    for start in range(0, len(lines), 256):
+                        batch = lines[start:start + 256]
+                        writer.write(b''.join(batch))
+                        if sent_times is not None:
+                            sent_times.extend([time.perf_counter()] * len(batch))
+                        await writer.drain()
+                    continue
+                position = 0
+                started = time.perf_counter()
+                while position < len(lines):
+                    due = min(len(lines), int((time.perf_counter() - started) * rate) + 1)
+                    if due > position:
+                        writer.write(b''.join(lines[position:due]))
+                        if sent_times is not None:
+                            sent_times.extend([time.perf_counter()] * (due - position))
+                        position = due
+                        await writer.drain()
+                    await asyncio.sleep(REPLAY_TICK)
+        except ConnectionError:
+            pass  # Client went away
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(play, host, port)
+
+
+def run_replay_server(path, host='127.0.0.1', port=DEFAULT_REPLAY_PORT, rate=None, repeat=1):
+    """
+    Runs the replay server until interrupted (Ctrl+C).
+
+    Args:
+        path (str): Recorded spot file.
+        host (str): Address to listen on.
+        port (int): Port to listen on.
+        rate (float): Lines per second (default as fast as possible).
+        repeat (int): Times to play the file to each client.
+
+    Returns:
+        int: The exit status.
+    """
+    lines = read_spot_file(path)
+
+    async def serve():
+        server = await start_replay_server(lines, host, port, rate, repeat)
+        address = server.sockets[0].getsockname()
+        print(f"Replaying {len(lines)} lines on {address[0]}:{address[1]} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\nReplay stopped. 73!")
+    return 0
+
+
+def benchmark_replay(path, rate=None, repeat=1, spot_filter=None, subscribers=1):
+    """
+    Plays a spot file through the replay server into a ClusterClient, all in this process.
+
+    Args:
+        path (str): Recorded spot file.
+        rate (float): Lines per second (default as fast as possible).
+        repeat (int): Times to play the file.
+        spot_filter (callable): The client's filter (default: any RAC band).
+        subscribers (int): Subscribers draining the client's queues.
+
+    Returns:
+        dict: 'lines', 'spots', 'passed', 'seconds', 'spots_per_second' (spots parsed
+              per second of wall time) and latency from the server writing a line to a
+              subscriber taking the spot: 'latency_p50_ms', 'latency_p99_ms', 'latency_max_ms'.
+    """
+    lines = read_spot_file(path)
+
+    async def measure():
+        sent_times = []
+        server = await start_replay_server(lines, port=0, rate=rate, repeat=repeat, sent_times=sent_times)
+        port = server.sockets[0].getsockname()[1]
+        client = ClusterClient(spot_filter)
+        latencies = []
+
+        async def drain(queue, record):
+            while True:
+                spot = await queue.get()
+                if spot is None:
+                    return
+                if record:
+                    # The greeting is line 0 of the stream; recorded lines start at 1
+                    latencies.append(time.perf_counter() - sent_times[spot['sequence'] - 1])
+
+        queues = [client.subscribe() for _ in range(subscribers)]
+        started = time.perf_counter()
+        async with server:
+            await asyncio.gather(client.connect('127.0.0.1', port),
+                                 *(drain(queue, index == 0) for index, queue in enumerate(queues)))
+        seconds = time.perf_counter() - started
+        latencies.sort()
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        return {'lines': client.lines, 'spots': client.spots, 'passed': client.passed, 'seconds': seconds,
+                'spots_per_second': client.spots / seconds if seconds else None,
+                'latency_p50_ms': percentile(0.5), 'latency_p99_ms': percentile(0.99),
+                'latency_max_ms': latencies[-1] * 1000 if latencies else None}
+
+    return asyncio.run(measure())
@@ -0,0 +1,286 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - Contest Log Band Checker
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   Reads ADIF (.adi) and Cabrillo (.log/.cbr) contest logs, checks every
+#   QSO's frequency against the RAC band plan (or another country's or IARU
+#   region's, see resolve_band_plan), counts QSOs per band and picks out
+#   the contacts logged outside every band.
+#
+#   Logs are read a chunk at a time (any size, flat memory). Each chunk's
+#   frequencies are pulled out with one regular expression per record and
+#   classified together against the numeric band index
+#   (bands_for_frequencies), so the per-record Python work is small; only
+#   the rare out-of-band records are parsed field by field. Several files
+#   (e.g. a log split into parts) can be checked in parallel processes.
+#   Run with:  python DipoleToolKit_v7.py logs contest.adi [-o out_of_band.jsonl]
+#
+# ------------------------------------------------------------------------------
+
+import concurrent.futures
+import functools
+import json
+import math
+import os
+import re
+
+import numpy as np
+
+import DipoleToolKit_v7 as toolkit
+
+CHUNK_BYTES = 8 * 1024 * 1024  # Bytes of log read at a time
+CABRILLO_BATCH = 65536  # QSO lines classified together
+
+# ADIF tags, matched on the lower-cased text: <name:length[:type]>value
+_ADIF_EOR = re.compile(rb'<eor>')
+_ADIF_FREQ = re.compile(rb'<freq:(\d+)[^>]*>')
+_ADIF_FIELD = re.compile(rb'<([a-z0-9_]+):(\d+)[^>]*>', re.IGNORECASE)
+
+# Cabrillo VHF/UHF band labels (the frequency column holds a band, not kHz), in MHz
+CABRILLO_BANDS = {'50': 50.0, '70': 70.0, '144': 144.0, '222': 222.0, '432': 432.0, '902': 902.0,
+                  '1.2G': 1240.0, '2.3G': 2300.0, '3.4G': 3300.0, '5.7G': 5650.0, '10G': 10000.0,
+                  '24G': 24000.0, '47G': 47000.0, '75G': 75500.0, '122G': 122250.0}
+LOG_SUFFIXES = {'.adi': 'adif', '.adif': 'adif', '.log': 'cabrillo', '.cbr': 'cabrillo'}
+
+
+def guess_log_format(path):
+    """
+    Works out whether a log is ADIF or Cabrillo, from its name or first bytes.
+
+    Args:
+        path (str): The log file.
+
+    Returns:
+        str: 'adif' or 'cabrillo'.
+    """
+    log_format = LOG_SUFFIXES.get(os.path.splitext(path)[1].lower())
+    if log_format is not None:
+        return log_format
+    with open(path, 'rb') as log_file:
+        start = log_file.read(4096)
+    return 'cabrillo' if start.lstrip().upper().startswith(b'START-OF-LOG') else 'adif'
+
+
+def parse_adif_record(record):
+    """
+    Reads every field of one ADIF record.
+
+    Args:
+        record (bytes): The record's text (without <EOR>).
+
+    Returns:
+        dict: Field name (upper case) -> value.
+    """
+    fields = {}
+    for match in _ADIF_FIELD.finditer(record):
+        start = match.end()
+        value = record[start:start + int(match.group(2))]
+        fields[match.group(1).decode('ascii').upper()] = value.decode('utf-8', 'replace')
+    return fields
+
+
+def _adif_frequency(lowered, start, end):
+    """The FREQ value (MHz) of the record lowered[start:end], or NaN if it has none."""
+    match = _ADIF_FREQ.search(lowered, start, end)
+    if match is None:
+        return math.nan
+    value_start = match.end()
+    try:
+        return float(lowered[value_start:value_start + int(match.group(1))])
+    except ValueError:
+        return math.nan
+
+
+def iter_adif_batches(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Reads an ADIF file a chunk at a time.
+
+    Args:
+        path (str): The ADIF file.
+        chunk_bytes (int): About how many bytes to read at a time.
+
+    Yields:
+        tuple: (frequencies in MHz as a NumPy array, NaN where a record has no FREQ,
+                list of the records' raw bytes).
+    """
+    with open(path, 'rb') as log_file:
+        leftover = b''
+        header_done = False
+        while True:
+            block = log_file.read(chunk_bytes)
+            text = leftover + block
+            lowered = text.lower()
+            if not header_done:
+                header_end = lowered.find(b'<eoh>')
+                if header_end < 0 and block and not text.lstrip().startswith(b'<'):
+                    leftover = text  # Header not finished yet
+                    continue
+                skip = header_end + len(b'<eoh>') if header_end >= 0 else 0
+                text, lowered = text[skip:], lowered[skip:]
+                header_done = True
+
+            frequencies = []
+            records = []
+            start = 0
+            for match in _ADIF_EOR.finditer(lowered):
+                end = match.start()
+                frequencies.append(_adif_frequency(lowered, start, end))
+                records.append(text[start:end])
+                start = match.end()
+            leftover = text[start:]
+            if records:
+                yield np.array(frequencies), records
+            if not block:
+                break
+
+
+def _cabrillo_frequency(field):
+    """MHz from a Cabrillo frequency column (kHz, or a band label above 30 MHz)."""
+    band_mhz = CABRILLO_BANDS.get(field)
+    if band_mhz is not None:
+        return band_mhz
+    try:
+        return float(field) / 1000
+    except ValueError:
+        return math.nan
+
+
+def iter_cabrillo_batches(path, batch_size=CABRILLO_BATCH):
+    """
+    Reads the QSO lines of a Cabrillo file, a batch at a time.
+
+    Args:
+        path (str): The Cabrillo file.
+        batch_size (int): QSO lines per batch.
+
+    Yields:
+        tuple: (frequencies in MHz as a NumPy array, list of the QSO lines as text).
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as log_file:
+        frequencies = []
+        lines = []
+        for line in log_file:
+            if not line.startswith('QSO:'):
+                continue
+            fields = line.split(None, 2)
+            frequencies.append(_cabrillo_frequency(fields[1]) if len(fields) > 1 else math.nan)
+            lines.append(line.rstrip('\r\n'))
+            if len(lines) == batch_size:
+                yield np.array(frequencies), lines
+                frequencies, lines = [], []
+        if lines:
+            yield np.array(frequencies), lines
+
+
+def classify_log(path, log_format=None, chunk_bytes=CHUNK_BYTES, plan=None):
+    """
+    Checks every QSO in one log against the band plan.
+
+    Args:
+        path (str): The log file.
+        log_format (str): 'adif' or 'cabrillo'. Default None guesses it.
+        chunk_bytes (int): About how many bytes of ADIF to read at a time.
+        plan: Band plan to check against: country code, IARU region or band plan dict
+              (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        dict: 'file', 'records', 'per_band' (band -> QSO count, in band plan order),
+              'no_frequency' (records without a usable frequency) and 'out_of_band'
+              (list of the records outside every band, each with its 'freq_mhz').
+    """
+    if log_format is None:
+        log_format = guess_log_format(path)
+    if log_format == 'adif':
+        batches = iter_adif_batches(path, chunk_bytes)
+    elif log_format == 'cabrillo':
+        batches = iter_cabrillo_batches(path)
+    else:
+        raise ValueError(f"Unknown log format: {log_format}")
+
+    band_names = toolkit.get_band_index(plan)['band_names']
+    counts = np.zeros(len(band_names) + 1, dtype=np.int64)  # Slot 0: outside every band
+    records = no_frequency = 0
+    out_of_band = []
+    for frequencies, raw_records in batches:
+        codes = toolkit.bands_for_frequencies(frequencies, plan)
+        missing = np.isnan(frequencies)
+        counts += np.bincount(codes[~missing] + 1, minlength=len(counts))
+        records += len(raw_records)
+        no_frequency += int(missing.sum())
+        for index in np.flatnonzero((codes < 0) & ~missing):
+            if log_format == 'adif':
+                record = parse_adif_record(raw_records[index])
+            else:
+                record = {'QSO': raw_records[index]}
+            record['freq_mhz'] = float(frequencies[index])
+            out_of_band.append(record)
+
+    return {
+        'file': path,
+        'records': records,
+        'per_band': {band: int(count) for band, count in zip(band_names, counts[1:]) if count},
+        'no_frequency': no_frequency,
+        'out_of_band': out_of_band,
+    }
+
+
+def _merge(total, result):
+    """Adds one file's classify_log result into the running totals."""
+    total['files'] += 1
+    total['records'] += result['records']
+    total['no_frequency'] += result['no_frequency']
+    total['out_of_band'] += len(result['out_of_band'])
+    for band, count in result['per_band'].items():
+        total['per_band'][band] = total['per_band'].get(band, 0) + count
+
+
+def classify_logs(paths, output=None, workers=1, plan=None):
+    """
+    Checks several logs (e.g. one split into parts), optionally in parallel processes.
+
+    Out-of-band records are written to the output as JSON lines, each with its 'file'.
+
+    Args:
+        paths (list): The log files.
+        output (file): Open text stream for the out-of-band records (default None: not written).
+        workers (int): Processes to use (default 1: this process; None: every core).
+        plan: Band plan to check against (see classify_log). Default None: RAC.
+
+    Returns:
+        dict: Totals over all files: 'files', 'records', 'per_band', 'no_frequency'
+              and the number of 'out_of_band' records.
+    """
+    total = {'files': 0, 'records': 0, 'per_band': {}, 'no_frequency': 0, 'out_of_band': 0}
+
+    def write(result):
+        _merge(total, result)
+        if output is not None:
+            for record in result['out_of_band']:
+                record['file'] = result['file']
+                output.write(json.dumps(record) + '\n')
+
+    check = functools.partial(classify_log, plan=plan)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            write(check(path))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            for result in pool.map(check, paths):
+                write(result)
+
+    # Band plan order, like classify_log
+    order = {band: position for position, band in enumerate(toolkit.get_band_index(plan)['band_names'])}
+    total['per_band'] = dict(sorted(total['per_band'].items(), key=lambda item: order.get(item[0], len(order))))
+    return total
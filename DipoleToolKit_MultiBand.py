@@ -0,0 +1,262 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - Multi-Band Fan and Trap Dipoles
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   Sizes one antenna for several bands of the band plan at once:
+#     - a fan dipole: one dipole per band, all on the same feedpoint. Each
+#       element is pulled off its own resonance by the others hanging across
+#       the feed, so they are all adjusted together.
+#     - a trapped dipole: wire sections separated by parallel L-C traps. Each
+#       trap blocks the wire beyond it on its own band and adds loading
+#       (so a shorter outer section) on the bands below.
+#
+#   Each dipole leg is treated as a transmission line (average characteristic
+#   impedance from the wire's length/diameter), shortened so that a single
+#   bare dipole lands exactly where the antenna model puts it (468 / f by
+#   default). All bands are solved together: the residuals for every band
+#   are one array expression, and a damped Newton solver (Jacobian from one
+#   batched evaluation of every perturbed design) drives them all to zero.
+#   Everything that does not depend on the lengths (the per-band resonant
+#   lengths, trap reactances, line impedances) is worked out once and cached.
+#
+#   Example:
+#     design_fan_dipole(['40m', '20m', '15m', '10m'])
+#     design_trap_dipole(['40m', '20m'])
+#
+# ------------------------------------------------------------------------------
+
+import functools
+import math
+
+import numpy as np
+
+import DipoleToolKit_v7 as toolkit
+
+DEFAULT_WIRE_DIAMETER_MM = 1.63  # #14 AWG
+TRAP_REACTANCE_OHMS = 200.0  # Default trap inductor reactance at the trap's resonance
+FEED_RESISTANCE_OHMS = 73.0  # A resonant element's feedpoint resistance
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-12  # Largest residual (radians / normalized susceptance) accepted as solved
+FEET_PER_MM = 1 / 304.8
+
+
+def _band_centers(bands):
+    """Center frequencies of the bands (ValueError for an unknown band)."""
+    centers = []
+    for band in bands:
+        center_mhz = toolkit.get_band_resonance_center_frequency(band)
+        if center_mhz is None:
+            raise ValueError(f"Unknown band: {band}")
+        centers.append(center_mhz)
+    return np.array(centers)
+
+
+@functools.lru_cache(maxsize=64)
+def _band_constants(bands, model, wire_diameter_mm):
+    """
+    The length-independent numbers for a set of bands (cached).
+
+    Returns:
+        tuple: (center frequencies in MHz, single-dipole resonant lengths in feet,
+                average dipole line impedances in ohms), one per band.
+    """
+    centers = _band_centers(bands)
+    if model is None:
+        lengths = toolkit.calculate_dipole_lengths(centers)
+    else:
+        lengths = toolkit.get_antenna_model(model).lengths(centers)
+    # Average characteristic impedance of a dipole (Schelkunoff): 120 (ln(L / a) - 1)
+    radius_feet = wire_diameter_mm / 2 * FEET_PER_MM
+    impedances = 120 * (np.log(lengths / radius_feet) - 1)
+    return centers, lengths, impedances
+
+
+def _solve(residuals, start, tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS):
+    """
+    Damped Newton (Levenberg-Marquardt) on a vectorized residual function.
+
+    Args:
+        residuals (callable): Maps parameters of shape (..., n) to residuals of shape (..., n).
+        start (numpy.ndarray): Starting parameters (all must stay above 0).
+
+    Returns:
+        tuple: (parameters, largest residual, iterations used).
+    """
+    parameters = np.array(start, dtype=float)
+    damping = 1e-3
+    current = residuals(parameters)
+    for iteration in range(1, max_iterations + 1):
+        if np.max(np.abs(current)) < tolerance:
+            return parameters, float(np.max(np.abs(current))), iteration - 1
+        # Every perturbed design in one batch: rows are parameters + step on one of them
+        steps = np.maximum(np.abs(parameters), 1.0) * 1e-7
+        trials = parameters + np.diag(steps)
+        jacobian = ((residuals(trials) - current) / steps[:, None]).T
+        normal = jacobian.T @ jacobian
+        gradient = jacobian.T @ current
+        while True:
+            change = np.linalg.solve(normal + damping * np.diag(np.diag(normal) + 1e-12), -gradient)
+            candidate = np.maximum(parameters + change, parameters * 0.1)  # Lengths stay above 0
+            trial = residuals(candidate)
+            if np.sum(trial * trial) < np.sum(current * current):
+                parameters, current = candidate, trial
+                damping = max(damping / 10, 1e-12)
+                break
+            damping *= 10
+            if damping > 1e12:
+                return parameters, float(np.max(np.abs(current))), iteration
+    return parameters, float(np.max(np.abs(current))), max_iterations
+
+
+def _fan_residuals(lengths, centers, resonant_lengths, impedances):
+    """
+    Feed susceptance on each band, for fan element lengths of shape (..., n).
+
+    On band i, element i is the one resonating (73 ohms plus its reactance);
+    every other element just hangs its reactance across the feed. The
+    residual is the total susceptance times 73 ohms, zero when the feed is
+    resonant on that band.
+    """
+    # Electrical half-length of every element on every band: (..., band, element)
+    angles = (math.pi / 2) * lengths[..., None, :] / resonant_lengths[:, None]
+    tangents = np.tan(angles)
+    reactances = -impedances / tangents  # -Z0 cot(angle)
+    own = np.eye(len(centers), dtype=bool)
+    resistance = FEED_RESISTANCE_OHMS
+    own_reactance = np.sum(np.where(own, reactances, 0.0), axis=-1)
+    others = np.sum(np.where(own, 0.0, tangents / impedances), axis=-1)
+    return resistance * (-own_reactance / (resistance ** 2 + own_reactance ** 2) + others)
+
+
+def design_fan_dipole(bands, model=None, wire_diameter_mm=DEFAULT_WIRE_DIAMETER_MM):
+    """
+    Element lengths for a fan dipole covering several bands from one feedpoint.
+
+    Args:
+        bands (list): Band names (e.g. ['40m', '20m', '15m']).
+        model (str or AntennaModel): Antenna model for a single element (default the 468 rule).
+        wire_diameter_mm (float): Wire diameter in mm.
+
+    Returns:
+        dict: 'elements' (one dict per band with 'band', 'center_mhz', 'length_feet' and
+              'single_length_feet', the length it would have on its own), the largest
+              'residual' and the 'iterations' the solver took.
+
+    Raises:
+        ValueError: If a band is unknown, repeated, or one element is resonant on another's band
+                    (e.g. 40m and 15m, where a 40m dipole is three half-waves long).
+    """
+    bands = tuple(bands)
+    if len(set(bands)) != len(bands):
+        raise ValueError("each band can only have one element")
+    centers, resonant_lengths, impedances = _band_constants(bands, model, wire_diameter_mm)
+    # A half-wave element is also resonant (low impedance) at 3, 5, ... times its frequency
+    ratios = centers[:, None] / centers[None, :]
+    nearest_odd = 2 * np.round((ratios - 1) / 2) + 1
+    clash = (ratios > 2) & (np.abs(ratios - nearest_odd) < 0.05 * ratios)
+    if clash.any():
+        first, second = np.argwhere(clash)[0]
+        raise ValueError(f"the {bands[second]} element is resonant on {bands[first]}; "
+                         "a fan dipole cannot cover both")
+
+    residuals = functools.partial(_fan_residuals, centers=centers, resonant_lengths=resonant_lengths,
+                                  impedances=impedances)
+    lengths, residual, iterations = _solve(residuals, resonant_lengths)
+    elements = [{'band': band, 'center_mhz': float(center), 'length_feet': float(length),
+                 'single_length_feet': float(single)}
+                for band, center, length, single in zip(bands, centers, lengths, resonant_lengths)]
+    return {'elements': elements, 'residual': residual, 'iterations': iterations}
+
+
+def trap_reactance(frequencies_mhz, resonance_mhz, inductance_uh):
+    """
+    Reactance of a lossless parallel L-C trap (inductive below its resonance, capacitive above).
+
+    Args:
+        frequencies_mhz (array_like): Frequencies in MHz.
+        resonance_mhz (float): The trap's resonance in MHz.
+        inductance_uh (float): The trap's inductance in microhenries.
+
+    Returns:
+        numpy.ndarray: Reactance in ohms (very large at the resonance itself).
+    """
+    frequencies_mhz = np.asarray(frequencies_mhz, dtype=float)
+    inductive = 2 * math.pi * frequencies_mhz * inductance_uh
+    detuning = 1 - (frequencies_mhz / resonance_mhz) ** 2
+    with np.errstate(divide='ignore'):
+        return np.where(np.abs(detuning) < 1e-12, 1e15, inductive / np.where(detuning == 0, 1.0, detuning))
+
+
+def _trap_residuals(sections, resonant_lengths, loads):
+    """
+    Phase error at the feed on each band, for section lengths of shape (..., n).
+
+    Working in from the tip of a leg, the wire beyond any point looks like an
+    open line of some electrical length; each section adds its length and each
+    trap adds the angle its reactance is worth. The feed is resonant on a
+    band when the total is an odd multiple of 90 degrees.
+    """
+    # Electrical length of every section on every band: (..., band, section)
+    angles = (math.pi / 2) * sections[..., None, :] / (resonant_lengths[:, None] / 2)
+    total = angles[..., -1]
+    for index in range(sections.shape[-1] - 2, -1, -1):
+        folded = np.remainder(total, math.pi)
+        cotangent = 1 / np.tan(np.where(folded == 0, 1e-300, folded))
+        shifted = math.pi / 2 - np.arctan(cotangent - loads[:, index])  # arccot, in (0, pi)
+        total = total + (shifted - folded) + angles[..., index]
+    return np.remainder(total, math.pi) - math.pi / 2
+
+
+def design_trap_dipole(bands, model=None, wire_diameter_mm=DEFAULT_WIRE_DIAMETER_MM,
+                       trap_reactance_ohms=TRAP_REACTANCE_OHMS):
+    """
+    Section lengths and traps for a trapped dipole covering several bands.
+
+    With n bands each leg has n sections and n - 1 traps. Going out from the feed,
+    the first section is cut for the highest band and the first trap is tuned to it,
+    and so on down; the last section brings in the lowest band.
+
+    Args:
+        bands (list): Band names (e.g. ['40m', '20m']); any order.
+        model (str or AntennaModel): Antenna model for a bare dipole (default the 468 rule).
+        wire_diameter_mm (float): Wire diameter in mm.
+        trap_reactance_ohms (float): Reactance of each trap's inductor at its resonance
+                                     (sets L and C; 100-300 ohms is usual).
+
+    Returns:
+        dict: 'sections_feet' (one leg, from the feed out), 'traps' (one dict each with
+              'resonance_mhz', 'inductance_uh' and 'capacitance_pf'), 'total_length_feet'
+              (both legs, wire only), the largest 'residual' and 'iterations'.
+
+    Raises:
+        ValueError: If a band is unknown or repeated, or the design does not converge.
+    """
+    bands = tuple(sorted(bands, key=lambda band: -_band_centers([band])[0]))
+    if len(set(bands)) != len(bands):
+        raise ValueError("each band can only be covered once")
+    centers, resonant_lengths, impedances = _band_constants(bands, model, wire_diameter_mm)
+    traps = [{'resonance_mhz': float(center),
+              'inductance_uh': float(trap_reactance_ohms / (2 * math.pi * center)),
+              'capacitance_pf': float(1e6 / (2 * math.pi * center * trap_reactance_ohms))}
+             for center in centers[:-1]]
+    leg_impedance = impedances[-1] / 2  # One leg, from the longest (outermost) wire
+    loads = np.array([[trap_reactance(center, trap['resonance_mhz'], trap['inductance_uh']) / leg_impedance
+                       for trap in traps] for center in centers]).reshape(len(centers), len(traps))
+
+    start = np.diff(np.concatenate(([0.0], resonant_lengths / 2)))  # Unloaded quarter-waves
+    residuals = functools.partial(_trap_residuals, resonant_lengths=resonant_lengths, loads=loads)
+    sections, residual, iterations = _solve(residuals, start)
+    if residual > 1e-6:
+        raise ValueError("the trap design did not converge; try a different trap reactance")
+    return {'bands': list(bands), 'sections_feet': sections.tolist(), 'traps': traps,
+            'total_length_feet': 2 * float(sections.sum()), 'residual': residual, 'iterations': iterations}
@@ -0,0 +1,268 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - Radiation Patterns
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   Far-field gain of the dipoles and inverted-Vs the toolkit sizes, on a
+#   theta/phi grid, for planning where antennas go and which way they favour.
+#
+#   Each leg carries the usual sinusoidal standing-wave current, whose far
+#   field has an exact closed form, so a whole grid for many frequencies is
+#   a handful of NumPy array expressions (no loop over directions, segments
+#   or frequencies). Over ground the antenna's image is added with the
+#   Fresnel reflection coefficients for each elevation angle (perfect ground
+#   reflects fully; real ground is set by its permittivity and conductivity).
+#
+#   Angles: theta is measured from straight up (elevation = 90 - theta) and
+#   phi around the horizon from the wire's direction (phi = 90 is broadside).
+#   Gain is in dBi, relative to the power radiated into the space above
+#   ground (losses in the ground itself are not counted).
+#
+#   Example (40m inverted-V at the band center, apex at 35 feet):
+#     result = band_pattern('40m', 'inverted-v', height_feet=35, ground='average')
+#     result['gain_dbi']            -> array (frequencies, theta, phi)
+#     save_pattern(result, 'v40m.npz')
+#
+# ------------------------------------------------------------------------------
+
+import math
+
+import numpy as np
+
+import DipoleToolKit_v7 as toolkit
+from DipoleToolKit_Wire import FEET_PER_METRE, GROUNDS, SPEED_OF_LIGHT, EPSILON_0
+
+NORMALIZE_STEP_DEG = 2.0  # Grid used to total the radiated power for the dBi scale
+
+
+def default_angles(ground=None):
+    """
+    The default 1-degree grid.
+
+    Args:
+        ground: The ground the pattern is for; over ground only the upper half is useful.
+
+    Returns:
+        tuple: (theta_deg, phi_deg) arrays.
+    """
+    theta_deg = np.arange(0.0, 90.5 if ground is not None else 180.5, 1.0)
+    return theta_deg, np.arange(0.0, 360.0, 1.0)
+
+
+def _leg_integral(cosines, wave_length):
+    """
+    Far-field integral of one leg's sinusoidal current, seen from the feed.
+
+    For a leg of electrical length kh, with current sin(k(h - s)) at distance s from
+    the feed: integral of sin(k(h - s)) e^(jks cos a) ds, times k. Straight along the leg
+    (cos a = +-1) the value is never used (the leg does not radiate that way).
+    """
+    denominator = 1 - cosines * cosines
+    denominator = np.where(denominator < 1e-12, 1.0, denominator)
+    return (np.exp(1j * wave_length * cosines) - 1j * cosines * np.sin(wave_length)
+            - np.cos(wave_length)) / denominator
+
+
+def _legs(shape, apex_angle_deg):
+    """Unit directions of the two legs (from the feed outward), in the x-z plane."""
+    if shape == 'dipole':
+        spread = math.pi / 2
+    elif shape == 'inverted-v':
+        spread = math.radians(apex_angle_deg / 2)
+    else:
+        raise ValueError(f"Unknown antenna shape: {shape}")
+    return (np.array([math.sin(spread), 0.0, -math.cos(spread)]),
+            np.array([-math.sin(spread), 0.0, -math.cos(spread)]))
+
+
+def _leg_fields(directions, theta_unit, phi_unit, legs, feed_height, wavenumbers, wave_lengths, mirror=False):
+    """
+    Theta and phi far fields of both legs (or of their image) for every direction and frequency.
+
+    Args:
+        directions (numpy.ndarray): Unit vectors towards the observer, shape (T, P, 3).
+        theta_unit (numpy.ndarray): Theta unit vectors, shape (T, P, 3).
+        phi_unit (numpy.ndarray): Phi unit vectors, shape (T, P, 3).
+        legs (tuple): The two leg directions.
+        feed_height (float): Feed height in metres.
+        wavenumbers (numpy.ndarray): Shape (F, 1, 1).
+        wave_lengths (numpy.ndarray): Electrical leg lengths kh, shape (F, 1, 1).
+        mirror (bool): True for the (perfect ground) image below the ground.
+
+    Returns:
+        tuple: (theta field, phi field), each shape (F, T, P).
+    """
+    height = -feed_height if mirror else feed_height
+    field_theta = field_phi = 0
+    for sign, leg in zip((1, -1), legs):  # The current runs out along one leg and in along the other
+        if mirror:
+            leg = leg * np.array([1.0, 1.0, -1.0])
+            sign = -sign  # The image current is the mirrored current reversed
+        integral = _leg_integral(directions @ leg, wave_lengths)
+        field_theta = field_theta + integral * (sign * (theta_unit @ leg))
+        field_phi = field_phi + integral * (sign * (phi_unit @ leg))
+    feed_phase = np.exp(1j * wavenumbers * height * directions[..., 2])
+    return field_theta * feed_phase, field_phi * feed_phase
+
+
+def _reflection_coefficients(cos_theta, frequencies_mhz, ground):
+    """
+    Fresnel reflection multipliers for the image's theta and phi fields.
+
+    Both are 1 over perfect ground (the plain image).
+
+    Returns:
+        tuple: (theta factor, phi factor), each shape (F, T, 1).
+    """
+    if ground == 'perfect':
+        return 1.0, 1.0
+    if isinstance(ground, str):
+        if ground not in GROUNDS:
+            raise ValueError(f"Unknown ground: {ground}")
+        ground = GROUNDS[ground]
+    permittivity, conductivity = ground
+    omegas = 2 * math.pi * frequencies_mhz[:, None, None] * 1e6
+    index_squared = permittivity - 1j * conductivity / (omegas * EPSILON_0)
+    sin_elevation = cos_theta[None, :, None]
+    root = np.sqrt(index_squared - (1 - sin_elevation * sin_elevation))
+    vertical = (index_squared * sin_elevation - root) / (index_squared * sin_elevation + root)
+    horizontal = (sin_elevation - root) / (sin_elevation + root)
+    return vertical, -horizontal
+
+
+def _intensity(theta_deg, phi_deg, frequencies_mhz, length_m, shape, height_m, apex_angle_deg, ground):
+    """Radiation intensity (arbitrary units) for every frequency and direction; shape (F, T, P)."""
+    theta = np.radians(theta_deg)[:, None]
+    phi = np.radians(phi_deg)[None, :]
+    sin_theta, cos_theta = np.sin(theta), np.cos(theta)
+    directions = np.stack(np.broadcast_arrays(sin_theta * np.cos(phi), sin_theta * np.sin(phi), cos_theta), axis=-1)
+    theta_unit = np.stack(np.broadcast_arrays(cos_theta * np.cos(phi), cos_theta * np.sin(phi), -sin_theta), axis=-1)
+    phi_unit = np.stack(np.broadcast_arrays(-np.sin(phi), np.cos(phi), np.zeros_like(theta)), axis=-1)
+
+    wavenumbers = (2 * math.pi * frequencies_mhz * 1e6 / SPEED_OF_LIGHT)[:, None, None]
+    wave_lengths = wavenumbers * (length_m / 2)[:, None, None]
+    legs = _legs(shape, apex_angle_deg)
+
+    fields = (directions, theta_unit, phi_unit, legs, height_m, wavenumbers, wave_lengths)
+    field_theta, field_phi = _leg_fields(*fields)
+    if ground is not None:
+        image_theta, image_phi = _leg_fields(*fields, mirror=True)
+        theta_factor, phi_factor = _reflection_coefficients(cos_theta[:, 0], frequencies_mhz, ground)
+        field_theta = field_theta + theta_factor * image_theta
+        field_phi = field_phi + phi_factor * image_phi
+        field_theta[:, theta_deg > 90] = 0  # Nothing gets through the ground
+        field_phi[:, theta_deg > 90] = 0
+    return field_theta.real ** 2 + field_theta.imag ** 2 + field_phi.real ** 2 + field_phi.imag ** 2
+
+
+def pattern(frequencies_mhz, length_feet=None, shape='dipole', height_feet=None, apex_angle_deg=120,
+            ground=None, theta_deg=None, phi_deg=None):
+    """
+    Far-field gain on a theta/phi grid for one or more frequencies.
+
+    Args:
+        frequencies_mhz (float or array_like): Frequencies in MHz.
+        length_feet (float or array_like): Total wire length in feet, one for all frequencies
+                                           or one per frequency. Default None cuts the antenna
+                                           for each frequency with the 468 / f rule.
+        shape (str): 'dipole' or 'inverted-v'.
+        height_feet (float): Height (of the feed or apex) above ground in feet; needed with a ground.
+        apex_angle_deg (float): Angle between an inverted-V's legs.
+        ground: None (free space), 'perfect', a name from DipoleToolKit_Wire.GROUNDS,
+                or a (relative permittivity, conductivity S/m) pair.
+        theta_deg (array_like): Angles from straight up, in degrees (default every degree).
+        phi_deg (array_like): Angles around from the wire's direction, in degrees (default every degree).
+
+    Returns:
+        dict: 'frequency_mhz', 'theta_deg', 'phi_deg', 'length_feet' and 'gain_dbi'
+              (shape: frequencies x theta x phi; -inf where nothing is radiated).
+
+    Raises:
+        ValueError: For an unknown shape or ground, or a ground without a height.
+    """
+    frequencies_mhz = np.atleast_1d(np.asarray(frequencies_mhz, dtype=float))
+    if length_feet is None:
+        length_feet = toolkit.calculate_dipole_lengths(frequencies_mhz)
+    length_feet = np.broadcast_to(np.asarray(length_feet, dtype=float), frequencies_mhz.shape)
+    if ground is not None and (height_feet is None or height_feet <= 0):
+        raise ValueError("an antenna over ground needs a height above 0")
+    default_theta, default_phi = default_angles(ground)
+    theta_deg = default_theta if theta_deg is None else np.atleast_1d(np.asarray(theta_deg, dtype=float))
+    phi_deg = default_phi if phi_deg is None else np.atleast_1d(np.asarray(phi_deg, dtype=float))
+
+    length_m = length_feet / FEET_PER_METRE
+    height_m = (height_feet or 0.0) / FEET_PER_METRE
+    args = (frequencies_mhz, length_m, shape, height_m, apex_angle_deg, ground)
+    intensity = _intensity(theta_deg, phi_deg, *args)
+
+    # Total radiated power on a coarse grid (midpoints, weighted by solid angle)
+    step = NORMALIZE_STEP_DEG
+    top = 90.0 if ground is not None else 180.0
+    grid_theta = np.arange(step / 2, top, step)
+    total = _intensity(grid_theta, np.arange(step / 2, 360.0, step), *args)
+    solid_angle = np.sin(np.radians(grid_theta))[:, None] * math.radians(step) ** 2
+    radiated = (total * solid_angle).sum(axis=(1, 2))
+
+    with np.errstate(divide='ignore'):
+        gain_dbi = 10 * np.log10(4 * math.pi * intensity / radiated[:, None, None])
+    return {'frequency_mhz': frequencies_mhz, 'theta_deg': theta_deg, 'phi_deg': phi_deg,
+            'length_feet': np.array(length_feet), 'gain_dbi': gain_dbi}
+
+
+def band_pattern(band, shape='dipole', height_feet=None, segment=None, **options):
+    """
+    Pattern of an antenna cut for a band, at the band's center.
+
+    Args:
+        band (str): The amateur radio band (e.g., '40m').
+        shape (str): 'dipole' or 'inverted-v'.
+        height_feet (float): Height (of the feed or apex) above ground in feet.
+        segment (int): Segment of a multi-segment band (see get_band_segments).
+        **options: Passed on to pattern (ground, apex_angle_deg, theta_deg, phi_deg, ...).
+
+    Returns:
+        dict: As pattern, plus the 'band'; None if the band is not found.
+    """
+    center_mhz = toolkit.get_band_resonance_center_frequency(band, segment)
+    if center_mhz is None:
+        return None
+    length_feet = toolkit.get_band_dipole_length(band, segment)
+    result = pattern(center_mhz, length_feet, shape, height_feet, **options)
+    result['band'] = band
+    return result
+
+
+def save_pattern(result, path, dtype=np.float32):
+    """
+    Saves a pattern as compact binary arrays (a NumPy .npz file).
+
+    Args:
+        result (dict): From pattern or band_pattern.
+        path (str): The output file.
+        dtype: Type the gains are stored as (default float32, half the size of float64).
+    """
+    arrays = {name: np.asarray(value) for name, value in result.items() if name != 'gain_dbi'}
+    np.savez(path, gain_dbi=result['gain_dbi'].astype(dtype), **arrays)
+
+
+def load_pattern(path):
+    """
+    Loads a pattern saved with save_pattern.
+
+    Args:
+        path (str): The .npz file.
+
+    Returns:
+        dict: The arrays, by name.
+    """
+    with np.load(path) as saved:
+        return {name: saved[name] for name in saved.files}
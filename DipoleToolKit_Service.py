@@ -0,0 +1,283 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - Local HTTP Service
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   Serves the DipoleToolKit_v7 calculations as HTTP/JSON on localhost, so
+#   logging and build-planning programs can call one long-running process
+#   (band data already compiled, connections kept alive) instead of starting
+#   Python for every request.
+#   Run with:  python DipoleToolKit_v7.py serve [--host 127.0.0.1] [--port 8073]
+#
+#   Endpoints (all answers are JSON):
+#     GET  /bands                              every band with its segments
+#     GET  /bands/<band>                       one band, e.g. /bands/20m
+#                                              (either takes ?plan=US, ?plan=R1, ...)
+#     GET  /length?band=20m  or ?frequency=14.1
+#     GET  /correction?band=40m&measured=7.2   (or frequency=<target MHz>)
+#     POST /batch/length       body: JSON list of rows like the query strings above
+#     POST /batch/correction
+#     GET  /stats                              band lookup cache counters
+#
+# ------------------------------------------------------------------------------
+
+import asyncio
+import json
+import traceback
+import urllib.parse
+
+import DipoleToolKit_v7 as toolkit
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8073
+
+MAX_BODY_BYTES = 16 * 1024 * 1024  # Largest batch request accepted
+IDLE_TIMEOUT = 30.0  # Seconds a kept-alive connection may sit idle
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class RequestError(Exception):
+    """A request that gets an error answer; carries the HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def band_info(band, plan=None):
+    """
+    Describes one band for the /bands endpoints.
+
+    Args:
+        band (str): The amateur radio band (e.g., '20m').
+        plan (str): Country code or IARU region (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        dict: The range string, center, dipole length and segments, or None if the band is not found.
+    """
+    segments = toolkit.get_band_segments(band, plan)
+    if segments is None:
+        return None
+    return {
+        'band': band,
+        'range': toolkit.get_band_plan(plan)[band],
+        'center_mhz': toolkit.get_band_frequency(band, plan=plan),
+        'length_feet': toolkit.get_band_dipole_length(band, plan=plan),
+        'segments': segments,
+    }
+
+
+def _single_row(row_function, query):
+    """Runs one batch row function for a GET endpoint; a row with an error is a 400."""
+    result = row_function(query)
+    if 'error' in result:
+        raise RequestError(400, result['error'])
+    return result
+
+
+def _batch_rows(row_function, body):
+    """Runs a batch row function over a JSON list of rows."""
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        raise RequestError(400, 'body is not valid JSON')
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise RequestError(400, 'body must be a JSON list of objects')
+    return [row_function(row) for row in rows]
+
+
+def route(method, target, body):
+    """
+    Answers one request.
+
+    Args:
+        method (str): The HTTP method.
+        target (str): The request target (path and query string).
+        body (bytes): The request body.
+
+    Returns:
+        The JSON-ready answer.
+
+    Raises:
+        RequestError: For unknown paths, wrong methods and bad input.
+    """
+    url = urllib.parse.urlsplit(target)
+    path = url.path.rstrip('/') or '/'
+    query = dict(urllib.parse.parse_qsl(url.query))
+
+    if path.startswith('/batch/'):
+        if method != 'POST':
+            raise RequestError(405, 'use POST for batch requests')
+        if path == '/batch/length':
+            return _batch_rows(toolkit.batch_length_row, body)
+        if path == '/batch/correction':
+            return _batch_rows(toolkit.batch_correct_row, body)
+        raise RequestError(404, f'no such endpoint: {path}')
+
+    if method != 'GET':
+        raise RequestError(405, 'use GET')
+    if path == '/bands' or path.startswith('/bands/'):
+        plan = query.get('plan')
+        try:
+            band_table = toolkit.get_band_table(plan)
+        except ValueError as error:  # Unknown country or region
+            raise RequestError(400, str(error))
+        if path == '/bands':
+            return [band_info(band, plan) for band in band_table]
+        band = urllib.parse.unquote(path[len('/bands/'):])
+        info = band_info(band, plan)
+        if info is None:
+            raise RequestError(404, f'unknown band: {band}')
+        return info
+    if path == '/length':
+        return _single_row(toolkit.batch_length_row, query)
+    if path == '/correction':
+        return _single_row(toolkit.batch_correct_row, query)
+    if path == '/stats':
+        return toolkit.band_lookup_cache.info()
+    raise RequestError(404, f'no such endpoint: {path}')
+
+
+def _response(status, payload, keep_alive):
+    """Builds the bytes of one JSON response."""
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('ascii') + body
+
+
+async def _read_request(reader):
+    """
+    Reads one request from a connection.
+
+    Returns:
+        tuple: (method, target, version, headers, body), or None when the client is done.
+    """
+    request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+    if not request_line.strip():
+        return None
+    try:
+        method, target, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise RequestError(400, 'malformed request line')
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise RequestError(400, 'bad Content-Length')
+    if length < 0:
+        raise RequestError(400, 'bad Content-Length')
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, 'request body too large')
+    body = await reader.readexactly(length) if length else b''
+    return method, target, version, headers, body
+
+
+async def handle_connection(reader, writer):
+    """
+    Serves requests on one connection until the client closes it (HTTP/1.1 keep-alive).
+
+    Args:
+        reader (asyncio.StreamReader): The connection's input.
+        writer (asyncio.StreamWriter): The connection's output.
+    """
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except RequestError as error:  # Cannot trust the rest of the stream
+                writer.write(_response(error.status, {'error': str(error)}, False))
+                break
+            if request is None:
+                break
+            method, target, version, headers, body = request
+
+            connection = headers.get('connection', '').lower()
+            if version == 'HTTP/1.0':
+                keep_alive = connection == 'keep-alive'
+            else:
+                keep_alive = connection != 'close'
+
+            try:
+                status, payload = 200, route(method.upper(), target, body)
+            except RequestError as error:
+                status, payload = error.status, {'error': str(error)}
+            except Exception:  # A bug, not the client's fault: answer and keep serving
+                traceback.print_exc()
+                status, payload = 500, {'error': 'internal error'}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass  # Idle or vanished client
+    finally:
+        writer.close()
+
+
+async def start_service(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Starts the service; the caller runs the event loop.
+
+    Args:
+        host (str): Address to listen on (default localhost only).
+        port (int): Port to listen on; 0 picks a free one.
+
+    Returns:
+        asyncio.Server: The listening server.
+    """
+    toolkit.refresh_band_plan()  # Compile the band data before the first request
+    toolkit.load_band_plan_cache()  # Other countries' plans too, if the cache has been built
+    return await asyncio.start_server(handle_connection, host, port)
+
+
+def run_service(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Runs the service until interrupted (Ctrl+C).
+
+    Args:
+        host (str): Address to listen on (default localhost only).
+        port (int): Port to listen on.
+
+    Returns:
+        int: The exit status.
+    """
+    async def serve():
+        server = await start_service(host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Antenna Tool Kit service on http://{address[0]}:{address[1]}/ (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\nService stopped. 73!")
+    return 0
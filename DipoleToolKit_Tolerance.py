@@ -0,0 +1,283 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - Cut Length Tolerance Analysis
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   How far can the first resonance land from the target when the wire is
+#   cut with a real tape measure, stretches when it is pulled up, and hangs
+#   at a height nobody measured exactly? This runs that cut many times over
+#   (Monte Carlo), reports the chance of landing inside the band's edges,
+#   and suggests how much to cut long before trimming.
+#
+#   Trials run in chunks, each from its own seeded random stream (spawned
+#   from one SeedSequence), so memory stays flat for any number of trials,
+#   results are the same for a given seed however the chunks are shared
+#   out, and chunks can be spread over processes. Each chunk only adds to a
+#   fixed histogram of (resonance / target); every probability and the
+#   margin are read off the merged histogram.
+#
+#   Example (40m, cut with the 468 rule, hung at about 35 feet):
+#     result = tolerance_analysis('40m', trials=1000000, height_feet=35, seed=73)
+#     result['inside_band'], result['suggested_margin_feet']
+#
+# ------------------------------------------------------------------------------
+
+import concurrent.futures
+
+import numpy as np
+
+import DipoleToolKit_v7 as toolkit
+
+CHUNK_TRIALS = 262144  # Trials per chunk (about 10 MB of working arrays)
+HISTOGRAM_BINS = 100000  # Resonance / target ratio bins over HISTOGRAM_RANGE
+HISTOGRAM_RANGE = (0.5, 1.5)
+
+# Default tolerances
+TAPE_SD_FEET = 1 / 12  # Measuring error, standard deviation (one inch)
+STRETCH_MAX = 0.005  # Wire stretch when pulled up: anywhere from 0 to 0.5% longer
+VELOCITY_FACTOR_SD = 0.01  # Insulation and wire variation around the model
+HEIGHT_SD_FEET = 3.0  # Uncertainty in the height it actually hangs at
+HEIGHT_POINTS = 9  # Heights the wire solver is run at to tabulate the height effect
+
+
+def _height_table(target_mhz, length_feet, height_feet, height_sd_feet, ground):
+    """
+    Tabulates how height moves the resonance, with the wire solver.
+
+    Returns:
+        tuple: (heights in feet, resonance relative to the nominal height), sorted by height.
+    """
+    import DipoleToolKit_Wire  # Only needed when a height is given
+
+    lowest = max(height_feet - 4 * height_sd_feet, height_feet * 0.25)
+    heights = np.linspace(lowest, height_feet + 4 * height_sd_feet, HEIGHT_POINTS)
+    resonances = [DipoleToolKit_Wire.dipole(length_feet, height, ground=ground).resonance(target_mhz)
+                  for height in np.append(heights, height_feet)]
+    if None in resonances:
+        raise ValueError("the wire solver could not find a resonance at every height")
+    resonances = np.array(resonances)
+    return heights, resonances[:-1] / resonances[-1]
+
+
+def make_plan(band, segment=None, model=None, margin_feet=0.0, tape_sd_feet=TAPE_SD_FEET,
+              stretch_max=STRETCH_MAX, velocity_factor_sd=VELOCITY_FACTOR_SD,
+              height_feet=None, height_sd_feet=HEIGHT_SD_FEET, ground='average'):
+    """
+    Collects everything the trials need (small and picklable, so it can go to other processes).
+
+    Args:
+        band (str): The amateur radio band (e.g., '40m').
+        segment (int): Segment to aim for in a multi-segment band (default the main one).
+        model (str or AntennaModel): Antenna model for the planned cut (default the 468 rule).
+        margin_feet (float): Extra length added to the planned cut.
+        tape_sd_feet (float): Measuring error (standard deviation) in feet.
+        stretch_max (float): Most the wire stretches, as a fraction (uniform from 0).
+        velocity_factor_sd (float): Spread of the velocity factor (as a fraction).
+        height_feet (float): Nominal height. Default None leaves height out.
+        height_sd_feet (float): Spread of the height in feet.
+        ground: Ground for the height effect (see DipoleToolKit_Wire.GROUNDS).
+
+    Returns:
+        dict: The plan, or None if the band is not found.
+    """
+    target_mhz = toolkit.get_band_resonance_center_frequency(band, segment)
+    if target_mhz is None:
+        return None
+    nominal_feet = toolkit.calculate_dipole_length(target_mhz, model)
+    plan = {
+        'band': band,
+        'target_mhz': target_mhz,
+        'nominal_feet': nominal_feet,
+        'margin_feet': margin_feet,
+        'segments': [(part['low_mhz'], part['high_mhz']) for part in toolkit.get_band_segments(band)],
+        'tape_sd_feet': tape_sd_feet,
+        'stretch_max': stretch_max,
+        'velocity_factor_sd': velocity_factor_sd,
+        'heights': None,
+    }
+    if height_feet is not None and height_sd_feet > 0:
+        plan['height_feet'] = height_feet
+        plan['height_sd_feet'] = height_sd_feet
+        plan['heights'], plan['height_factors'] = _height_table(
+            target_mhz, nominal_feet, height_feet, height_sd_feet, ground)
+    return plan
+
+
+def run_chunk(plan, seed_sequence, trials):
+    """
+    Runs one chunk of trials.
+
+    Each trial's resonance is the target scaled by the planned / actual length,
+    the sampled velocity factor and (with a height) the height effect.
+
+    Args:
+        plan (dict): From make_plan.
+        seed_sequence (numpy.random.SeedSequence): This chunk's own stream.
+        trials (int): Trials in the chunk.
+
+    Returns:
+        numpy.ndarray: Histogram counts of resonance / target, with an underflow
+                       bin first and an overflow bin last.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    planned_feet = plan['nominal_feet'] + plan['margin_feet']
+    length_feet = planned_feet + rng.normal(0.0, plan['tape_sd_feet'], trials)
+    length_feet *= 1 + rng.uniform(0.0, plan['stretch_max'], trials)
+    ratio = plan['nominal_feet'] / length_feet
+    ratio *= rng.normal(1.0, plan['velocity_factor_sd'], trials)
+    if plan['heights'] is not None:
+        heights = rng.normal(plan['height_feet'], plan['height_sd_feet'], trials)
+        ratio *= np.interp(heights, plan['heights'], plan['height_factors'])
+
+    low, high = HISTOGRAM_RANGE
+    bins = np.floor((ratio - low) * (HISTOGRAM_BINS / (high - low)))
+    np.clip(bins, -1, HISTOGRAM_BINS, out=bins)
+    return np.bincount(bins.astype(np.intp) + 1, minlength=HISTOGRAM_BINS + 2)
+
+
+def _run_chunks(plan, jobs):
+    """Runs several (seed sequence, trials) chunks and adds up their histograms."""
+    total = np.zeros(HISTOGRAM_BINS + 2, dtype=np.int64)
+    for seed_sequence, trials in jobs:
+        total += run_chunk(plan, seed_sequence, trials)
+    return total
+
+
+def chunk_jobs(trials, seed=None, chunk_trials=CHUNK_TRIALS):
+    """
+    Splits the trials into chunks, each with its own child of one SeedSequence.
+
+    The same seed always gives the same chunks, so any subset can be run in
+    any process and the merged histograms match a single-process run.
+
+    Args:
+        trials (int): Total number of trials.
+        seed (int): Seed; None draws a fresh one (see the result's 'seed').
+        chunk_trials (int): Trials per chunk.
+
+    Returns:
+        tuple: (the seed used, list of (SeedSequence, trials) jobs).
+    """
+    root = np.random.SeedSequence(seed)
+    chunk_count = -(-trials // chunk_trials)
+    children = root.spawn(chunk_count)
+    sizes = [chunk_trials] * (chunk_count - 1) + [trials - chunk_trials * (chunk_count - 1)]
+    return root.entropy, list(zip(children, sizes))
+
+
+def _fraction_below(cumulative, trials, ratio):
+    """Fraction of trials with resonance / target below a ratio (read off the histogram)."""
+    low, high = HISTOGRAM_RANGE
+    index = int(np.clip(np.floor((ratio - low) * HISTOGRAM_BINS / (high - low)), 0, HISTOGRAM_BINS + 1))
+    return float(cumulative[index] / trials)
+
+
+def _ratio_quantile(cumulative, trials, fraction):
+    """Resonance / target ratio below which a fraction of trials land (upper bin edge)."""
+    low, high = HISTOGRAM_RANGE
+    index = int(np.searchsorted(cumulative, fraction * trials))
+    return float(low + index * (high - low) / HISTOGRAM_BINS)
+
+
+def summarize(plan, histogram, risk=0.02):
+    """
+    Turns a merged histogram into probabilities, percentiles and a pre-trim margin.
+
+    Args:
+        plan (dict): From make_plan.
+        histogram (numpy.ndarray): Merged run_chunk histograms.
+        risk (float): Acceptable chance of ending up short (resonance above the target).
+
+    Returns:
+        dict: See tolerance_analysis.
+    """
+    trials = int(histogram.sum())
+    cumulative = np.cumsum(histogram)
+    target_mhz = plan['target_mhz']
+    planned_feet = plan['nominal_feet'] + plan['margin_feet']
+
+    def below(frequency_mhz, extra_feet=0.0):
+        # Cutting longer scales every trial's resonance by planned / (planned + extra)
+        ratio = frequency_mhz / target_mhz * (planned_feet + extra_feet) / planned_feet
+        return _fraction_below(cumulative, trials, ratio)
+
+    def inside(extra_feet):
+        return sum(below(high_mhz, extra_feet) - below(low_mhz, extra_feet) for low_mhz, high_mhz in plan['segments'])
+
+    percentiles = {f'p{int(fraction * 100)}': target_mhz * _ratio_quantile(cumulative, trials, fraction)
+                   for fraction in (0.05, 0.5, 0.95)}
+
+    # Cut long enough that only `risk` of the trials resonate above the target
+    extra_feet = max(0.0, planned_feet * (_ratio_quantile(cumulative, trials, 1 - risk) - 1))
+    return {
+        'band': plan['band'],
+        'target_mhz': target_mhz,
+        'cut_length_feet': planned_feet,
+        'trials': trials,
+        'inside_band': inside(0.0),
+        'below_band': below(min(low_mhz for low_mhz, _ in plan['segments'])),
+        'above_band': 1 - below(max(high_mhz for _, high_mhz in plan['segments'])),
+        'resonance_mhz': percentiles,
+        'suggested_margin_feet': plan['margin_feet'] + extra_feet,
+        'inside_band_with_margin': inside(extra_feet),
+    }
+
+
+def tolerance_analysis(band, trials=1000000, seed=None, workers=1, chunk_trials=CHUNK_TRIALS, risk=0.02, **tolerances):
+    """
+    Monte Carlo analysis of where the first resonance lands for a band's planned cut.
+
+    Args:
+        band (str): The amateur radio band (e.g., '40m').
+        trials (int): Number of simulated cuts.
+        seed (int): Seed for reproducible results (default None: a fresh one, reported back).
+        workers (int): Processes to spread the chunks over (default 1: this process).
+        chunk_trials (int): Trials per chunk.
+        risk (float): Acceptable chance of the margin still leaving the antenna short.
+        **tolerances: Passed on to make_plan (segment, model, margin_feet, tape_sd_feet,
+                      stretch_max, velocity_factor_sd, height_feet, height_sd_feet, ground).
+
+    Returns:
+        dict: 'band', 'target_mhz', 'cut_length_feet', 'trials', 'seed', the chance the
+              resonance lands 'inside_band' (any segment), 'below_band' or 'above_band',
+              the 'resonance_mhz' 5th/50th/95th percentiles, and the 'suggested_margin_feet'
+              to cut long by (with 'inside_band_with_margin'). None if the band is not found.
+    """
+    plan = make_plan(band, **tolerances)
+    if plan is None:
+        return None
+    seed, jobs = chunk_jobs(trials, seed, chunk_trials)
+    workers = max(1, min(workers or 1, len(jobs)))
+    if workers == 1:
+        histogram = _run_chunks(plan, jobs)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            shares = [jobs[index::workers] for index in range(workers)]
+            histogram = sum(pool.map(_run_chunks, [plan] * workers, shares))
+    result = summarize(plan, histogram, risk)
+    result['seed'] = seed
+    return result
+
+
+def band_tolerances(bands=None, **options):
+    """
+    Runs tolerance_analysis for several bands (default every band in the band table).
+
+    Args:
+        bands (list): Band names.
+        **options: Passed on to tolerance_analysis.
+
+    Returns:
+        list: One result dict per band.
+    """
+    toolkit.refresh_band_plan()
+    return [tolerance_analysis(band, **options) for band in (bands or list(toolkit.rac_band_table))]
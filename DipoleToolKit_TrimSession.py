@@ -0,0 +1,191 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - Trim Session Tracker
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   Keeps track of the cut/measure cycles on one antenna and learns how that
+#   antenna really behaves, instead of assuming the ideal 468 / f rule.
+#
+#   Each (length, measured resonance) pair updates a straight-line fit of
+#   length against 1 / frequency:  length = a / f + b.  The 468 rule is the
+#   special case a = 468, b = 0; inverted-Vs, low antennas and thick wire
+#   show up as a different a and b. From two measurements on, the fit
+#   predicts the exact length for the band's center frequency.
+#
+#   Only five running numbers are kept (count, means and co-moments), so each
+#   new measurement is an O(1) update and the saved session is tiny.
+#
+# ------------------------------------------------------------------------------
+
+import json
+
+import DipoleToolKit_v7 as toolkit
+
+
+class TrimSession:
+    """
+    The measurements and learned length/frequency fit for one antenna.
+
+    Args:
+        band (str): The band the antenna is cut for (e.g., '40m'); sets the target.
+        target_mhz (float): The target resonance in MHz. Default None uses the band's
+                            center from get_band_resonance_center_frequency.
+        name (str): A label for the antenna (e.g. 'Field Day 40m inverted-V').
+
+    Raises:
+        ValueError: If there is neither a known band nor a target frequency.
+    """
+
+    def __init__(self, band=None, target_mhz=None, name=''):
+        if target_mhz is None and band is not None:
+            target_mhz = toolkit.get_band_resonance_center_frequency(band)
+        if target_mhz is None or target_mhz <= 0:
+            raise ValueError("a trim session needs a known band or a target frequency above 0")
+        self.band = band
+        self.target_mhz = target_mhz
+        self.name = name
+        self.count = 0
+        self.mean_x = 0.0  # x = 1 / measured frequency
+        self.mean_y = 0.0  # y = length in feet
+        self.c_xx = 0.0  # Running co-moments (Welford), for a stable incremental fit
+        self.c_xy = 0.0
+        self.last_length_feet = None
+        self.last_measured_mhz = None
+
+    def record(self, length_feet, measured_mhz):
+        """
+        Adds one measurement: the antenna's length and where it resonated.
+
+        Args:
+            length_feet (float): Total dipole length in feet when measured.
+            measured_mhz (float): Measured resonance in MHz.
+
+        Raises:
+            ValueError: If either value is not above 0.
+        """
+        if length_feet <= 0 or measured_mhz <= 0:
+            raise ValueError("length and measured frequency must be above 0")
+        x = 1.0 / measured_mhz
+        self.count += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.count
+        self.mean_y += (length_feet - self.mean_y) / self.count
+        self.c_xx += dx * (x - self.mean_x)
+        self.c_xy += dx * (length_feet - self.mean_y)
+        self.last_length_feet = length_feet
+        self.last_measured_mhz = measured_mhz
+
+    def fit(self):
+        """
+        Returns the learned fit length = a / f + b.
+
+        With one measurement (or several at the same frequency) only the scale
+        can be learned, so b is 0 and a plays the part of the 468 constant.
+
+        Returns:
+            tuple: (a, b), or None before the first measurement.
+        """
+        if self.count == 0:
+            return None
+        if self.count < 2 or self.c_xx <= 1e-12 * self.mean_x * self.mean_x:
+            return self.mean_y / self.mean_x, 0.0
+        a = self.c_xy / self.c_xx
+        return a, self.mean_y - a * self.mean_x
+
+    def predicted_length(self, frequency_mhz=None):
+        """
+        Predicts the length that resonates at a frequency.
+
+        Args:
+            frequency_mhz (float): Default None uses the session's target.
+
+        Returns:
+            float: Length in feet, or None before the first measurement.
+        """
+        fit = self.fit()
+        if fit is None:
+            return None
+        a, b = fit
+        return a / (frequency_mhz or self.target_mhz) + b
+
+    def next_correction(self):
+        """
+        The change to make to the antenna's last measured length to hit the target.
+
+        Returns:
+            float: Change in feet (positive means lengthen, negative means shorten),
+                   or None before the first measurement.
+        """
+        predicted = self.predicted_length()
+        if predicted is None:
+            return None
+        return predicted - self.last_length_feet
+
+    def ideal_correction(self):
+        """
+        The correction the plain 468 / f rule would give for the last measurement.
+
+        Returns:
+            float: Change in feet, signed like next_correction (positive means lengthen),
+                   or None before the first measurement.
+        """
+        if self.count == 0:
+            return None
+        # calculate_length_correction reports measured minus target length; flip it
+        # so a resonance below the target (antenna too long) comes out as a cut.
+        return -toolkit.calculate_length_correction(self.target_mhz, self.last_measured_mhz)
+
+    def to_dict(self):
+        """Returns the session as a small JSON-ready dict."""
+        return {name: getattr(self, name) for name in (
+            'name', 'band', 'target_mhz', 'count', 'mean_x', 'mean_y', 'c_xx', 'c_xy',
+            'last_length_feet', 'last_measured_mhz')}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuilds a session saved with to_dict.
+
+        Args:
+            state (dict): The saved session.
+
+        Returns:
+            TrimSession: The session.
+        """
+        session = cls(state.get('band'), state['target_mhz'], state.get('name', ''))
+        for name in ('count', 'mean_x', 'mean_y', 'c_xx', 'c_xy', 'last_length_feet', 'last_measured_mhz'):
+            setattr(session, name, state[name])
+        return session
+
+    def save(self, path):
+        """
+        Saves the session as JSON.
+
+        Args:
+            path (str): The session file.
+        """
+        with open(path, 'w') as session_file:
+            json.dump(self.to_dict(), session_file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a session saved with save.
+
+        Args:
+            path (str): The session file.
+
+        Returns:
+            TrimSession: The session.
+        """
+        with open(path) as session_file:
+            return cls.from_dict(json.load(session_file))
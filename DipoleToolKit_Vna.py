@@ -0,0 +1,633 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - VNA Sweep Reader
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   Reads antenna analyzer sweeps (Touchstone .s1p files and NanoVNA CSV
+#   exports), finds the resonance (lowest SWR point) and feeds it into the
+#   DipoleToolKit_v7 length correction, instead of reading the resonance off
+#   the screen by eye.
+#
+#   Files are memory-mapped and parsed a chunk at a time straight into NumPy
+#   arrays (no Python object per line), so sweep files of any size are read
+#   with bounded memory. The resonance can be estimated between sweep points
+#   (with the 2:1 SWR bandwidth), for thousands of sweeps at once.
+#
+# ------------------------------------------------------------------------------
+
+import concurrent.futures
+import json
+import math
+import mmap
+import os
+
+import numpy as np
+
+import DipoleToolKit_v7 as toolkit
+
+CHUNK_BYTES = 8 * 1024 * 1024  # Bytes of sweep text parsed at a time
+
+# Frequency unit words (lower case) -> factor to MHz
+FREQUENCY_UNITS = {'hz': 1e-6, 'khz': 1e-3, 'mhz': 1.0, 'ghz': 1e3}
+
+# File name endings treated as sweeps when walking an archive
+SWEEP_SUFFIXES = ('.s1p', '.csv')
+
+# Separators in CSV exports, turned into spaces before parsing
+_SEPARATORS = bytes.maketrans(b',;\t', b'   ')
+
+
+def _read_touchstone_options(line):
+    """
+    Reads a Touchstone option line, e.g. "# MHz S RI R 50".
+
+    Returns:
+        tuple: (factor to MHz, data format 'RI', 'MA' or 'DB').
+    """
+    frequency_scale, data_format = FREQUENCY_UNITS['ghz'], 'MA'  # Touchstone defaults
+    for word in line[1:].split():
+        word = word.lower()
+        if word in FREQUENCY_UNITS:
+            frequency_scale = FREQUENCY_UNITS[word]
+        elif word in ('ri', 'ma', 'db'):
+            data_format = word.upper()
+    return frequency_scale, data_format
+
+
+def _read_csv_header(line):
+    """
+    Works out the columns of a NanoVNA CSV export from its header line.
+
+    Handles real/imaginary S11 exports (e.g. NanoVNA-Saver "Frequency,Re,Im")
+    and exports with an SWR column. Frequencies are in Hz unless the header
+    names another unit (e.g. "Frequency (MHz)").
+
+    Returns:
+        tuple: (column count, factor to MHz, data format 'RI' or 'SWR', column positions).
+
+    Raises:
+        ValueError: If there is no frequency column or no S11/SWR columns.
+    """
+    names = [name.strip().lower() for name in line.replace(';', ',').replace('\t', ',').split(',')]
+    frequency_column = next((i for i, name in enumerate(names) if 'freq' in name), None)
+    if frequency_column is None:
+        raise ValueError("no frequency column in the CSV header")
+
+    frequency_scale = FREQUENCY_UNITS['hz']
+    for unit in ('ghz', 'mhz', 'khz'):
+        if unit in names[frequency_column]:
+            frequency_scale = FREQUENCY_UNITS[unit]
+            break
+
+    swr_column = next((i for i, name in enumerate(names) if 'swr' in name), None)
+    if swr_column is not None:
+        return len(names), frequency_scale, 'SWR', (frequency_column, swr_column)
+    real_column = next((i for i, name in enumerate(names) if name.startswith('re')), None)
+    imaginary_column = next((i for i, name in enumerate(names) if name.startswith('im')), None)
+    if real_column is None or imaginary_column is None:
+        raise ValueError("no SWR or real/imaginary S11 columns in the CSV header")
+    return len(names), frequency_scale, 'RI', (frequency_column, real_column, imaginary_column)
+
+
+def read_sweep_layout(data):
+    """
+    Reads the header of a sweep file and finds where its numbers start.
+
+    A file without an option line or header whose rows are comma, semicolon or
+    tab separated is read as a headerless NanoVNA CSV export: frequency in Hz,
+    then the real and imaginary parts of S11.
+
+    Args:
+        data (mmap.mmap or bytes): The file contents.
+
+    Returns:
+        dict: 'offset' of the first data line, 'columns' per row, 'frequency_scale'
+              (factor to MHz), 'format' ('RI', 'MA', 'DB' or 'SWR') and 'use'
+              (the column positions needed, frequency first).
+
+    Raises:
+        ValueError: If the file is neither Touchstone nor a recognised CSV export.
+    """
+    layout = {'offset': 0, 'columns': 3, 'frequency_scale': FREQUENCY_UNITS['ghz'],
+              'format': 'MA', 'use': (0, 1, 2)}
+    has_header = False
+    offset = 0
+    while offset < len(data):
+        end = data.find(b'\n', offset)
+        end = len(data) if end == -1 else end + 1
+        line = data[offset:end].decode('latin-1').strip()
+        if not line or line.startswith('!'):
+            offset = end
+            continue
+        if line.startswith('#'):  # Touchstone option line
+            layout['frequency_scale'], layout['format'] = _read_touchstone_options(line)
+            has_header = True
+            offset = end
+            continue
+        if line[0].isalpha() or line[0] == '"':  # CSV header line
+            columns, frequency_scale, data_format, use = _read_csv_header(line.replace('"', ''))
+            layout.update(columns=columns, frequency_scale=frequency_scale, format=data_format, use=use)
+            has_header = True
+            offset = end
+            continue
+        if not has_header and any(separator in line for separator in ',;\t'):  # Headerless CSV
+            layout.update(columns=len(line.encode('latin-1').translate(_SEPARATORS).split()),
+                          frequency_scale=FREQUENCY_UNITS['hz'], format='RI')
+        layout['offset'] = offset
+        return layout
+    raise ValueError("no sweep data found")
+
+
+def _parse_rows(text, columns):
+    """
+    Parses a block of whole sweep lines into a (rows, columns) array.
+
+    The fast path hands the whole block to NumPy's text parser. Blocks with
+    anything else in them (trailing '!' comments, stray text lines) fall back
+    to keeping only the numeric part of each line.
+    """
+    text = text.translate(_SEPARATORS)
+    try:
+        values = np.fromstring(text, sep=' ')
+        if values.size % columns == 0:
+            return values.reshape(-1, columns)
+    except ValueError:
+        pass
+    rows = []
+    for line in text.split(b'\n'):
+        line = line.split(b'!')[0].strip()
+        if line and (line[:1].isdigit() or line[:1] in b'+-.'):
+            rows.append(line)
+    values = np.fromstring(b'\n'.join(rows), sep=' ') if rows else np.empty(0)
+    if values.size % columns:
+        raise ValueError("sweep rows have a varying number of columns")
+    return values.reshape(-1, columns)
+
+
+def _swr_from_rows(rows, layout):
+    """Turns parsed rows into (frequency MHz, SWR) arrays."""
+    use = layout['use']
+    frequency_mhz = rows[:, use[0]] * layout['frequency_scale']
+    data_format = layout['format']
+    if data_format == 'SWR':
+        return frequency_mhz, rows[:, use[1]].copy()
+    if data_format == 'RI':
+        gamma = np.hypot(rows[:, use[1]], rows[:, use[2]])
+    elif data_format == 'DB':
+        gamma = 10 ** (rows[:, use[1]] / 20)
+    else:  # MA
+        gamma = np.abs(rows[:, use[1]])
+    with np.errstate(divide='ignore'):
+        swr = np.where(gamma < 1, (1 + gamma) / (1 - gamma), np.inf)
+    return frequency_mhz, swr
+
+
+def iter_sweep_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Streams a sweep file as (frequency MHz, SWR) array pairs, one chunk at a time.
+
+    Args:
+        path (str): A Touchstone .s1p file or a NanoVNA CSV export.
+        chunk_bytes (int): Roughly how many bytes of text to parse per chunk.
+
+    Yields:
+        tuple: (frequency_mhz, swr) NumPy arrays for the next run of sweep points.
+
+    Raises:
+        ValueError: If the file is empty or not a recognised sweep format.
+    """
+    with open(path, 'rb') as sweep_file:
+        try:
+            data = mmap.mmap(sweep_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"{path} is empty")
+        with data:
+            layout = read_sweep_layout(data)
+            start = layout['offset']
+            while start < len(data):
+                end = data.rfind(b'\n', start, start + chunk_bytes) + 1
+                if end <= start:  # No line break inside this chunk: take the whole line
+                    end = data.find(b'\n', start + chunk_bytes)
+                    end = len(data) if end == -1 else end + 1
+                if start + chunk_bytes >= len(data):
+                    end = len(data)
+                rows = _parse_rows(data[start:end], layout['columns'])
+                start = end
+                if len(rows):
+                    yield _swr_from_rows(rows, layout)
+
+
+def read_sweep(path):
+    """
+    Reads a whole sweep file into NumPy arrays.
+
+    Args:
+        path (str): A Touchstone .s1p file or a NanoVNA CSV export.
+
+    Returns:
+        dict: 'frequency_mhz' and 'swr' arrays, in file order.
+    """
+    chunks = list(iter_sweep_chunks(path))
+    if not chunks:
+        return {'frequency_mhz': np.empty(0), 'swr': np.empty(0)}
+    return {
+        'frequency_mhz': np.concatenate([frequency_mhz for frequency_mhz, _ in chunks]),
+        'swr': np.concatenate([swr for _, swr in chunks]),
+    }
+
+
+def find_resonance(path):
+    """
+    Finds the resonance (lowest SWR point) of a sweep file without holding the whole sweep.
+
+    Args:
+        path (str): A Touchstone .s1p file or a NanoVNA CSV export.
+
+    Returns:
+        dict: 'frequency_mhz' and 'swr' at resonance, plus the sweep's 'points',
+              'start_mhz' and 'stop_mhz'.
+
+    Raises:
+        ValueError: If the file holds no sweep points.
+    """
+    best_swr, best_frequency = np.inf, None
+    points, start_mhz, stop_mhz = 0, np.inf, -np.inf
+    for frequency_mhz, swr in iter_sweep_chunks(path):
+        i = int(np.argmin(swr))
+        if best_frequency is None or swr[i] < best_swr:
+            best_swr, best_frequency = float(swr[i]), float(frequency_mhz[i])
+        points += len(swr)
+        start_mhz = min(start_mhz, float(frequency_mhz.min()))
+        stop_mhz = max(stop_mhz, float(frequency_mhz.max()))
+    if best_frequency is None:
+        raise ValueError(f"{path} holds no sweep points")
+    return {'frequency_mhz': best_frequency, 'swr': best_swr, 'points': points,
+            'start_mhz': start_mhz, 'stop_mhz': stop_mhz}
+
+
+def _gamma_squared(swr):
+    """|S11|^2 from SWR (1 where the SWR is infinite)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.isfinite(swr), ((swr - 1) / (swr + 1)) ** 2, 1.0)
+
+
+def estimate_resonance(frequency_mhz, swr):
+    """
+    Estimates resonance between sweep points, for many sweeps at once.
+
+    Near resonance the reflection coefficient moves along a nearly straight
+    line in the complex plane, so |S11|^2 is close to a parabola in frequency.
+    A parabola through the lowest point and its two neighbours gives the
+    resonance to a fraction of the sweep step; the 2:1 SWR edges (|S11|^2 = 1/9)
+    are interpolated between the points either side of them.
+
+    Args:
+        frequency_mhz (array_like): Sweep frequencies in MHz, either one axis shared
+                                    by every sweep (points,) or one per sweep (sweeps, points).
+        swr (array_like): SWR values, (points,) for one sweep or (sweeps, points).
+
+    Returns:
+        dict: Arrays with one value per sweep: 'frequency_mhz' and 'swr' at resonance,
+              'bandwidth_low_mhz', 'bandwidth_high_mhz' and 'bandwidth_mhz' for SWR <= 2
+              (NaN where the sweep never reaches 2:1, or leaves it off the sweep's end).
+    """
+    swr = np.atleast_2d(np.asarray(swr, dtype=float))
+    frequency_mhz = np.broadcast_to(np.asarray(frequency_mhz, dtype=float), swr.shape)
+    sweeps, points = swr.shape
+    if points < 3:
+        raise ValueError("a sweep needs at least 3 points")
+    rows = np.arange(sweeps)[:, None]
+    gamma_squared = _gamma_squared(swr)
+
+    lowest = np.argmin(gamma_squared, axis=1)
+    middle = np.clip(lowest, 1, points - 2)[:, None]
+    x = np.take_along_axis(frequency_mhz, np.hstack([middle - 1, middle, middle + 1]), axis=1)
+    y = np.take_along_axis(gamma_squared, np.hstack([middle - 1, middle, middle + 1]), axis=1)
+    x0, x1, x2 = x.T
+    y0, y1, y2 = y.T
+
+    # Vertex of the parabola through the three points (any point spacing)
+    left, right = (x1 - x0) * (y1 - y2), (x1 - x2) * (y1 - y0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vertex = x1 - 0.5 * ((x1 - x0) * left - (x1 - x2) * right) / (left - right)
+        inside = np.isfinite(vertex) & (vertex >= np.minimum(x0, x2)) & (vertex <= np.maximum(x0, x2))
+        vertex = np.where(inside, vertex, frequency_mhz[rows[:, 0], lowest])
+        # Parabola value at the vertex (Lagrange form)
+        fitted = (y0 * (vertex - x1) * (vertex - x2) / ((x0 - x1) * (x0 - x2))
+                  + y1 * (vertex - x0) * (vertex - x2) / ((x1 - x0) * (x1 - x2))
+                  + y2 * (vertex - x0) * (vertex - x1) / ((x2 - x0) * (x2 - x1)))
+    fitted = np.where(inside, np.clip(fitted, 0.0, y1), gamma_squared[rows[:, 0], lowest])
+    gamma = np.sqrt(fitted)
+    with np.errstate(divide='ignore'):
+        resonance_swr = np.where(gamma < 1, (1 + gamma) / (1 - gamma), np.inf)
+
+    # 2:1 SWR edges: the last point above 2:1 before the minimum and the first one after it
+    index = np.arange(points)[None, :]
+    above = gamma_squared > 1 / 9
+    low_edge = np.where(above & (index < lowest[:, None]), index, -1).max(axis=1)
+    high_edge = np.where(above & (index > lowest[:, None]), index, points).min(axis=1)
+    reaches = gamma_squared[rows[:, 0], lowest] <= 1 / 9
+    has_low = reaches & (low_edge >= 0)
+    has_high = reaches & (high_edge < points)
+
+    def crossing(outside, inside_point):
+        """Frequency where |S11|^2 crosses 1/9 between two neighbouring points."""
+        outside = np.clip(outside, 0, points - 1)[:, None]
+        inside_point = np.clip(inside_point, 0, points - 1)[:, None]
+        fa = np.take_along_axis(frequency_mhz, outside, axis=1)[:, 0]
+        fb = np.take_along_axis(frequency_mhz, inside_point, axis=1)[:, 0]
+        ga = np.take_along_axis(gamma_squared, outside, axis=1)[:, 0]
+        gb = np.take_along_axis(gamma_squared, inside_point, axis=1)[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return fa + (fb - fa) * (ga - 1 / 9) / (ga - gb)
+
+    bandwidth_low = np.where(has_low, crossing(low_edge, low_edge + 1), np.nan)
+    bandwidth_high = np.where(has_high, crossing(high_edge, high_edge - 1), np.nan)
+    return {
+        'frequency_mhz': vertex,
+        'swr': resonance_swr,
+        'bandwidth_low_mhz': bandwidth_low,
+        'bandwidth_high_mhz': bandwidth_high,
+        'bandwidth_mhz': bandwidth_high - bandwidth_low,
+    }
+
+
+def estimate_length_corrections(target_frequency_mhz, estimates):
+    """
+    Length corrections for a batch of resonance estimates (see estimate_resonance).
+
+    Args:
+        target_frequency_mhz (float or array_like): Desired resonant frequencies in MHz.
+        estimates (dict): From estimate_resonance.
+
+    Returns:
+        numpy.ndarray: Changes in length in feet per sweep (positive means lengthen).
+    """
+    return toolkit.calculate_length_corrections(target_frequency_mhz, estimates['frequency_mhz'])
+
+
+def resonance_points(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Streams a sweep file and keeps only the points estimate_resonance reads.
+
+    Those are the lowest point with two points either side of it, and at each
+    2:1 SWR crossing around it the last point above 2:1 and its neighbour
+    towards the minimum. Every point in between is under 2:1 and no lower than
+    the minimum, so leaving it out does not change the estimate, and a few
+    points are held however long the sweep is.
+
+    Args:
+        path (str): A Touchstone .s1p file or a NanoVNA CSV export.
+        chunk_bytes (int): Roughly how many bytes of text to parse per chunk.
+
+    Returns:
+        dict: 'frequency_mhz' and 'swr' arrays of the kept points in sweep order,
+              and the whole sweep's 'points', 'start_mhz' and 'stop_mhz'.
+    """
+    best = np.inf
+    kept = {}  # Sweep index -> (frequency, SWR) around the lowest point so far
+    recent = {}  # The same for the last point above 2:1, the one after it and the last two points read
+    need_after = 0  # Points after the lowest one still to keep
+    need_high = False  # Still looking for the first point above 2:1 after the lowest one
+    last_above = -1
+    base = 0  # Sweep index of the chunk's first point
+    start_mhz, stop_mhz = np.inf, -np.inf
+    for frequency_mhz, swr in iter_sweep_chunks(path, chunk_bytes):
+        count = len(swr)
+        gamma_squared = _gamma_squared(swr)
+        above = np.flatnonzero(gamma_squared > 1 / 9)
+
+        def point(index):
+            if index >= base:
+                return float(frequency_mhz[index - base]), float(swr[index - base])
+            return recent[index]
+
+        def keep_high(after):
+            # The first point above 2:1 after the lowest one, and the point before it
+            high = base + int(after[0])
+            kept[high - 1] = point(high - 1)
+            kept[high] = point(high)
+
+        # Finish the points around a minimum found in an earlier chunk
+        for index in range(base, base + min(need_after, count)):
+            kept[index] = point(index)
+        need_after -= min(need_after, count)
+        if need_high and len(above):
+            keep_high(above)
+            need_high = False
+
+        lowest = int(np.argmin(gamma_squared))
+        if gamma_squared[lowest] < best:  # A new minimum (the first of equal ones is kept)
+            best = float(gamma_squared[lowest])
+            middle = base + lowest
+            before = above[above < lowest]
+            low = base + int(before[-1]) if len(before) else last_above
+            kept = {}
+            for index in (low, low + 1) if low >= 0 else ():
+                kept[index] = point(index)
+            for index in range(max(middle - 2, 0), min(middle + 3, base + count)):
+                kept[index] = point(index)
+            need_after = middle + 3 - min(middle + 3, base + count)
+            after = above[above > lowest]
+            need_high = not len(after)
+            if len(after):
+                keep_high(after)
+
+        # What a minimum in a later chunk may need from this one
+        if len(above):
+            last_above = base + int(above[-1])
+        recent = {index: point(index) for index in (last_above, last_above + 1, base + count - 2, base + count - 1)
+                  if 0 <= index < base + count}
+        base += count
+        start_mhz = min(start_mhz, float(frequency_mhz.min()))
+        stop_mhz = max(stop_mhz, float(frequency_mhz.max()))
+
+    values = np.array([kept[index] for index in sorted(kept)]).reshape(-1, 2)
+    return {'frequency_mhz': values[:, 0], 'swr': values[:, 1], 'points': base,
+            'start_mhz': start_mhz, 'stop_mhz': stop_mhz}
+
+
+def sweep_resonance(path, refine=True):
+    """
+    Summarises the resonance of one sweep file, streaming it with bounded memory.
+
+    Args:
+        path (str): A Touchstone .s1p file or a NanoVNA CSV export.
+        refine (bool): Estimate between sweep points (see estimate_resonance); False
+                       takes the lowest SWR point (see find_resonance).
+
+    Returns:
+        dict: 'frequency_mhz' and 'swr' at resonance, 'points', 'start_mhz', 'stop_mhz'
+              and, when refined, the 2:1 SWR bandwidth figures.
+    """
+    if not refine:
+        return find_resonance(path)
+    sweep = resonance_points(path)
+    if sweep['points'] < 3:
+        raise ValueError(f"{path} holds fewer than 3 sweep points")
+    estimate = estimate_resonance(sweep['frequency_mhz'], sweep['swr'])
+    resonance = {name: float(values[0]) for name, values in estimate.items()}
+    resonance.update(points=sweep['points'], start_mhz=sweep['start_mhz'], stop_mhz=sweep['stop_mhz'])
+    return resonance
+
+
+def sweep_length_correction(path, band, refine=True):
+    """
+    Works out the length correction for a band from a measured sweep (Option B from a file).
+
+    Args:
+        path (str): A Touchstone .s1p file or a NanoVNA CSV export.
+        band (str): The amateur radio band the antenna is cut for (e.g., '40m').
+        refine (bool): Estimate the resonance between sweep points and add the 2:1 SWR
+                       bandwidth. False takes the lowest SWR point as is.
+
+    Returns:
+        dict: The resonance summary (see find_resonance) plus 'band', 'target_mhz',
+              'correction_feet' and 'correction_inches', or None if the band is not found.
+    """
+    target_frequency = toolkit.get_band_resonance_center_frequency(band)
+    if target_frequency is None:
+        return None
+    resonance = sweep_resonance(path, refine)
+    length_correction_feet = toolkit.calculate_length_correction(target_frequency, resonance['frequency_mhz'])
+    resonance.update(band=band, target_mhz=target_frequency, correction_feet=length_correction_feet,
+                     correction_inches=None if length_correction_feet is None else length_correction_feet * 12)
+    return resonance
+
+
+def guess_band(frequency_mhz):
+    """
+    Guesses which band an antenna resonating at a frequency was built for.
+
+    Args:
+        frequency_mhz (float): The resonance in MHz.
+
+    Returns:
+        tuple: (band, in_band); the band holding the frequency, or else the band
+               whose center is nearest on a log scale (in_band False).
+    """
+    found = toolkit.band_for_frequency(frequency_mhz)
+    if found is not None:
+        return found[0], True
+    if not frequency_mhz > 0:
+        return None, False
+    nearest = min(toolkit.rac_band_table.items(),
+                  key=lambda item: abs(math.log(item[1]['center'] / frequency_mhz)))
+    return nearest[0], False
+
+
+def analyze_sweep_file(path):
+    """
+    Analyses one archived sweep: resonance, band guess and the correction for that band.
+
+    Args:
+        path (str): A Touchstone .s1p file or a NanoVNA CSV export.
+
+    Returns:
+        dict: The resonance summary (see sweep_resonance) plus 'file', 'band',
+              'in_band', 'target_mhz', 'correction_feet' and 'correction_inches';
+              or 'file' and 'error' if the sweep cannot be read.
+    """
+    try:
+        result = sweep_resonance(path)
+    except (OSError, ValueError) as error:
+        return {'file': path, 'error': str(error)}
+    band, in_band = guess_band(result['frequency_mhz'])
+    target_frequency = toolkit.get_band_resonance_center_frequency(band) if band else None
+    length_correction_feet = None
+    if target_frequency is not None:
+        length_correction_feet = toolkit.calculate_length_correction(target_frequency, result['frequency_mhz'])
+    result.update(file=path, band=band, in_band=in_band, target_mhz=target_frequency,
+                  correction_feet=length_correction_feet,
+                  correction_inches=None if length_correction_feet is None else length_correction_feet * 12)
+    return result
+
+
+def _analyze_sweep_files(paths):
+    """Worker task: analyses a chunk of sweep files (one task per chunk keeps IPC low)."""
+    return [analyze_sweep_file(path) for path in paths]
+
+
+def find_sweep_files(directory):
+    """
+    Walks a directory tree for sweep files.
+
+    Args:
+        directory (str): The archive's top directory.
+
+    Yields:
+        str: Paths of files ending in one of SWEEP_SUFFIXES.
+    """
+    for folder, subfolders, files in os.walk(directory):
+        subfolders.sort()
+        for name in sorted(files):
+            if name.lower().endswith(SWEEP_SUFFIXES):
+                yield os.path.join(folder, name)
+
+
+def _chunks(items, size):
+    """Groups an iterable into lists of up to size items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyze_sweep_archive(directory, output, workers=None, chunk_size=32):
+    """
+    Analyses every sweep file under a directory across a pool of processes.
+
+    Files are handed out in chunks (one task per chunk), with a bounded number
+    of chunks in flight, and each result is written to the output as one JSON
+    line as soon as its chunk finishes (completion order, not file order).
+
+    Args:
+        directory (str): The archive's top directory.
+        output (file): Open text stream for the JSON lines.
+        workers (int): Processes to use. Default None uses every available core.
+        chunk_size (int): Files per task.
+
+    Returns:
+        dict: 'files' analysed and 'errors' among them.
+    """
+    if workers is None:
+        workers = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    workers = max(1, workers or 1)
+    counts = {'files': 0, 'errors': 0}
+
+    def write(results):
+        for result in results:
+            output.write(json.dumps(result) + '\n')
+            counts['files'] += 1
+            counts['errors'] += 'error' in result
+
+    chunks = _chunks(find_sweep_files(directory), chunk_size)
+    if workers == 1:  # Not worth a pool
+        for chunk in chunks:
+            write(_analyze_sweep_files(chunk))
+        return counts
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_analyze_sweep_files, chunk))
+            if len(pending) >= workers * 4:  # Keep the queue short so memory stays flat
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+        for future in concurrent.futures.as_completed(pending):
+            write(future.result())
+    return counts
@@ -0,0 +1,566 @@
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit - Wire Antenna Solver
+#
+# Authors:
+#   VA3PAF
+#
+# Date Created:
+#   2026-10-18
+#
+# Version:
+#    7.0
+#
+# Description:
+#   A small thin-wire method-of-moments solver (the same idea as NEC: cut the
+#   wire into short segments, work out how every segment's current pushes on
+#   every other one, and solve for the currents). It gives the feedpoint
+#   impedance and the true resonance of a flat dipole or an inverted-V at a
+#   given height, where the 468 / f rule only gives a first cut.
+#
+#   The wire is a chain of straight segments fed at one node (the center of a
+#   dipole, the apex of an inverted-V). Currents are triangles spread over the
+#   two segments beside each node, charges are uniform on each segment, and
+#   the wire's radius enters through the reduced kernel (Harrington's
+#   formulation). Ground is free space, perfect ground, or a simple real
+#   ground (the image of the antenna scaled by the ground's reflection
+#   coefficient at normal incidence - a rough but common approximation).
+#
+#   Everything that only depends on the geometry (distances between segments
+#   and the static part of every integral) is worked out once per antenna,
+#   so each new frequency only costs a few NumPy exponentials and one LU
+#   solve; solved impedance matrices are also kept per frequency. Sweeps
+#   build and solve a block of frequencies at a time, blocks spread over a
+#   thread pool, and come back as plain NumPy arrays.
+#
+#   Example (a 40m inverted-V, apex at 35 feet, over average ground):
+#     antenna = inverted_v(65.5, apex_height_feet=35, ground='average')
+#     antenna.impedance(7.15)       -> complex feedpoint impedance (ohms)
+#     antenna.resonance()           -> MHz where the reactance crosses zero
+#     resonant_length(7.15, 'inverted-v', height_feet=35, ground='average')
+#     sweep_band('40m', 'inverted-v', height_feet=35, ground='average')
+#
+# ------------------------------------------------------------------------------
+
+import concurrent.futures
+import math
+import os
+
+import numpy as np
+
+import DipoleToolKit_v7 as toolkit
+
+FEET_PER_METRE = 3.280839895
+SPEED_OF_LIGHT = 299792458.0  # m/s
+MU_0 = 4e-7 * math.pi
+EPSILON_0 = 1 / (MU_0 * SPEED_OF_LIGHT ** 2)
+
+DEFAULT_SEGMENTS = 50
+SWEEP_BLOCK = 16  # Frequencies built and solved together in a sweep
+DEFAULT_WIRE_DIAMETER_MM = 1.63  # #14 AWG
+
+# Gauss-Legendre points on [0, 1] for the smooth part of the segment integrals
+_GAUSS_X, _GAUSS_W = np.polynomial.legendre.leggauss(4)
+_GAUSS_X = (_GAUSS_X + 1) / 2
+_GAUSS_W = _GAUSS_W / 2
+
+# Named grounds: (relative permittivity, conductivity in S/m)
+GROUNDS = {
+    'poor': (5.0, 0.001),
+    'average': (13.0, 0.005),
+    'good': (20.0, 0.0303),
+    'sea': (80.0, 5.0),
+}
+
+
+def _segment_integrals(points, starts, units, lengths, radius):
+    """
+    Works out the frequency-independent part of the integrals of e^-jkR / R.
+
+    Each integral runs along a straight source segment and is seen from one
+    observation point; R includes the wire radius (the reduced kernel). The
+    1 / R part has an exact answer; what is left, (e^-jkR - 1) / R, is smooth
+    and is summed at a few Gauss points once k is known.
+
+    Args:
+        points (numpy.ndarray): Observation points, shape (M, 3), in metres.
+        starts (numpy.ndarray): Segment start points, shape (S, 3).
+        units (numpy.ndarray): Segment unit directions, shape (S, 3).
+        lengths (numpy.ndarray): Segment lengths, shape (S,).
+        radius (float): Wire radius in metres.
+
+    Returns:
+        tuple: (static integrals (M, S), Gauss point distances (M, S, Q), Gauss weights (S, Q)).
+    """
+    offsets = points[:, None, :] - starts[None, :, :]
+    along = np.einsum('msk,sk->ms', offsets, units)
+    across = np.sqrt(np.maximum(np.einsum('msk,msk->ms', offsets, offsets) - along ** 2, 0.0) + radius ** 2)
+    static = np.arcsinh((lengths - along) / across) + np.arcsinh(along / across)
+
+    gauss_points = starts[:, None, :] + units[:, None, :] * (lengths[:, None, None] * _GAUSS_X[None, :, None])
+    gaps = points[:, None, None, :] - gauss_points[None, :, :, :]
+    distances = np.sqrt(np.einsum('msqk,msqk->msq', gaps, gaps) + radius ** 2)
+    weights = lengths[:, None] * _GAUSS_W[None, :]
+    return static, distances, weights
+
+
+def _complete_integrals(kernel, wavenumbers):
+    """
+    Adds the smooth (e^-jkR - 1) / R part to a kernel from _segment_integrals.
+
+    Args:
+        kernel (tuple): From _segment_integrals.
+        wavenumbers (numpy.ndarray): Wavenumbers in radians per metre, shape (F,).
+
+    Returns:
+        numpy.ndarray: The complete integrals, shape (F, M, S).
+    """
+    static, distances, weights = kernel
+    smooth = _phasors(distances, wavenumbers)
+    smooth -= 1
+    smooth /= distances
+    return static + np.einsum('fmsq,sq->fms', smooth, weights)
+
+
+def _phasors(distances, wavenumbers):
+    """
+    e^-jkR for every wavenumber, shape (F,) + distances.shape.
+
+    On an evenly spaced grid (every sweep made with linspace) each frequency's
+    phasors are the previous ones times one fixed step, so a whole block costs
+    two complex exponentials and a run of multiplies, which is several times
+    faster than an exponential per frequency.
+    """
+    steps = np.diff(wavenumbers)
+    if len(steps) < 2 or not np.allclose(steps, steps[0], rtol=1e-9, atol=0):
+        return np.exp(-1j * wavenumbers[:, None, None, None] * distances)
+    phasors = np.empty((len(wavenumbers),) + distances.shape, dtype=complex)
+    phasors[0] = np.exp(-1j * wavenumbers[0] * distances)
+    step = np.exp(-1j * steps[0] * distances)
+    for index in range(1, len(wavenumbers)):
+        np.multiply(phasors[index - 1], step, out=phasors[index])
+    return phasors
+
+
+class WireAntenna:
+    """
+    One wire antenna (a chain of straight segments) ready to be solved at any frequency.
+
+    Args:
+        nodes (array_like): The segment end points in metres, shape (N + 1, 3), along the wire.
+                            z is the height above ground.
+        radius_m (float): Wire radius in metres.
+        feed_node (int): Index of the (interior) node where the feedline connects.
+        ground: None for free space, 'perfect', a name from GROUNDS, or a
+                (relative permittivity, conductivity S/m) pair.
+
+    Raises:
+        ValueError: If the feed is not an interior node or the ground is unknown.
+    """
+
+    def __init__(self, nodes, radius_m, feed_node, ground=None):
+        nodes = np.asarray(nodes, dtype=float)
+        if not 0 < feed_node < len(nodes) - 1:
+            raise ValueError("the feed must be at a node between two segments")
+        if isinstance(ground, str) and ground != 'perfect':
+            if ground not in GROUNDS:
+                raise ValueError(f"Unknown ground: {ground}")
+            ground = GROUNDS[ground]
+        self.nodes = nodes
+        self.radius_m = radius_m
+        self.feed_node = feed_node
+        self.ground = ground
+
+        starts, ends = nodes[:-1], nodes[1:]
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        units = (ends - starts) / lengths[:, None]
+        middles = (starts + ends) / 2
+        segment_count = len(lengths)
+        self.segment_count = segment_count
+        self.length_m = float(lengths.sum())
+
+        # Each segment in two halves (start -> middle, middle -> end); the triangle
+        # current of interior node n is carried by the half after it and the half before it.
+        half_starts = np.repeat(starts, 2, axis=0)
+        half_starts[1::2] = middles
+        half_units = np.repeat(units, 2, axis=0)
+        half_lengths = np.repeat(lengths / 2, 2)
+        half_centres = half_starts + half_units * (half_lengths[:, None] / 2)
+
+        basis_count = segment_count - 1  # One per interior node
+        half_to_basis = np.zeros((2 * segment_count, basis_count))
+        half_to_basis[np.arange(2, 2 * segment_count, 2), np.arange(basis_count)] = 1  # After the node
+        half_to_basis[np.arange(1, 2 * segment_count - 1, 2), np.arange(basis_count)] = 1  # Before the node
+        segment_to_basis = np.zeros((segment_count, basis_count))
+        segment_to_basis[np.arange(1, segment_count), np.arange(basis_count)] = 1  # Charge ahead of the node
+        segment_to_basis[np.arange(basis_count), np.arange(basis_count)] = -1  # Charge behind it
+        self._half_to_basis = half_to_basis
+        self._segment_to_basis = segment_to_basis
+
+        # Geometry-only precomputation, shared by every frequency
+        self._direction_terms = half_lengths[:, None] * (half_units @ half_units.T)
+        self._vector_kernel = _segment_integrals(half_centres, half_starts, half_units, half_lengths, radius_m)
+        self._scalar_kernel = _segment_integrals(middles, starts, units, lengths, radius_m)
+        self._segment_lengths = lengths
+        if ground is not None:
+            mirror = np.array([1.0, 1.0, -1.0])
+            # The image carries the opposite charge and the mirrored current reversed,
+            # which is the mirrored geometry's own matrix with the sign flipped.
+            self._image_direction_terms = half_lengths[:, None] * (half_units @ (half_units * mirror).T)
+            self._image_vector_kernel = _segment_integrals(half_centres, half_starts * mirror, half_units * mirror,
+                                                           half_lengths, radius_m)
+            self._image_scalar_kernel = _segment_integrals(middles, starts * mirror, units * mirror, lengths, radius_m)
+
+        self.matrix_cache = toolkit.LookupCache(self._compute_matrix, maxsize=256)  # Impedance matrices by frequency
+
+    def _partial_matrices(self, direction_terms, vector_kernel, scalar_kernel, omegas, wavenumbers):
+        """The impedance matrices of one set of source segments (the wire itself or its image)."""
+        vector = direction_terms * _complete_integrals(vector_kernel, wavenumbers) / (4 * math.pi)
+        scalar = _complete_integrals(scalar_kernel, wavenumbers) / (4 * math.pi * self._segment_lengths)
+        half_to_basis, segment_to_basis = self._half_to_basis, self._segment_to_basis
+        omegas = omegas[:, None, None]
+        return (1j * omegas * MU_0 * (half_to_basis.T @ vector @ half_to_basis)
+                + (segment_to_basis.T @ scalar @ segment_to_basis) / (1j * omegas * EPSILON_0))
+
+    def _ground_factors(self, omegas):
+        """How strongly the image counts: 1 for perfect ground, less for real ground."""
+        if self.ground == 'perfect':
+            return np.ones(len(omegas))
+        permittivity, conductivity = self.ground
+        index = np.sqrt(permittivity - 1j * conductivity / (omegas * EPSILON_0))
+        return (index - 1) / (index + 1)  # Minus the normal-incidence reflection coefficient
+
+    def impedance_matrices(self, frequencies_mhz):
+        """
+        Builds the impedance matrices for several frequencies at once (not cached).
+
+        Args:
+            frequencies_mhz (array_like): Frequencies in MHz, shape (F,).
+
+        Returns:
+            numpy.ndarray: Complex matrices, shape (F, nodes, nodes), one row and column
+                           per interior node.
+        """
+        omegas = 2 * math.pi * np.asarray(frequencies_mhz, dtype=float) * 1e6
+        wavenumbers = omegas / SPEED_OF_LIGHT
+        matrices = self._partial_matrices(self._direction_terms, self._vector_kernel, self._scalar_kernel,
+                                          omegas, wavenumbers)
+        if self.ground is not None:
+            matrices -= self._ground_factors(omegas)[:, None, None] * self._partial_matrices(
+                self._image_direction_terms, self._image_vector_kernel, self._image_scalar_kernel,
+                omegas, wavenumbers)
+        return matrices
+
+    def _compute_matrix(self, frequency_mhz):
+        """Builds the impedance matrix for one frequency (the matrix_cache's compute)."""
+        return self.impedance_matrices([frequency_mhz])[0]
+
+    def impedance_matrix(self, frequency_mhz):
+        """
+        Returns the impedance matrix at a frequency, from the cache when it was already built.
+
+        Args:
+            frequency_mhz (float): The frequency in MHz.
+
+        Returns:
+            numpy.ndarray: Complex matrix, one row and column per interior node.
+        """
+        return self.matrix_cache.lookup(float(frequency_mhz))
+
+    def currents(self, frequency_mhz, feed_volts=1.0):
+        """
+        Solves for the current at every interior node.
+
+        Args:
+            frequency_mhz (float): The frequency in MHz.
+            feed_volts (float): The voltage across the feed gap.
+
+        Returns:
+            numpy.ndarray: Complex currents in amps, one per interior node.
+        """
+        voltages = np.zeros(self.segment_count - 1, dtype=complex)
+        voltages[self.feed_node - 1] = feed_volts
+        return np.linalg.solve(self.impedance_matrix(frequency_mhz), voltages)
+
+    def impedance(self, frequency_mhz):
+        """
+        Returns the feedpoint impedance.
+
+        Args:
+            frequency_mhz (float): The frequency in MHz.
+
+        Returns:
+            complex: Resistance + j reactance in ohms.
+        """
+        return 1 / self.currents(frequency_mhz)[self.feed_node - 1]
+
+    def resonance(self, frequency_mhz=None, tolerance_mhz=1e-5):
+        """
+        Finds the resonance (where the feedpoint reactance crosses zero).
+
+        Args:
+            frequency_mhz (float): Where to start looking. Default None starts from
+                                   the 468 / f rule for the wire's length.
+            tolerance_mhz (float): How closely to pin the resonance down.
+
+        Returns:
+            float: The resonant frequency in MHz, or None if it could not be found.
+        """
+        if frequency_mhz is None:
+            frequency_mhz = 468 / (self.length_m * FEET_PER_METRE)
+        # Secant steps on the reactance; it rises steadily through a half-wave resonance
+        f0, f1 = frequency_mhz, frequency_mhz * 1.01
+        x0, x1 = self.impedance(f0).imag, self.impedance(f1).imag
+        for _ in range(30):
+            if x1 == x0:
+                return None
+            f0, f1 = f1, f1 - x1 * (f1 - f0) / (x1 - x0)
+            if f1 <= 0:
+                return None
+            if abs(f1 - f0) < tolerance_mhz:
+                return f1
+            x0, x1 = x1, self.impedance(f1).imag
+        return None
+
+    def _feed_impedances(self, frequencies_mhz):
+        """Feedpoint impedances for one block of frequencies (one batched LU solve)."""
+        matrices = self.impedance_matrices(frequencies_mhz)
+        voltages = np.zeros((len(matrices), self.segment_count - 1, 1), dtype=complex)
+        voltages[:, self.feed_node - 1] = 1.0
+        return 1 / np.linalg.solve(matrices, voltages)[:, self.feed_node - 1, 0]
+
+    def sweep(self, frequencies_mhz, reference_ohms=50.0, workers=None, block_size=SWEEP_BLOCK):
+        """
+        Feedpoint impedance and SWR over a frequency grid.
+
+        The geometry work is shared by every frequency. Frequencies are solved a
+        block at a time (all the block's matrices built and LU-solved together),
+        and blocks run on a thread pool: NumPy does the heavy lifting outside the
+        GIL, and threads share the precomputed geometry without copying it.
+
+        Args:
+            frequencies_mhz (array_like): Frequencies in MHz.
+            reference_ohms (float): Feedline impedance the SWR is worked out against.
+            workers (int): Threads to use (default: every available core; 1 runs in this thread).
+            block_size (int): Frequencies per block.
+
+        Returns:
+            dict: Arrays with one value per frequency: 'frequency_mhz', 'impedance'
+                  (complex ohms) and 'swr'.
+        """
+        frequencies_mhz = np.asarray(frequencies_mhz, dtype=float).ravel()
+        blocks = [frequencies_mhz[start:start + block_size]
+                  for start in range(0, len(frequencies_mhz), block_size)]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(blocks) <= 1:
+            results = [self._feed_impedances(block) for block in blocks]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._feed_impedances, blocks))
+        impedance = np.concatenate(results) if results else np.zeros(0, dtype=complex)
+        return {'frequency_mhz': frequencies_mhz, 'impedance': impedance,
+                'swr': swr_from_impedance(impedance, reference_ohms)}
+
+
+def swr_from_impedance(impedance, reference_ohms=50.0):
+    """
+    SWR for feedpoint impedances on a feedline.
+
+    Args:
+        impedance (array_like): Complex impedances in ohms.
+        reference_ohms (float): The feedline's impedance.
+
+    Returns:
+        numpy.ndarray: The SWR (inf where all the power is reflected).
+    """
+    impedance = np.asarray(impedance)
+    reflection = np.abs((impedance - reference_ohms) / (impedance + reference_ohms))
+    with np.errstate(divide='ignore'):
+        return (1 + reflection) / (1 - reflection)
+
+
+def _ground_height(height_feet, ground):
+    """Checks that an antenna over ground has a height; returns the height in metres."""
+    if height_feet is None:
+        if ground is not None:
+            raise ValueError("an antenna over ground needs a height")
+        return 0.0
+    if height_feet <= 0:
+        raise ValueError("the height must be above 0")
+    return height_feet / FEET_PER_METRE
+
+
+def dipole(length_feet, height_feet=None, wire_diameter_mm=DEFAULT_WIRE_DIAMETER_MM,
+           segments=DEFAULT_SEGMENTS, ground=None):
+    """
+    Builds a flat, center-fed dipole.
+
+    Args:
+        length_feet (float): Total length, end to end, in feet.
+        height_feet (float): Height above ground in feet (needed with a ground).
+        wire_diameter_mm (float): Wire diameter in mm (default #14 AWG).
+        segments (int): Number of segments (rounded up to an even number so the feed is a node).
+        ground: None (free space), 'perfect', a name from GROUNDS or (permittivity, conductivity).
+
+    Returns:
+        WireAntenna: The antenna.
+    """
+    height_m = _ground_height(height_feet, ground)
+    half = segments // 2 + segments % 2
+    length_m = length_feet / FEET_PER_METRE
+    nodes = np.zeros((2 * half + 1, 3))
+    nodes[:, 0] = np.linspace(-length_m / 2, length_m / 2, 2 * half + 1)
+    nodes[:, 2] = height_m
+    return WireAntenna(nodes, wire_diameter_mm / 2000, half, ground)
+
+
+def inverted_v(length_feet, apex_height_feet=None, apex_angle_deg=120, wire_diameter_mm=DEFAULT_WIRE_DIAMETER_MM,
+               segments=DEFAULT_SEGMENTS, ground=None):
+    """
+    Builds an inverted-V fed at its apex.
+
+    Args:
+        length_feet (float): Total wire length (both legs) in feet.
+        apex_height_feet (float): Height of the apex above ground in feet (needed with a ground).
+        apex_angle_deg (float): Angle between the legs in degrees (180 is a flat dipole).
+        wire_diameter_mm (float): Wire diameter in mm (default #14 AWG).
+        segments (int): Number of segments (rounded up to an even number so the feed is a node).
+        ground: None (free space), 'perfect', a name from GROUNDS or (permittivity, conductivity).
+
+    Returns:
+        WireAntenna: The antenna.
+
+    Raises:
+        ValueError: If the legs would reach the ground.
+    """
+    height_m = _ground_height(apex_height_feet, ground)
+    half = segments // 2 + segments % 2
+    leg_m = length_feet / FEET_PER_METRE / 2
+    spread = math.radians(apex_angle_deg / 2)
+    drop_m = leg_m * math.cos(spread)
+    if ground is not None and drop_m >= height_m:
+        raise ValueError("the legs reach the ground; raise the apex or widen the angle")
+    along = np.linspace(-leg_m, leg_m, 2 * half + 1)
+    nodes = np.zeros((2 * half + 1, 3))
+    nodes[:, 0] = along * math.sin(spread)
+    nodes[:, 2] = height_m - np.abs(along) * math.cos(spread)
+    return WireAntenna(nodes, wire_diameter_mm / 2000, half, ground)
+
+
+def build_antenna(shape, length_feet, height_feet=None, **options):
+    """
+    Builds a 'dipole' or an 'inverted-v' by name.
+
+    Args:
+        shape (str): 'dipole' or 'inverted-v'.
+        length_feet (float): Total wire length in feet.
+        height_feet (float): Height (of the apex, for an inverted-V) in feet.
+        **options: Passed on to dipole or inverted_v.
+
+    Returns:
+        WireAntenna: The antenna.
+
+    Raises:
+        ValueError: If the shape is unknown.
+    """
+    if shape == 'dipole':
+        return dipole(length_feet, height_feet, **options)
+    if shape == 'inverted-v':
+        return inverted_v(length_feet, height_feet, **options)
+    raise ValueError(f"Unknown antenna shape: {shape}")
+
+
+def resonant_length(target_mhz, shape='dipole', height_feet=None, iterations=4, tolerance_mhz=1e-4, **options):
+    """
+    Finds the wire length that resonates at a target frequency.
+
+    Starts from the 468 / f length and rescales it by the modelled resonance
+    (resonance goes nearly as 1 / length), which settles in two or three solves.
+
+    Args:
+        target_mhz (float): The desired resonant frequency in MHz.
+        shape (str): 'dipole' or 'inverted-v'.
+        height_feet (float): Height (of the apex, for an inverted-V) in feet.
+        iterations (int): Most rescaling steps to take.
+        tolerance_mhz (float): Stop when the resonance is this close to the target.
+        **options: Passed on to dipole or inverted_v (wire_diameter_mm, ground, ...).
+
+    Returns:
+        float: The length in feet, or None if a resonance could not be found.
+    """
+    length_feet = toolkit.calculate_dipole_length(target_mhz)
+    for _ in range(iterations):
+        resonance_mhz = build_antenna(shape, length_feet, height_feet, **options).resonance(target_mhz)
+        if resonance_mhz is None:
+            return None
+        length_feet *= resonance_mhz / target_mhz
+        if abs(resonance_mhz - target_mhz) < tolerance_mhz:
+            break
+    return length_feet
+
+
+def modelled_antenna_model(target_mhz, shape='dipole', height_feet=None, **options):
+    """
+    Turns a solved wire antenna into an AntennaModel for the length correction workflow.
+
+    The model's k-factor makes k / f give the solver's resonant length at the
+    target, so calculate_dipole_length and calculate_length_correction (and
+    their array forms) use the solver's answer around that frequency.
+
+    Args:
+        target_mhz (float): The frequency to solve at (e.g. the band center).
+        shape (str): 'dipole' or 'inverted-v'.
+        height_feet (float): Height (of the apex, for an inverted-V) in feet.
+        **options: Passed on to dipole or inverted_v.
+
+    Returns:
+        AntennaModel: The model, or None if a resonance could not be found.
+
+    Example:
+        model = modelled_antenna_model(7.15, 'inverted-v', 35, ground='average')
+        toolkit.register_antenna_model('my-40m-v', model)
+    """
+    length_feet = resonant_length(target_mhz, shape, height_feet, **options)
+    if length_feet is None:
+        return None
+    return toolkit.AntennaModel(k_factor=length_feet * target_mhz)
+
+
+def sweep_band(band, shape='dipole', length_feet=None, height_feet=None, points=101,
+               reference_ohms=50.0, workers=None, **options):
+    """
+    Sweeps a proposed antenna across a whole band from the band plan, before cutting any wire.
+
+    Args:
+        band (str): The amateur radio band (e.g., '40m').
+        shape (str): 'dipole' or 'inverted-v'.
+        length_feet (float): Total wire length in feet. Default None cuts it for the
+                             band's center with the 468 / f rule.
+        height_feet (float): Height (of the apex, for an inverted-V) in feet.
+        points (int): Number of frequencies, evenly spread from the band's lowest to highest edge.
+        reference_ohms (float): Feedline impedance for the SWR.
+        workers (int): Threads to use (default: every available core).
+        **options: Passed on to dipole or inverted_v (wire_diameter_mm, ground, segments, ...).
+
+    Returns:
+        dict: The sweep arrays ('frequency_mhz', 'impedance', 'swr') plus the 'band',
+              its 'center_mhz' and the 'length_feet' swept, or None if the band is not found.
+
+    Example:
+        result = sweep_band('40m', 'inverted-v', height_feet=35, ground='average')
+        result['frequency_mhz'][result['swr'].argmin()]
+    """
+    center_mhz = toolkit.get_band_resonance_center_frequency(band)
+    if center_mhz is None:
+        return None
+    segments = toolkit.get_band_segments(band)
+    low_mhz = min(segment['low_mhz'] for segment in segments)
+    high_mhz = max(segment['high_mhz'] for segment in segments)
+    if length_feet is None:
+        length_feet = toolkit.calculate_dipole_length(center_mhz)
+
+    antenna = build_antenna(shape, length_feet, height_feet, **options)
+    result = antenna.sweep(np.linspace(low_mhz, high_mhz, points), reference_ohms, workers)
+    result.update(band=band, center_mhz=center_mhz, length_feet=length_feet)
+    return result
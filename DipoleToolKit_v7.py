@@ -1,263 +1,2053 @@
-# ------------------------------------------------------------------------------
-# Title:
-#   Dipole Antenna Creation ToolKit  
-#
-# Authors:
-#   VA3PAF
-#   "AI Collaboration with Gemini"
-#
-# Date Created: 
-#   2025-04-28
-#
-# Version: 
-#    7.0
-#
-# Description: 
-#   A Two part Tool to provide Dipole Antenna lengths for various RAC Bands; 
-#   and a means to Adjust them.
-#
-# ------------------------------------------------------------------------------
-
-import os
-
-def clear_screen():
-    """Clears the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def greet_user():
-    """Prints a greeting to the user."""
-    print("Welcome to the Antenna Tool Kit Program!")
-
-# Data based on Radio Amateurs of Canada (RAC) information
-# Note: Always consult the official RAC website for the most accurate and up-to-date information.
-rac_band_plan = {
-    '160m': '1.800 - 2.000 MHz',
-    '80m': '3.500 - 4.000 MHz',
-    '60m': '5.330 - 5.400 MHz (various specific frequencies and ranges)',  # Simplified
-    '40m': '7.000 - 7.300 MHz',
-    '30m': '10.100 - 10.150 MHz',
-    '20m': '14.000 - 14.350 MHz',
-    '17m': '18.068 - 18.168 MHz',
-    '15m': '21.000 - 21.450 MHz',
-    '12m': '24.890 - 24.990 MHz',
-    '10m': '28.000 - 29.700 MHz',
-    '6m': '50.000 - 54.000 MHz',
-    '2m': '144.000 - 148.000 MHz',
-    '1.25m': '219.000 - 220.000 MHz / 222.000 - 225.000 MHz',  # Combined 1.25m
-    '70cm': '430.000 - 450.000 MHz',
-    '33cm': '902.000 - 928.000 MHz',
-    '23cm': '1240.000 - 1300.000 MHz',
-    '13cm': '2300.000 - 2310.000 MHz / 2390.000 - 2450.0 MHz',  # combined
-    '9cm': '3.300 - 3.500 GHz',
-    '6cm': '5.650 - 5.925 GHz',
-    '3cm': '10.000 - 10.500 GHz',
-    '1.2cm': '24.000 - 24.250 GHz',
-    '6mm': '47.000 - 47.200 GHz',
-    '4mm': '75.5 - 81.0 GHz',  # Simplified
-    '2.5mm': '122.250 - 123.000 GHz',
-    '2mm': '134 - 141 GHz',  # Simplified
-    '1mm': '241 - 250 GHz'  # Simplified
-}
-
-
-def calculate_dipole_length(frequency_mhz):
-    """
-    Calculates the approximate length of a half-wave dipole antenna in feet.
-
-    Args:
-        frequency_mhz (float): The frequency in MHz.
-
-    Returns:
-        float: The length of the dipole antenna in feet.
-    """
-    if frequency_mhz <= 0:
-        return 0.0  # Handle invalid frequency
-    length_feet = 468 / frequency_mhz
-    return length_feet
-
-
-def calculate_length_correction(target_frequency_mhz, measured_frequency_mhz):
-    """
-    Calculates the required change in dipole length to correct the resonant frequency.
-
-    Args:
-        target_frequency_mhz (float): The desired resonant frequency in MHz.
-        measured_frequency_mhz (float): The actual measured resonant frequency in MHz.
-
-    Returns:
-        float: The change in length in feet (positive value means lengthen, negative means shorten).
-    """
-    if target_frequency_mhz <= 0 or measured_frequency_mhz <= 0:
-        return None  # Handle invalid input
-
-    target_length_feet = calculate_dipole_length(target_frequency_mhz)
-    measured_length_feet = calculate_dipole_length(measured_frequency_mhz)
-    length_difference_feet = measured_length_feet - target_length_feet
-    return length_difference_feet
-
-
-def convert_frequency_to_mhz(freq_str):
-    """
-    Converts a frequency string (e.g., "14.0 MHz", "5.650 GHz") to MHz.
-
-    Args:
-        freq_str (str): The frequency string.
-
-    Returns:
-        float: The frequency in MHz.
-    """
-    freq_value = float(freq_str.split()[0])
-    if "GHz" in freq_str:
-        return freq_value * 1000
-    return freq_value
-
-
-def get_band_frequency(band):
-    """
-    Gets the CENTER frequency of an amateur radio band from the RAC band plan in MHz.
-
-    Args:
-        band (str): The amateur radio band (e.g., '20m', '9cm').
-
-    Returns:
-        float: The CENTER frequency of the band in MHz, or None if the band is not found.
-    """
-    if band in rac_band_plan:
-        frequency_range = rac_band_plan[band]
-        lower_freq_str = frequency_range.split('-')[0].strip()
-        upper_freq_str = frequency_range.split('-')[1].strip()
-        try:
-            lower_freq_mhz = convert_frequency_to_mhz(lower_freq_str)
-            upper_freq_mhz = convert_frequency_to_mhz(upper_freq_str)
-            center_frequency = (lower_freq_mhz + upper_freq_mhz) / 2
-            return center_frequency
-        except (ValueError, IndexError):
-            return None
-    else:
-        return None
-
-
-def get_band_resonance_center_frequency(band):
-    """
-    Calculates the center resonance frequency of an amateur radio band in MHz.
-
-    Args:
-        band (str): The amateur radio band (e.g., '20m', '9cm').
-
-    Returns:
-        float: The center resonance frequency of the band in MHz, or None if the band is not found.
-    """
-    if band in rac_band_plan:
-        frequency_range = rac_band_plan[band]
-        try:
-            lower_freq_str = frequency_range.split('-')[0].strip()
-            upper_freq_str = frequency_range.split('-')[1].strip()
-            lower_freq_mhz = convert_frequency_to_mhz(lower_freq_str)
-            upper_freq_mhz = convert_frequency_to_mhz(upper_freq_str)
-            center_frequency = lower_freq_mhz + (upper_freq_mhz - lower_freq_mhz) / 2
-            return center_frequency
-        except (ValueError, IndexError):
-            return None
-    return None
-
-
-def display_bands(band_plan, items_per_line=12, indent="\t"):  # Added indent
-    """
-    Displays the band plan with a specified number of items per line.
-
-    Args:
-        band_plan (dict): The dictionary containing the band plan.
-        items_per_line (int): The number of bands to display per line.
-        indent (str): String to indent each line with (default tab).
-    """
-    bands = list(band_plan.keys())
-    for i in range(0, len(bands), items_per_line):
-        line = bands[i:i + items_per_line]
-        print(indent + ", ".join(line))
-
-
-def main():
-    """
-    Main function to run the Antenna Tool Kit Program.
-    """
-    clear_screen()
-    greet_user()
-
-    while True:
-        print("\n\n Antenna Tool Kit Program Options:\n")
-        print("\t A: Calculate antenna length from band")
-        print("\t B: Calculate length correction from measured offset")
-        print("\t C: Clear Screen and Start Again")
-        print("\t D: Exit")
-
-        choice = input("\t\t Enter your choice (A, B, C, or D): ").strip().upper()
-
-        clear_screen()  # Clear screen *after* choice
-
-        if choice == 'A':
-            # Option A: Calculate antenna length from band
-            print("\nCalculate Dipole Length for Any of These Available Bands: ")
-            # print("\nAvailable bands: ")
-            display_bands(rac_band_plan)
-            print()  # newline
-            print()  # 2nd Newline
-
-            band_choice = input("By Entering Your Desired Amateur Radio Band (e.g., 20m, 40m, 160m): ").strip()
-            frequency = get_band_frequency(band_choice)  # Now gets center frequency!
-            if frequency:
-                antenna_length = calculate_dipole_length(frequency)
-                print(f"\n      Here is the Approximate half-wave dipole antenna length for {band_choice}: {antenna_length:.2f} feet.\n")
-            else:
-                print(f"\nInvalid band choice. \n Wrong Number or Missing Unit Designator (eg: 20m)? \n \t Please Reference provided band list or the RAC website.\n")
-
-        elif choice == 'B':
-            # Option B: Calculate length correction from measured offset
-            print("\nCalculate Length Correction for Your Chosen Bands, Based on Your Measured Center Resonance : ")
-            display_bands(rac_band_plan)
-            print()  # newline
-            print()  # 2nd Newline
-
-            band_choice = input("Enter the amateur radio band (e.g., 20m, 40m, 160m): ").strip()
-            target_frequency = get_band_resonance_center_frequency(band_choice)
-
-            if target_frequency is None:
-                print(f"\nInvalid band choice.\n Wrong Number or Missing Unit Designator (eg: 20m)? \n \t Please Reference provided band list or the RAC website.\n")
-                continue  # Restart the main loop
-
-            print(f"\nExpected Band Resonance is {target_frequency:.3f} MHz")
-
-            try:
-                measured_frequency = float(input(f"------ Enter the measured resonance center frequency for {band_choice} (in MHz): "))
-
-            except ValueError:
-                print("\nInvalid input. Please enter a numeric value for the frequency.\n")
-                continue  # Restart the main loop
-
-            length_correction_feet = calculate_length_correction(target_frequency, measured_frequency)
-
-            if length_correction_feet is not None:
-                length_correction_inches = length_correction_feet * 12
-                print(f"\nTo correct the dipole's resonant frequency for the {band_choice} band:")
-                if length_correction_feet > 0:
-                    print(f"------ Lengthen the antenna by approximately {length_correction_inches:.2f} inches.")
-                elif length_correction_feet < 0:
-                    print(f"------ Shorten the antenna by approximately {abs(length_correction_inches):.2f} inches.")
-                else:
-                    print("  The antenna length is correct.")
-            else:
-                print("\n  Invalid input.  Cannot calculate correction.\n")
-
-        elif choice == 'C':
-            clear_screen()
-            greet_user()
-
-        elif choice == 'D':
-            print("\nExiting Antenna Tool Kit Program. 73!\n")
-            break
-
-        else:
-            print("\nInvalid choice. Please enter A, B, C, or D.\n")
-
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+# ------------------------------------------------------------------------------
+# Title:
+#   Dipole Antenna Creation ToolKit  
+#
+# Authors:
+#   VA3PAF
+#   "AI Collaboration with Gemini"
+#
+# Date Created: 
+#   2025-04-28
+#
+# Version: 
+#    7.0
+#
+# Description: 
+#   A Two part Tool to provide Dipole Antenna lengths for various RAC Bands; 
+#   and a means to Adjust them.
+#
+# ------------------------------------------------------------------------------
+
+import bisect
+import functools
+import math
+import os
+import sys
+
+class TerminalRenderer:
+    """
+    Draws the program's screens with ANSI escape sequences, in-process.
+
+    Clearing used to run the 'cls'/'clear' programs through a shell on every
+    menu pass. The renderer writes the escape sequence itself, in the same
+    write as the text that follows it, and skips clearing altogether when the
+    output is not a terminal (a pipe, a file or a dumb serial console).
+    """
+
+    CLEAR = "\033[H\033[2J\033[3J"  # Cursor home, clear screen, clear scrollback
+
+    def __init__(self, stream=None):
+        """
+        Args:
+            stream (file): Where to draw. Default None follows sys.stdout.
+        """
+        self.stream = stream
+        self._ansi_ready = None
+
+    def _output(self):
+        """Returns the output stream and whether it can be cleared."""
+        stream = self.stream if self.stream is not None else sys.stdout
+        isatty = getattr(stream, 'isatty', None)
+        if not (isatty and isatty()):
+            return stream, False
+        if self._ansi_ready is None:
+            self._ansi_ready = os.name != 'nt' or _enable_windows_ansi()
+        return stream, self._ansi_ready
+
+    def draw(self, text, clear=False):
+        """
+        Writes text in a single write, optionally clearing the screen first.
+
+        Args:
+            text (str): The text to write, newlines included.
+            clear (bool): Clear the screen before the text.
+        """
+        stream, can_clear = self._output()
+        if clear and can_clear:
+            text = self.CLEAR + text
+        stream.write(text)
+        stream.flush()
+
+    def show(self, *lines):
+        """
+        Writes lines the way print() would, but as one write.
+
+        Args:
+            *lines (str): The lines to write; none writes a blank line.
+        """
+        self.draw("\n".join(lines) + "\n")
+
+    def clear(self):
+        """Clears the screen (only when drawing to a terminal)."""
+        self.draw("", clear=True)
+
+    def frame(self, clear=False):
+        """
+        Starts composing a screen in memory (see ScreenFrame).
+
+        Args:
+            clear (bool): Clear the screen when the frame is flushed.
+
+        Returns:
+            ScreenFrame: The empty frame.
+        """
+        return ScreenFrame(self, clear)
+
+
+class ScreenFrame:
+    """
+    A screen built up in memory (menu, band grid, results) and written in one go.
+
+    Slow links (serial consoles, SSH) pay for every separate write, so a frame
+    collects a whole screen and flushes it as a single write. Used as a context
+    manager it flushes on exit.
+    """
+
+    def __init__(self, renderer, clear=False):
+        """
+        Args:
+            renderer (TerminalRenderer): Where the frame is drawn.
+            clear (bool): Clear the screen when the frame is flushed.
+        """
+        self.renderer = renderer
+        self.clear = clear
+        self.parts = []
+
+    def show(self, *lines):
+        """Adds lines the way print() would; none adds a blank line."""
+        self.parts.append("\n".join(lines) + "\n")
+
+    def add(self, text):
+        """Adds text as is (e.g. the band grid from display_bands(..., as_string=True))."""
+        self.parts.append(text)
+
+    def text(self):
+        """Returns the frame's text so far."""
+        return "".join(self.parts)
+
+    def flush(self):
+        """Draws the frame in one write and empties it."""
+        self.renderer.draw(self.text(), clear=self.clear)
+        self.parts = []
+        self.clear = False
+
+    def ask(self, prompt):
+        """
+        Flushes the frame with a prompt at the end and reads the reply.
+
+        Args:
+            prompt (str): The question to end the frame with.
+
+        Returns:
+            str: The line typed by the user.
+        """
+        self.add(prompt)
+        self.flush()
+        return input()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+
+def _enable_windows_ansi():
+    """Turns on escape sequence handling in a Windows console; False if that fails."""
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+    except (AttributeError, OSError):
+        return False
+
+
+screen = TerminalRenderer()
+
+
+def clear_screen():
+    """Clears the terminal screen."""
+    screen.clear()
+
+def greet_user(frame=None):
+    """
+    Prints a greeting to the user.
+
+    Args:
+        frame (ScreenFrame): Frame to add the greeting to. Default None draws it straight away.
+    """
+    (frame or screen).show("Welcome to the Antenna Tool Kit Program!")
+
+class BandPlan(dict):
+    """
+    A band plan dict (band name -> range string) that counts its own changes.
+
+    The compiled band table, its index and the lookup cache are rebuilt from
+    the band plan whenever its version moves on, so editing it at runtime is safe.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, band, frequency_range):
+        super().__setitem__(band, frequency_range)
+        self._changed()
+
+    def __delitem__(self, band):
+        super().__delitem__(band)
+        self._changed()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, band, frequency_range=None):
+        value = super().setdefault(band, frequency_range)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+
+# Data based on Radio Amateurs of Canada (RAC) information
+# Note: Always consult the official RAC website for the most accurate and up-to-date information.
+rac_band_plan = BandPlan({
+    '160m': '1.800 - 2.000 MHz',
+    '80m': '3.500 - 4.000 MHz',
+    '60m': '5.330 - 5.400 MHz (various specific frequencies and ranges)',  # Simplified
+    '40m': '7.000 - 7.300 MHz',
+    '30m': '10.100 - 10.150 MHz',
+    '20m': '14.000 - 14.350 MHz',
+    '17m': '18.068 - 18.168 MHz',
+    '15m': '21.000 - 21.450 MHz',
+    '12m': '24.890 - 24.990 MHz',
+    '10m': '28.000 - 29.700 MHz',
+    '6m': '50.000 - 54.000 MHz',
+    '2m': '144.000 - 148.000 MHz',
+    '1.25m': '219.000 - 220.000 MHz / 222.000 - 225.000 MHz',  # Combined 1.25m
+    '70cm': '430.000 - 450.000 MHz',
+    '33cm': '902.000 - 928.000 MHz',
+    '23cm': '1240.000 - 1300.000 MHz',
+    '13cm': '2300.000 - 2310.000 MHz / 2390.000 - 2450.0 MHz',  # combined
+    '9cm': '3.300 - 3.500 GHz',
+    '6cm': '5.650 - 5.925 GHz',
+    '3cm': '10.000 - 10.500 GHz',
+    '1.2cm': '24.000 - 24.250 GHz',
+    '6mm': '47.000 - 47.200 GHz',
+    '4mm': '75.5 - 81.0 GHz',  # Simplified
+    '2.5mm': '122.250 - 123.000 GHz',
+    '2mm': '134 - 141 GHz',  # Simplified
+    '1mm': '241 - 250 GHz'  # Simplified
+})
+
+
+class AntennaModel:
+    """
+    A parameterized half-wave antenna length model: length = k / f, adjusted.
+
+    All the adjustments that do not depend on frequency are folded into one
+    precomputed scale when the model is made, so using a model costs a single
+    division per frequency (plus a logarithm when a wire diameter is given).
+
+    Args:
+        k_factor (float): Feet x MHz for a half-wave (468 is the classic rule).
+        velocity_factor (float): Shortening from wire insulation (e.g. 0.97); 1.0 for bare wire.
+        apex_angle_deg (float): Angle between the legs of an inverted-V; None (or 180) for flat.
+        wire_diameter_mm (float): Conductor diameter. The 468 rule suits ordinary #14 AWG
+                                  (1.63 mm); thicker conductors resonate shorter, thinner
+                                  ones longer. Default None applies no correction.
+
+    Example:
+        register_antenna_model('efhw-insulated', AntennaModel(k_factor=474, velocity_factor=0.97))
+    """
+
+    REFERENCE_WIRE_MM = 1.63  # #14 AWG, the wire the 468 rule is usually quoted for
+    APEX_SHORTENING = 0.07  # Inverted-V rule of thumb: ~5% shorter at 90 degrees, ~3.5% at 120
+    THICKNESS_COEFFICIENT = 0.2257  # Resonant length ~ half-wave x (1 - 0.2257 / ln(wavelength / diameter))
+    WAVELENGTH_M_MHZ = 299.792458  # Free-space wavelength in metres x MHz
+
+    def __init__(self, k_factor=468, velocity_factor=1.0, apex_angle_deg=None, wire_diameter_mm=None):
+        self.k_factor = k_factor
+        self.velocity_factor = velocity_factor
+        self.apex_angle_deg = apex_angle_deg
+        self.wire_diameter_mm = wire_diameter_mm
+
+        apex_factor = 1.0
+        if apex_angle_deg is not None:
+            apex_factor = 1 - self.APEX_SHORTENING * math.cos(math.radians(apex_angle_deg / 2))
+        self.scale = k_factor * velocity_factor * apex_factor
+
+        # ln(wavelength / diameter) = log_term - ln(f), for this wire and the reference wire
+        self.log_term = None
+        if wire_diameter_mm is not None:
+            self.log_term = math.log(self.WAVELENGTH_M_MHZ / (wire_diameter_mm / 1000))
+            self.reference_log_term = math.log(self.WAVELENGTH_M_MHZ / (self.REFERENCE_WIRE_MM / 1000))
+
+    def __repr__(self):
+        return (f"AntennaModel(k_factor={self.k_factor}, velocity_factor={self.velocity_factor}, "
+                f"apex_angle_deg={self.apex_angle_deg}, wire_diameter_mm={self.wire_diameter_mm})")
+
+    def length(self, frequency_mhz):
+        """
+        Length in feet for one frequency (0.0 for a frequency <= 0, like calculate_dipole_length).
+        """
+        if frequency_mhz <= 0:
+            return 0.0
+        length_feet = self.scale / frequency_mhz
+        if self.log_term is not None:
+            log_frequency = math.log(frequency_mhz)
+            length_feet *= ((1 - self.THICKNESS_COEFFICIENT / (self.log_term - log_frequency))
+                            / (1 - self.THICKNESS_COEFFICIENT / (self.reference_log_term - log_frequency)))
+        return length_feet
+
+    def lengths(self, frequencies_mhz):
+        """
+        Lengths in feet for a NumPy array of frequencies (0.0 where the frequency is <= 0).
+        """
+        import numpy as np  # Only needed for array work
+
+        valid = frequencies_mhz > 0
+        lengths_feet = np.zeros(frequencies_mhz.shape)
+        np.divide(self.scale, frequencies_mhz, out=lengths_feet, where=valid)
+        if self.log_term is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):  # Zeros stay zero
+                log_frequency = np.log(frequencies_mhz)
+                lengths_feet *= np.where(valid, (1 - self.THICKNESS_COEFFICIENT / (self.log_term - log_frequency))
+                                         / (1 - self.THICKNESS_COEFFICIENT / (self.reference_log_term - log_frequency)), 0.0)
+        return lengths_feet
+
+
+# Named antenna models; 'dipole' is the classic 468 / f rule used when no model is given
+antenna_models = {
+    'dipole': AntennaModel(),
+    'inverted-v': AntennaModel(apex_angle_deg=120),
+    'insulated-dipole': AntennaModel(velocity_factor=0.97),
+    'insulated-inverted-v': AntennaModel(velocity_factor=0.97, apex_angle_deg=120),
+}
+
+
+def register_antenna_model(name, model):
+    """
+    Adds (or replaces) a named antenna model.
+
+    Args:
+        name (str): The name to use it by (e.g. 'efhw').
+        model (AntennaModel): The model.
+    """
+    antenna_models[name] = model
+
+
+def get_antenna_model(model):
+    """
+    Resolves a model argument: a registered name or an AntennaModel.
+
+    Args:
+        model (str or AntennaModel): The model or its registered name.
+
+    Returns:
+        AntennaModel: The model.
+
+    Raises:
+        ValueError: If the name is not registered.
+    """
+    if isinstance(model, AntennaModel):
+        return model
+    try:
+        return antenna_models[model]
+    except KeyError:
+        raise ValueError(f"Unknown antenna model: {model}") from None
+
+
+def calculate_dipole_length(frequency_mhz, model=None):
+    """
+    Calculates the approximate length of a half-wave dipole antenna in feet.
+
+    Args:
+        frequency_mhz (float): The frequency in MHz.
+        model (str or AntennaModel): Antenna model or registered model name
+                                     (default None: the 468 / f rule).
+
+    Returns:
+        float: The length of the dipole antenna in feet.
+    """
+    if model is not None:
+        return get_antenna_model(model).length(frequency_mhz)
+    if frequency_mhz <= 0:
+        return 0.0  # Handle invalid frequency
+    length_feet = 468 / frequency_mhz
+    return length_feet
+
+
+def calculate_length_correction(target_frequency_mhz, measured_frequency_mhz, model=None):
+    """
+    Calculates the required change in dipole length to correct the resonant frequency.
+
+    Args:
+        target_frequency_mhz (float): The desired resonant frequency in MHz.
+        measured_frequency_mhz (float): The actual measured resonant frequency in MHz.
+        model (str or AntennaModel): Antenna model or registered model name
+                                     (default None: the 468 / f rule).
+
+    Returns:
+        float: The change in length in feet (positive value means lengthen, negative means shorten).
+    """
+    if target_frequency_mhz <= 0 or measured_frequency_mhz <= 0:
+        return None  # Handle invalid input
+
+    target_length_feet = calculate_dipole_length(target_frequency_mhz, model)
+    measured_length_feet = calculate_dipole_length(measured_frequency_mhz, model)
+    length_difference_feet = measured_length_feet - target_length_feet
+    return length_difference_feet
+
+
+def calculate_dipole_lengths(frequencies_mhz, model=None):
+    """
+    Array form of calculate_dipole_length for whole frequency grids.
+
+    Args:
+        frequencies_mhz (array_like): Frequencies in MHz (NumPy array, list or any buffer).
+        model (str or AntennaModel): Antenna model or registered model name
+                                     (default None: the 468 / f rule).
+
+    Returns:
+        numpy.ndarray: Dipole lengths in feet, 0.0 where the frequency is <= 0.
+    """
+    import numpy as np  # Only needed for array work
+
+    frequencies_mhz = np.asarray(frequencies_mhz, dtype=float)
+    if model is not None:
+        return get_antenna_model(model).lengths(frequencies_mhz)
+    lengths_feet = np.zeros(frequencies_mhz.shape)
+    np.divide(468, frequencies_mhz, out=lengths_feet, where=frequencies_mhz > 0)
+    return lengths_feet
+
+
+def calculate_length_corrections(target_frequencies_mhz, measured_frequencies_mhz, model=None):
+    """
+    Array form of calculate_length_correction; the inputs broadcast against each other.
+
+    Args:
+        target_frequencies_mhz (array_like): Desired resonant frequencies in MHz.
+        measured_frequencies_mhz (array_like): Measured resonant frequencies in MHz.
+        model (str or AntennaModel): Antenna model or registered model name
+                                     (default None: the 468 / f rule).
+
+    Returns:
+        numpy.ndarray: Changes in length in feet (positive means lengthen), NaN where
+                       either frequency is <= 0 (the scalar form returns None there).
+    """
+    import numpy as np  # Only needed for array work
+
+    target_frequencies_mhz = np.asarray(target_frequencies_mhz, dtype=float)
+    measured_frequencies_mhz = np.asarray(measured_frequencies_mhz, dtype=float)
+    valid = (target_frequencies_mhz > 0) & (measured_frequencies_mhz > 0)
+    if model is not None:
+        model = get_antenna_model(model)
+        length_difference_feet = model.lengths(measured_frequencies_mhz) - model.lengths(target_frequencies_mhz)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):  # Masked out below
+            length_difference_feet = 468 / measured_frequencies_mhz - 468 / target_frequencies_mhz
+    return np.where(valid, length_difference_feet, np.nan)
+
+
+def convert_frequency_to_mhz(freq_str):
+    """
+    Converts a frequency string (e.g., "14.0 MHz", "5.650 GHz") to MHz.
+
+    Args:
+        freq_str (str): The frequency string.
+
+    Returns:
+        float: The frequency in MHz.
+    """
+    freq_value = float(freq_str.split()[0])
+    if "GHz" in freq_str:
+        return freq_value * 1000
+    return freq_value
+
+
+def parse_band_range(frequency_range):
+    """
+    Parses a band plan range string into numeric segments in MHz.
+
+    A range may hold several segments separated by '/' (e.g. the 1.25m band),
+    and the unit written after the upper edge applies to both edges of that
+    segment (e.g. "3.300 - 3.500 GHz"). Trailing notes in brackets are ignored.
+
+    Args:
+        frequency_range (str): The range string (e.g., "7.000 - 7.300 MHz").
+
+    Returns:
+        list: (low_mhz, high_mhz) tuples, one per segment.
+
+    Raises:
+        ValueError: If a segment cannot be read as two numbers.
+    """
+    segments = []
+    for segment_str in frequency_range.split('/'):
+        lower_freq_str, upper_freq_str = segment_str.split('-')
+        upper_freq_mhz = convert_frequency_to_mhz(upper_freq_str.strip())
+        lower_freq_mhz = float(lower_freq_str.split()[0])
+        if "GHz" in upper_freq_str:
+            lower_freq_mhz = lower_freq_mhz * 1000
+        segments.append((lower_freq_mhz, upper_freq_mhz))
+    return segments
+
+
+def compile_band_plan(band_plan):
+    """
+    Builds the numeric band table for a band plan.
+
+    The band plan strings stay the display source; the table holds the parsed
+    segments, their centers and dipole lengths so lookups never have to parse
+    strings. A band split into several segments (e.g. '1.25m', '13cm') is
+    centered on its first segment, as listed in the band plan; the others are
+    reached with the segment argument of the lookups.
+
+    Args:
+        band_plan (dict): The dictionary containing the band plan.
+
+    Returns:
+        dict: Band name -> {'segments': [(low_mhz, high_mhz), ...],
+              'centers': [segment center MHz, ...],
+              'dipole_lengths': [segment dipole length in feet, ...],
+              'main_segment': index of the default segment (0),
+              'center': band center MHz}.
+              Bands whose range cannot be parsed are left out.
+    """
+    band_table = {}
+    for band, frequency_range in band_plan.items():
+        try:
+            segments = parse_band_range(frequency_range)
+        except (ValueError, IndexError):
+            continue
+        centers = [low + (high - low) / 2 for low, high in segments]
+        main_segment = 0  # First segment listed, the center these bands always had
+        band_table[band] = {
+            'segments': segments,
+            'centers': centers,
+            'dipole_lengths': [calculate_dipole_length(center) for center in centers],
+            'main_segment': main_segment,
+            'center': centers[main_segment],
+        }
+    return band_table
+
+
+class LookupCache:
+    """
+    A least-recently-used cache around one compute function, with hit, miss,
+    eviction and invalidation counters.
+
+    cache.lookup(*key) returns compute(*key), from the cache when it can. The
+    cache is functools.lru_cache, so a hit costs about as much as a dict get.
+
+    Args:
+        compute (callable): Makes the value for a key (its arguments) that is not cached.
+        maxsize (int): How many entries to keep before evicting the least recently used.
+    """
+
+    def __init__(self, compute, maxsize=128):
+        self.compute = compute
+        self.maxsize = maxsize
+        self.lookup = functools.lru_cache(maxsize)(compute)
+        self.invalidations = 0
+        self._hits = 0  # Counts from before the last invalidate or resize
+        self._misses = 0
+        self._dropped = 0  # Entries emptied out by invalidate (the other misses were evicted)
+
+    def _retire(self):
+        """Adds the lru_cache's counters to the totals before it is cleared or replaced."""
+        info = self.lookup.cache_info()
+        self._hits += info.hits
+        self._misses += info.misses
+        return info.currsize
+
+    def resize(self, maxsize):
+        """
+        Changes the maximum size; the entries held are evicted.
+
+        Args:
+            maxsize (int): The new maximum number of entries.
+        """
+        self._retire()
+        self.maxsize = maxsize
+        self.lookup = functools.lru_cache(maxsize)(self.compute)
+
+    def invalidate(self):
+        """Drops every entry (e.g. after the band plan changed)."""
+        self._dropped += self._retire()
+        self.lookup.cache_clear()
+        self.invalidations += 1
+
+    def info(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: 'hits', 'misses', 'evictions', 'invalidations', 'size' and 'maxsize'.
+        """
+        info = self.lookup.cache_info()
+        misses = self._misses + info.misses
+        return {
+            'hits': self._hits + info.hits,
+            'misses': misses,
+            'evictions': misses - info.currsize - self._dropped,
+            'invalidations': self.invalidations,
+            'size': info.currsize,
+            'maxsize': self.maxsize,
+        }
+
+
+rac_band_table = compile_band_plan(rac_band_plan)
+
+
+
+def _check_band_plan():
+    """refresh_band_plan() for the hot lookup paths: the version is checked inline first."""
+    band_plan = rac_band_plan
+    if band_plan is not _compiled_from[0] or getattr(band_plan, 'version', 0) != _compiled_from[1]:
+        refresh_band_plan()
+
+
+def _band_entry(band, plan):
+    """The compiled band table entry for a band, or None if it is not found (or not a band name)."""
+    if not isinstance(band, str):
+        return None
+    if plan is None:
+        _check_band_plan()
+        return rac_band_table.get(band)
+    return _compiled_band_plan(plan)[0].get(band)
+
+
+def _band_lookup(band_table, band, segment):
+    """(center MHz, dipole length feet) for a band in a compiled table, or None."""
+    band_entry = band_table.get(band)
+    if band_entry is None:
+        return None
+    if segment is None:
+        segment = band_entry['main_segment']
+    elif not 0 <= segment < len(band_entry['centers']):
+        return None
+    return band_entry['centers'][segment], band_entry['dipole_lengths'][segment]
+
+
+def _compute_band_lookup(band, segment, plan_key):
+    """Makes the cached entry for a band, segment and band plan key."""
+    return _band_lookup(_compiled_band_plan(plan_key)[0], band, segment)
+
+
+# Band lookups by (band, segment, band plan key): center frequency and dipole length
+band_lookup_cache = LookupCache(_compute_band_lookup, maxsize=128)
+
+
+def _lookup_band(band, segment, plan):
+    """Cached (center MHz, dipole length feet) for a band, or None if it is not found (or not a band name)."""
+    if not isinstance(band, str):
+        return None
+    if plan is None:
+        band_plan = rac_band_plan  # Version check inline: this is the hottest path
+        if band_plan is not _compiled_from[0] or getattr(band_plan, 'version', 0) != _compiled_from[1]:
+            refresh_band_plan()
+        plan_key = DEFAULT_BAND_PLAN
+    else:
+        band_table, _, plan_key = _compiled_band_plan(plan)
+        if plan_key is None:  # An unregistered band plan dict: nothing to key the cache on
+            return _band_lookup(band_table, band, segment)
+    return band_lookup_cache.lookup(band, segment, plan_key)
+
+
+def get_band_frequency(band, segment=None, plan=None):
+    """
+    Gets the CENTER frequency of an amateur radio band from the band plan in MHz.
+
+    Args:
+        band (str): The amateur radio band (e.g., '20m', '9cm').
+        segment (int): Segment of a split band (e.g. 0 for 219-220 MHz on '1.25m').
+                       Default None uses the band's first segment.
+        plan: Country code, IARU region or band plan (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        float: The CENTER frequency of the band in MHz, or None if the band is not found.
+    """
+    band_lookup = _lookup_band(band, segment, plan)
+    return None if band_lookup is None else band_lookup[0]
+
+
+def get_band_resonance_center_frequency(band, segment=None, plan=None):
+    """
+    Calculates the center resonance frequency of an amateur radio band in MHz.
+
+    Args:
+        band (str): The amateur radio band (e.g., '20m', '9cm').
+        segment (int): Segment of a split band. Default None uses the band's first segment.
+        plan: Country code, IARU region or band plan (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        float: The center resonance frequency of the band in MHz, or None if the band is not found.
+    """
+    return get_band_frequency(band, segment, plan)
+
+
+def get_band_dipole_length(band, segment=None, plan=None):
+    """
+    Gets the half-wave dipole length for the center of an amateur radio band in feet.
+
+    Args:
+        band (str): The amateur radio band (e.g., '20m', '9cm').
+        segment (int): Segment of a split band. Default None uses the band's first segment.
+        plan: Country code, IARU region or band plan (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        float: The dipole length in feet, or None if the band is not found.
+    """
+    band_lookup = _lookup_band(band, segment, plan)
+    return None if band_lookup is None else band_lookup[1]
+
+
+def get_band_segments(band, plan=None):
+    """
+    Lists the segments of an amateur radio band with their centers and dipole lengths.
+
+    Args:
+        band (str): The amateur radio band (e.g., '1.25m', '13cm').
+        plan: Country code, IARU region or band plan (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        list: One dict per segment with 'low_mhz', 'high_mhz', 'center_mhz' and
+              'length_feet', or None if the band is not found.
+    """
+    band_entry = _band_entry(band, plan)
+    if band_entry is None:
+        return None
+    return [
+        {'low_mhz': low, 'high_mhz': high, 'center_mhz': center, 'length_feet': length}
+        for (low, high), center, length in zip(
+            band_entry['segments'], band_entry['centers'], band_entry['dipole_lengths'])
+    ]
+
+
+def build_band_index(band_table):
+    """
+    Builds a sorted interval index for frequency -> band lookups.
+
+    Args:
+        band_table (dict): A compiled band table (see compile_band_plan).
+
+    Returns:
+        dict: Parallel lists sorted by segment start: 'starts', 'ends' (MHz),
+              'bands', 'segments' (segment number within its band) and 'codes'
+              (position of the band in 'band_names').
+    """
+    band_names = tuple(band_table)
+    intervals = []
+    for code, band in enumerate(band_names):
+        for segment, (low, high) in enumerate(band_table[band]['segments']):
+            intervals.append((low, high, band, segment, code))
+    intervals.sort()
+    return {
+        'starts': [interval[0] for interval in intervals],
+        'ends': [interval[1] for interval in intervals],
+        'bands': [interval[2] for interval in intervals],
+        'segments': [interval[3] for interval in intervals],
+        'codes': [interval[4] for interval in intervals],
+        'band_names': band_names,
+    }
+
+
+rac_band_index = build_band_index(rac_band_table)
+_compiled_from = (rac_band_plan, rac_band_plan.version)
+
+
+def refresh_band_plan():
+    """
+    Rebuilds the band table and index if rac_band_plan was edited or replaced.
+
+    Edits are seen through BandPlan.version; replacing rac_band_plan with a new
+    dict is seen by identity. The band lookup cache is emptied on a rebuild.
+    """
+    global rac_band_table, rac_band_index, _compiled_from
+    band_plan = rac_band_plan
+    version = getattr(band_plan, 'version', 0)
+    if band_plan is _compiled_from[0] and version == _compiled_from[1]:
+        return
+    rac_band_table = compile_band_plan(band_plan)
+    rac_band_index = build_band_index(rac_band_table)
+    _compiled_from = (band_plan, version)
+    band_lookup_cache.invalidate()
+
+
+# Band plans for other countries and the IARU regions, read from BandPlans/ on first use
+BAND_PLAN_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'BandPlans')
+DEFAULT_BAND_PLAN = 'CA'  # rac_band_plan
+band_plans = {}  # Registry key (ISO alpha-2 code or 'R1'-'R3') -> BandPlan, once loaded or registered
+_band_plan_files = None  # Registry key -> data file, listed on first use
+_country_regions = None  # ISO alpha-2 code -> 'R1', 'R2' or 'R3', read on first use
+_compiled_band_plans = {}  # Registry key -> (band plan, version, band table, band index)
+_resolved_plans = {}  # Plan argument -> registry key, remembered until the registry changes
+
+# Binary cache of the compiled band plans (see build_band_plan_cache), little-endian:
+#   header    magic, format, plan count, band count, segment count
+#   plans     key, CRC-32 of the plan's source data, first band, band count
+#   bands     name, first segment, segment count, main segment
+#   segments  low MHz, high MHz, center MHz, dipole length feet (float64 each)
+# Every record is a multiple of 8 bytes, so the segments can be read in place.
+BAND_PLAN_CACHE = 'bandplans.cache'  # In BAND_PLAN_DIRECTORY
+CACHE_MAGIC = b'DTKBANDS'
+CACHE_FORMAT = 2  # Bump when the layout or the dipole length rule changes
+_CACHE_HEADER = '<8sIIII'
+_CACHE_PLAN = '<4sIII'
+_CACHE_BAND = '<8sIHH'
+_CACHE_SEGMENT_VALUES = 4
+_band_plan_cache = None  # The mapped cache once opened; False if there is no usable one
+
+
+def read_band_plan(path):
+    """
+    Reads a band plan data file: one 'band: range' line per band, in the
+    rac_band_plan range format (e.g. "40m: 7.000 - 7.200 MHz"). '#' starts a comment.
+
+    Args:
+        path (str): The data file.
+
+    Returns:
+        BandPlan: The band plan, in file order.
+
+    Raises:
+        ValueError: If a line has no 'band: range' pair.
+    """
+    entries = {}
+    with open(path, encoding='utf-8') as plan_file:
+        for line_number, line in enumerate(plan_file, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            band, separator, frequency_range = line.partition(':')
+            if not separator or not band.strip() or not frequency_range.strip():
+                raise ValueError(f"{path}, line {line_number}: expected 'band: range'")
+            entries[band.strip()] = frequency_range.strip()
+    return BandPlan(entries)
+
+
+def _plan_files():
+    """Registry key -> data file for every band plan file in BAND_PLAN_DIRECTORY."""
+    global _band_plan_files
+    if _band_plan_files is None:
+        try:
+            names = os.listdir(BAND_PLAN_DIRECTORY)
+        except OSError:
+            names = []
+        _band_plan_files = {os.path.splitext(name)[0].upper(): os.path.join(BAND_PLAN_DIRECTORY, name)
+                            for name in names if name.endswith('.txt') and name != 'regions.txt'}
+    return _band_plan_files
+
+
+def _regions():
+    """ISO alpha-2 code -> IARU region key, from BandPlans/regions.txt."""
+    global _country_regions
+    if _country_regions is None:
+        _country_regions = {}
+        try:
+            with open(os.path.join(BAND_PLAN_DIRECTORY, 'regions.txt'), encoding='utf-8') as regions_file:
+                for line in regions_file:
+                    region, _, codes = line.split('#', 1)[0].partition(':')
+                    for code in codes.split():
+                        _country_regions[code.upper()] = region.strip().upper()
+        except OSError:
+            pass  # No region data: only countries with their own plan are known
+    return _country_regions
+
+
+def _country_code(name):
+    """ISO alpha-2 code for a country name (the only place pycountry is needed)."""
+    try:
+        import pycountry  # Only needed to look countries up by name
+    except ImportError:
+        raise ValueError(f"Looking up '{name}' by name needs pycountry (pip install pycountry);"
+                         " use its ISO code (e.g. 'US') instead") from None
+    try:
+        return pycountry.countries.lookup(name).alpha_2
+    except LookupError:
+        raise ValueError(f"Unknown country: {name}") from None
+
+
+def resolve_band_plan(plan):
+    """
+    Works out which registered band plan a plan argument means.
+
+    Args:
+        plan: An ISO alpha-2 country code (e.g. 'US'), an IARU region ('R1', 'IARU 1'
+              or just 1), or a country name (e.g. 'Germany', which needs pycountry).
+              None means the RAC band plan.
+
+    Returns:
+        str: The registry key: the country's own plan if it has one, else its region's.
+
+    Raises:
+        ValueError: If the country or region is unknown.
+    """
+    key = _resolved_plans.get(plan)
+    if key is None:
+        key = _resolved_plans[plan] = _resolve_band_plan(plan)
+    return key
+
+
+def _resolve_band_plan(plan):
+    """resolve_band_plan without the memo."""
+    if plan is None:
+        return DEFAULT_BAND_PLAN
+    key = str(plan).strip().upper()
+    region = key.replace('IARU', '').replace('REGION', '').replace(' ', '').lstrip('R')
+    if region in ('1', '2', '3'):
+        return 'R' + region
+    if key == DEFAULT_BAND_PLAN or key in band_plans or key in _plan_files():
+        return key
+    if len(key) != 2 or not key.isalpha():
+        key = _country_code(plan)
+        if key == DEFAULT_BAND_PLAN or key in band_plans or key in _plan_files():
+            return key
+    region = _regions().get(key)
+    if region is None:
+        raise ValueError(f"Unknown country or IARU region: {plan}")
+    return region
+
+
+def register_band_plan(plan, band_plan):
+    """
+    Adds or replaces a band plan in the registry.
+
+    Args:
+        plan (str): ISO alpha-2 code or IARU region key ('R1', 'R2', 'R3').
+        band_plan (dict or str): Band name -> range string, or the path of a data file
+                                 (see read_band_plan), read on first use.
+    """
+    key = str(plan).strip().upper()
+    _resolved_plans.clear()  # A country may now have a plan of its own
+    if isinstance(band_plan, str):
+        _plan_files()[key] = band_plan
+        band_plans.pop(key, None)
+    else:
+        band_plans[key] = band_plan if isinstance(band_plan, BandPlan) else BandPlan(band_plan)
+    if _compiled_band_plans.pop(key, None) is not None:
+        band_lookup_cache.invalidate()
+
+
+def get_band_plan(plan=None):
+    """
+    Gets a band plan from the registry, reading its data file on first use.
+
+    Args:
+        plan: Country code, IARU region or country name (see resolve_band_plan).
+              Default None: rac_band_plan.
+
+    Returns:
+        BandPlan: Band name -> range string.
+
+    Raises:
+        ValueError: If the country or region is unknown.
+    """
+    return _load_band_plan(resolve_band_plan(plan))
+
+
+def _load_band_plan(key):
+    """The band plan for a registry key, read from its data file if not yet loaded."""
+    if key == DEFAULT_BAND_PLAN:
+        return rac_band_plan
+    band_plan = band_plans.get(key)
+    if band_plan is None:
+        path = _plan_files().get(key)
+        if path is None:
+            raise ValueError(f"No band plan for {key}")
+        band_plan = band_plans[key] = read_band_plan(path)
+    return band_plan
+
+
+def list_band_plans():
+    """
+    Lists the band plans that can be used without a country name.
+
+    Returns:
+        list: Registry keys (ISO alpha-2 codes and 'R1'-'R3'), sorted.
+    """
+    return sorted({DEFAULT_BAND_PLAN} | set(band_plans) | set(_plan_files()))
+
+
+def _band_plan_source(band_plan):
+    """The source data of an in-memory band plan, as hashed for the cache."""
+    return ''.join(f"{band}: {frequency_range}\n" for band, frequency_range in band_plan.items()).encode('utf-8')
+
+
+def _plan_source(key):
+    """The source data a registry key's plan is compiled from, or None if it is not there."""
+    if key == DEFAULT_BAND_PLAN:
+        return _band_plan_source(rac_band_plan)
+    path = _plan_files().get(key)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as plan_file:
+            return plan_file.read()
+    except OSError:
+        return None
+
+
+def build_band_plan_cache(path=None):
+    """
+    Compiles the RAC plan and every band plan file into the binary cache.
+
+    Plans registered in memory are left out (they are compiled from the dict
+    anyway), as are plans with a key longer than 4 or a band name longer than
+    8 bytes (they are parsed as before).
+
+    Args:
+        path (str): Where to write it. Default None: BAND_PLAN_CACHE in BAND_PLAN_DIRECTORY.
+
+    Returns:
+        dict: 'path', 'plans' (registry keys written) and 'skipped' (keys left out).
+
+    Raises:
+        OSError: If the cache cannot be written.
+    """
+    import struct
+    import zlib
+
+    path = path or os.path.join(BAND_PLAN_DIRECTORY, BAND_PLAN_CACHE)
+    plan_record, band_record = struct.Struct(_CACHE_PLAN), struct.Struct(_CACHE_BAND)
+    plans, bands, values = [], [], []
+    written, skipped = [], []
+    for key in sorted({DEFAULT_BAND_PLAN} | set(_plan_files())):
+        source = _plan_source(key)
+        if source is None:
+            skipped.append(key)
+            continue
+        band_plan = rac_band_plan if key == DEFAULT_BAND_PLAN else read_band_plan(_plan_files()[key])
+        band_table = compile_band_plan(band_plan)
+        encoded_key = key.encode('ascii', 'replace')
+        names = [band.encode('utf-8') for band in band_table]
+        if len(encoded_key) > 4 or any(len(name) > 8 for name in names):
+            skipped.append(key)
+            continue
+        plans.append(plan_record.pack(encoded_key, zlib.crc32(source), len(bands), len(band_table)))
+        for name, band_entry in zip(names, band_table.values()):
+            segment_count = len(band_entry['segments'])
+            bands.append(band_record.pack(name, len(values) // _CACHE_SEGMENT_VALUES, segment_count,
+                                          band_entry['main_segment']))
+            for (low, high), center, length in zip(band_entry['segments'], band_entry['centers'],
+                                                   band_entry['dipole_lengths']):
+                values.extend((low, high, center, length))
+        written.append(key)
+
+    _close_band_plan_cache()  # The file may be replaced (Windows cannot while it is mapped)
+    header = struct.pack(_CACHE_HEADER, CACHE_MAGIC, CACHE_FORMAT, len(plans), len(bands),
+                         len(values) // _CACHE_SEGMENT_VALUES)
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as cache_file:
+        cache_file.write(header)
+        cache_file.write(b''.join(plans))
+        cache_file.write(b''.join(bands))
+        cache_file.write(struct.pack(f'<{len(values)}d', *values))
+    os.replace(temporary, path)  # Readers see the old cache or the new one, never half of one
+    return {'path': path, 'plans': written, 'skipped': skipped}
+
+
+def _map_band_plan_cache(path):
+    """Memory-maps a band plan cache and reads its plan records; None if it is missing or unusable."""
+    import mmap
+    import struct
+
+    if sys.byteorder != 'little':
+        return None  # The segments are read in place as native doubles
+    try:
+        with open(path, 'rb') as cache_file:
+            mapped = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # Missing, unreadable or empty
+        return None
+    header, plan_record, band_record = (struct.Struct(_CACHE_HEADER), struct.Struct(_CACHE_PLAN),
+                                        struct.Struct(_CACHE_BAND))
+    if len(mapped) < header.size:
+        mapped.close()
+        return None
+    magic, cache_format, plan_count, band_count, segment_count = header.unpack_from(mapped)
+    bands_at = header.size + plan_count * plan_record.size
+    segments_at = bands_at + band_count * band_record.size
+    end = segments_at + segment_count * _CACHE_SEGMENT_VALUES * 8
+    if magic != CACHE_MAGIC or cache_format != CACHE_FORMAT or len(mapped) != end:
+        mapped.close()
+        return None
+    view = memoryview(mapped)
+    plans = {key.rstrip(b'\0').decode('ascii'): (source_hash, first_band, plan_bands)
+             for key, source_hash, first_band, plan_bands in plan_record.iter_unpack(view[header.size:bands_at])}
+    return {'path': path, 'map': mapped, 'plans': plans, 'band_record': band_record,
+            'bands': view[bands_at:segments_at], 'values': view[segments_at:end].cast('d')}
+
+
+def _close_band_plan_cache():
+    """Unmaps the band plan cache; it is mapped again on next use."""
+    global _band_plan_cache
+    if _band_plan_cache:
+        _band_plan_cache['values'].release()
+        _band_plan_cache['bands'].release()
+        _band_plan_cache['map'].close()
+    _band_plan_cache = None
+
+
+def _open_band_plan_cache():
+    """The mapped band plan cache, mapped on first use; None if there is no usable one."""
+    global _band_plan_cache
+    if _band_plan_cache is None:
+        _band_plan_cache = _map_band_plan_cache(os.path.join(BAND_PLAN_DIRECTORY, BAND_PLAN_CACHE)) or False
+    return _band_plan_cache or None
+
+
+def _cached_band_table(key):
+    """A plan's compiled band table from the cache, or None if it is not cached or its source changed."""
+    import zlib
+
+    cache = _open_band_plan_cache()
+    entry = cache and cache['plans'].get(key)
+    if not entry:
+        return None
+    source = _plan_source(key)
+    if source is None or zlib.crc32(source) != entry[0]:
+        return None  # Stale: parse the source instead
+    _, first_band, band_count = entry
+    band_record = cache['band_record']
+    records = list(band_record.iter_unpack(
+        cache['bands'][first_band * band_record.size:(first_band + band_count) * band_record.size]))
+    if not records:
+        return {}
+    # All of the plan's segment values in one go, then sliced per band
+    first_value = records[0][1] * _CACHE_SEGMENT_VALUES
+    last_value = (records[-1][1] + records[-1][2]) * _CACHE_SEGMENT_VALUES
+    numbers = cache['values'][first_value:last_value].tolist()
+    band_table = {}
+    for name, first_segment, segment_count, main_segment in records:
+        start = first_segment * _CACHE_SEGMENT_VALUES - first_value
+        if segment_count == 1:  # Most bands: no slicing needed
+            low, high, center, length = numbers[start:start + _CACHE_SEGMENT_VALUES]
+            band_entry = {'segments': [(low, high)], 'centers': [center], 'dipole_lengths': [length],
+                          'main_segment': 0, 'center': center}
+        else:
+            stop = start + segment_count * _CACHE_SEGMENT_VALUES
+            centers = numbers[start + 2:stop:4]
+            band_entry = {'segments': list(zip(numbers[start:stop:4], numbers[start + 1:stop:4])),
+                          'centers': centers, 'dipole_lengths': numbers[start + 3:stop:4],
+                          'main_segment': main_segment, 'center': centers[main_segment]}
+        band_table[name.rstrip(b'\0').decode('utf-8')] = band_entry
+    return band_table
+
+
+def load_band_plan_cache(path=None):
+    """
+    Memory-maps the binary band plan cache and takes every plan in it that
+    still matches its source data (checked by CRC-32). Stale plans are parsed
+    from their source on first use, as without a cache.
+
+    Plans are also taken from the cache one at a time on first use, so this
+    is only needed to load them all up front (e.g. before serving requests).
+
+    Args:
+        path (str): The cache. Default None: BAND_PLAN_CACHE in BAND_PLAN_DIRECTORY.
+
+    Returns:
+        dict: 'loaded' and 'stale' registry keys; both empty if there is no usable cache.
+    """
+    global _band_plan_cache
+    if path is not None:
+        _close_band_plan_cache()
+        _band_plan_cache = _map_band_plan_cache(path) or False
+    cache = _open_band_plan_cache()
+    loaded, stale = [], []
+    for key in (cache['plans'] if cache else ()):
+        if key == DEFAULT_BAND_PLAN:
+            # Compiled at import already; the cache only says whether it still matches rac_band_plan
+            band_table = _cached_band_table(key)
+        elif key in band_plans or key in _compiled_band_plans:
+            continue  # Registered in memory, or already compiled
+        else:
+            band_table = _cached_band_table(key)
+            if band_table is not None:
+                _compiled_band_plans[key] = (None, 0, band_table, build_band_index(band_table))
+        (stale if band_table is None else loaded).append(key)
+    return {'loaded': loaded, 'stale': stale}
+
+
+def _compiled_band_plan(plan):
+    """
+    (band table, band index, registry key) for a plan argument, compiled on first use.
+
+    An unregistered band plan dict is compiled every time and has key None.
+    """
+    if plan is None:
+        refresh_band_plan()
+        return rac_band_table, rac_band_index, DEFAULT_BAND_PLAN
+    if isinstance(plan, dict):
+        key, band_plan, compiled = None, plan, None
+    else:
+        key = resolve_band_plan(plan)
+        if key == DEFAULT_BAND_PLAN:
+            return _compiled_band_plan(None)
+        compiled = _compiled_band_plans.get(key)
+        band_plan = band_plans.get(key)
+        if band_plan is None:  # Text not read yet: try the binary cache first
+            if compiled is not None:
+                return compiled[2], compiled[3], key
+            band_table = _cached_band_table(key)
+            if band_table is not None:
+                compiled = _compiled_band_plans[key] = (None, 0, band_table, build_band_index(band_table))
+                return compiled[2], compiled[3], key
+            band_plan = _load_band_plan(key)
+        elif compiled is not None and compiled[0] is None and band_plan.version == 0:
+            # Taken from the cache before the text was read; the same data
+            compiled = _compiled_band_plans[key] = (band_plan,) + compiled[1:]
+    version = getattr(band_plan, 'version', 0)
+    if compiled is None or compiled[0] is not band_plan or compiled[1] != version:
+        if compiled is not None:
+            band_lookup_cache.invalidate()  # Drops anything cached from the older version
+        band_table = compile_band_plan(band_plan)
+        compiled = (band_plan, version, band_table, build_band_index(band_table))
+        if key is not None:
+            _compiled_band_plans[key] = compiled
+    return compiled[2], compiled[3], key
+
+
+def get_band_table(plan=None):
+    """
+    Gets the compiled band table of a band plan (see compile_band_plan).
+
+    Args:
+        plan: Country code, IARU region or band plan (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        dict: Band name -> compiled band entry.
+    """
+    return _compiled_band_plan(plan)[0]
+
+
+def get_band_index(plan=None):
+    """
+    Gets the frequency -> band index of a band plan (see build_band_index).
+
+    Args:
+        plan: Country code, IARU region or band plan (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        dict: The sorted interval index.
+    """
+    return _compiled_band_plan(plan)[1]
+
+
+def band_for_frequency(frequency_mhz, plan=None):
+    """
+    Finds the band (and segment of that band) holding a frequency.
+
+    Args:
+        frequency_mhz (float): The frequency in MHz.
+        plan: Country code, IARU region or band plan (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        tuple: (band, segment number), or None if the frequency is outside every band.
+    """
+    if plan is None:
+        refresh_band_plan()
+        band_index = rac_band_index
+    else:
+        band_index = _compiled_band_plan(plan)[1]
+    i = bisect.bisect_right(band_index['starts'], frequency_mhz) - 1
+    if i < 0 or not frequency_mhz <= band_index['ends'][i]:  # Written so NaN is outside too
+        return None
+    return band_index['bands'][i], band_index['segments'][i]
+
+
+def bands_for_frequencies(frequencies_mhz, plan=None):
+    """
+    Batch form of band_for_frequency for NumPy arrays.
+
+    Args:
+        frequencies_mhz (array_like): Frequencies in MHz.
+        plan: Country code, IARU region or band plan (see resolve_band_plan). Default None: RAC.
+
+    Returns:
+        numpy.ndarray: Band codes (positions in the band index's 'band_names',
+                       see get_band_index), -1 where the frequency is outside every band.
+    """
+    import numpy as np  # Only needed for batch work
+
+    band_index = _compiled_band_plan(plan)[1]
+    arrays = band_index.get('arrays')
+    if arrays is None:
+        arrays = (
+            np.array(band_index['starts']),
+            np.array(band_index['ends']),
+            np.array(band_index['codes'], dtype=np.int16),
+        )
+        band_index['arrays'] = arrays
+    starts, ends, codes = arrays
+
+    frequencies_mhz = np.asarray(frequencies_mhz, dtype=float)
+    i = np.searchsorted(starts, frequencies_mhz, side='right') - 1
+    inside = (i >= 0) & (frequencies_mhz <= ends[i])  # i == -1 reads the last end, masked anyway
+    return np.where(inside, codes[i], np.int16(-1))
+
+
+@functools.lru_cache(maxsize=32)
+def _format_band_grid(bands, items_per_line, indent):
+    """Formats band names into indented lines; cached because the grid rarely changes."""
+    lines = []
+    for i in range(0, len(bands), items_per_line):
+        line = bands[i:i + items_per_line]
+        lines.append(indent + ", ".join(line) + "\n")
+    return "".join(lines)
+
+
+def display_bands(band_plan, items_per_line=12, indent="\t", as_string=False):  # Added indent
+    """
+    Displays the band plan with a specified number of items per line.
+
+    Args:
+        band_plan (dict): The dictionary containing the band plan.
+        items_per_line (int): The number of bands to display per line.
+        indent (str): String to indent each line with (default tab).
+        as_string (bool): Return the formatted grid instead of drawing it.
+
+    Returns:
+        str: The band grid, one line per row, when as_string is True.
+    """
+    band_grid = _format_band_grid(tuple(band_plan), items_per_line, indent)
+    if as_string:
+        return band_grid
+    screen.draw(band_grid)
+
+
+INVALID_BAND_MESSAGE = ("\nInvalid band choice.\n Wrong Number or Missing Unit Designator (eg: 20m)? "
+                        "\n \t Please Reference provided band list or the RAC website.\n")
+
+
+def main():
+    """
+    Main function to run the Antenna Tool Kit Program.
+
+    Each screen (any result, then the menu and its prompt) is composed in a
+    ScreenFrame and drawn with a single write.
+    """
+    frame = screen.frame(clear=True)
+    greet_user(frame)
+
+    while True:
+        frame.show("\n\n Antenna Tool Kit Program Options:\n",
+                   "\t A: Calculate antenna length from band",
+                   "\t B: Calculate length correction from measured offset",
+                   "\t C: Clear Screen and Start Again",
+                   "\t D: Exit")
+
+        choice = frame.ask("\t\t Enter your choice (A, B, C, or D): ").strip().upper()
+
+        frame = screen.frame(clear=True)  # Clear screen *after* choice
+
+        if choice == 'A':
+            # Option A: Calculate antenna length from band
+            frame.show("\nCalculate Dipole Length for Any of These Available Bands: ")
+            frame.add(display_bands(rac_band_plan, as_string=True))
+            frame.show()  # newline
+            frame.show()  # 2nd Newline
+
+            band_choice = frame.ask("By Entering Your Desired Amateur Radio Band (e.g., 20m, 40m, 160m): ").strip()
+            frequency = get_band_frequency(band_choice)  # Now gets center frequency!
+            if frequency:
+                antenna_length = calculate_dipole_length(frequency)
+                frame.show(f"\n      Here is the Approximate half-wave dipole antenna length for {band_choice}: {antenna_length:.2f} feet.\n")
+                segments = get_band_segments(band_choice)
+                if len(segments) > 1:  # Split bands, e.g. 1.25m
+                    for segment in segments:
+                        frame.show(f"\t {segment['low_mhz']:.3f} - {segment['high_mhz']:.3f} MHz segment: {segment['length_feet']:.2f} feet.")
+                    frame.show()
+            else:
+                frame.show(INVALID_BAND_MESSAGE)
+
+        elif choice == 'B':
+            # Option B: Calculate length correction from measured offset
+            frame.show("\nCalculate Length Correction for Your Chosen Bands, Based on Your Measured Center Resonance : ")
+            frame.add(display_bands(rac_band_plan, as_string=True))
+            frame.show()  # newline
+            frame.show()  # 2nd Newline
+
+            band_choice = frame.ask("Enter the amateur radio band (e.g., 20m, 40m, 160m): ").strip()
+            target_frequency = get_band_resonance_center_frequency(band_choice)
+
+            if target_frequency is None:
+                frame.show(INVALID_BAND_MESSAGE)
+                continue  # Restart the main loop
+
+            frame.show(f"\nExpected Band Resonance is {target_frequency:.3f} MHz")
+
+            measured_reply = frame.ask(f"------ Enter the measured resonance center frequency for {band_choice} (in MHz, or a VNA sweep file): ").strip()
+            try:
+                measured_frequency = float(measured_reply)
+
+            except ValueError:
+                if not os.path.isfile(measured_reply):
+                    frame.show("\nInvalid input. Please enter a numeric value for the frequency.\n")
+                    continue  # Restart the main loop
+                import DipoleToolKit_Vna  # Only sweep files need NumPy
+                try:
+                    resonance = DipoleToolKit_Vna.sweep_resonance(measured_reply)
+                except (OSError, ValueError) as error:
+                    frame.show(f"\nCannot read the sweep file: {error}\n")
+                    continue  # Restart the main loop
+                measured_frequency = resonance['frequency_mhz']
+                frame.show(f"\nSweep resonance (SWR {resonance['swr']:.2f}) is {measured_frequency:.3f} MHz")
+
+            length_correction_feet = calculate_length_correction(target_frequency, measured_frequency)
+
+            if length_correction_feet is not None:
+                length_correction_inches = length_correction_feet * 12
+                frame.show(f"\nTo correct the dipole's resonant frequency for the {band_choice} band:")
+                if length_correction_feet > 0:
+                    frame.show(f"------ Lengthen the antenna by approximately {length_correction_inches:.2f} inches.")
+                elif length_correction_feet < 0:
+                    frame.show(f"------ Shorten the antenna by approximately {abs(length_correction_inches):.2f} inches.")
+                else:
+                    frame.show("  The antenna length is correct.")
+            else:
+                frame.show("\n  Invalid input.  Cannot calculate correction.\n")
+
+        elif choice == 'C':
+            greet_user(frame)  # The new frame already clears the screen
+
+        elif choice == 'D':
+            frame.show("\nExiting Antenna Tool Kit Program. 73!\n")
+            frame.flush()
+            break
+
+        else:
+            frame.show("\nInvalid choice. Please enter A, B, C, or D.\n")
+
+
+# Columns written by the batch commands, in output order
+BATCH_FIELDS = {
+    'length': ['band', 'frequency_mhz', 'length_feet', 'error'],
+    'correct': ['band', 'target_mhz', 'measured_mhz', 'correction_feet', 'correction_inches', 'error'],
+}
+
+
+def _row_frequency(row, column):
+    """Reads a frequency column from a batch row; None when it is blank or missing."""
+    value = row.get(column)
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise TypeError(f"{column} must be a number")
+    frequency = float(value)
+    if not math.isfinite(frequency):
+        raise ValueError(f"{column} must be finite")
+    return frequency
+
+
+def batch_length_row(row, model=None):
+    """
+    Calculates the dipole length for one batch row (Option A without the prompts).
+
+    Args:
+        row (dict): Either a 'band' (e.g. '20m') or a 'frequency' in MHz.
+        model (str or AntennaModel): Antenna model (default None: the 468 / f rule).
+
+    Returns:
+        dict: The output row (see BATCH_FIELDS['length']).
+    """
+    band = row.get('band') or ''
+    if not isinstance(band, str):
+        return {'band': band, 'error': 'invalid band'}
+    if band:
+        frequency = get_band_frequency(band)
+        if frequency is None:
+            return {'band': band, 'error': 'unknown band'}
+    else:
+        try:
+            frequency = _row_frequency(row, 'frequency')
+        except (TypeError, ValueError):
+            frequency = None
+        if frequency is None:
+            return {'band': band, 'error': 'missing or invalid frequency'}
+    if frequency <= 0:
+        return {'band': band, 'frequency_mhz': frequency, 'error': 'frequency must be above 0'}
+    return {'band': band, 'frequency_mhz': frequency,
+            'length_feet': calculate_dipole_length(frequency, model)}
+
+
+def batch_correct_row(row, model=None):
+    """
+    Calculates the length correction for one batch row (Option B without the prompts).
+
+    Args:
+        row (dict): A 'band' (or a target 'frequency' in MHz) and the 'measured'
+                    resonance in MHz.
+        model (str or AntennaModel): Antenna model (default None: the 468 / f rule).
+
+    Returns:
+        dict: The output row (see BATCH_FIELDS['correct']).
+    """
+    band = row.get('band') or ''
+    if not isinstance(band, str):
+        return {'band': band, 'error': 'invalid band'}
+    try:
+        measured_frequency = _row_frequency(row, 'measured')
+        target_frequency = None if band else _row_frequency(row, 'frequency')
+    except (TypeError, ValueError):
+        return {'band': band, 'error': 'invalid frequency'}
+    if band:
+        target_frequency = get_band_resonance_center_frequency(band)
+        if target_frequency is None:
+            return {'band': band, 'error': 'unknown band'}
+    if target_frequency is None or measured_frequency is None:
+        return {'band': band, 'error': 'missing frequency'}
+
+    length_correction_feet = calculate_length_correction(target_frequency, measured_frequency, model)
+    result = {'band': band, 'target_mhz': target_frequency, 'measured_mhz': measured_frequency}
+    if length_correction_feet is None:
+        result['error'] = 'frequencies must be above 0'
+    else:
+        result['correction_feet'] = length_correction_feet
+        result['correction_inches'] = length_correction_feet * 12
+    return result
+
+
+def read_batch_rows(stream, input_format):
+    """
+    Streams rows from a CSV (with a header line) or JSONL input, one at a time.
+
+    A JSONL line that is not valid JSON, or not a JSON object, does not stop
+    the stream: it is yielded as a ValueError saying what is wrong with it.
+
+    Args:
+        stream (file): The open input.
+        input_format (str): 'csv' or 'jsonl'.
+
+    Yields:
+        tuple: (line number, the row as a dict, or a ValueError for an unreadable line).
+    """
+    if input_format == 'jsonl':
+        import json  # Only JSONL needs it
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                row = ValueError(f"invalid JSON ({error})")
+            else:
+                if not isinstance(row, dict):
+                    row = ValueError("not a JSON object")
+            yield line_number, row
+    else:
+        import csv  # Only CSV needs it
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def _batch_results(numbered_rows, row_function):
+    """Runs a batch row function over read_batch_rows; error rows get their input line number."""
+    for line_number, row in numbered_rows:
+        result = {'error': str(row)} if isinstance(row, ValueError) else row_function(row)
+        if 'error' in result:
+            result['error'] = f"line {line_number}: {result['error']}"
+        yield result
+
+
+def write_batch_rows(rows, stream, output_format, fieldnames):
+    """
+    Streams result rows out as CSV or JSONL as they are produced.
+
+    Args:
+        rows (iterable): The result rows (dicts).
+        stream (file): The open output.
+        output_format (str): 'csv' or 'jsonl'.
+        fieldnames (list): The CSV columns, in order.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    if output_format == 'jsonl':
+        import json  # Only JSONL needs it
+        for row in rows:
+            stream.write(json.dumps(row) + '\n')
+            count += 1
+    else:
+        import csv  # Only CSV needs it
+        writer = csv.DictWriter(stream, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _guess_format(path):
+    """Picks 'jsonl' for .jsonl/.json files and 'csv' for everything else (including stdin)."""
+    return 'jsonl' if path.endswith(('.jsonl', '.json')) else 'csv'
+
+
+def _add_batch_arguments(command):
+    """Arguments of the length and correct commands."""
+    command.add_argument('input', nargs='?', default='-',
+                         help="CSV or JSONL file of rows, or '-' for stdin (default)")
+    command.add_argument('-o', '--output', default='-',
+                         help="Where to write results, or '-' for stdout (default)")
+    command.add_argument('--format', choices=('csv', 'jsonl'),
+                         help="Input format (default: from the file name, CSV for stdin)")
+    command.add_argument('--output-format', choices=('csv', 'jsonl'),
+                         help="Output format (default: same as the input)")
+    command.add_argument('--model', choices=sorted(antenna_models),
+                         help="Antenna model (default: the 468 / f rule)")
+
+
+def _add_sweep_arguments(command):
+    """Arguments of the sweep command."""
+    command.add_argument('band', help="The band the antenna is cut for (e.g. 40m)")
+    command.add_argument('files', nargs='+', help="Touchstone .s1p files or NanoVNA CSV exports")
+
+
+def _add_analyze_arguments(command):
+    """Arguments of the analyze command."""
+    command.add_argument('directory', help="Top directory of the sweep archive (.s1p and .csv files)")
+    command.add_argument('-o', '--output', default='-', help="JSON lines output file, or '-' for stdout (default)")
+    command.add_argument('--workers', type=int, help="Processes to use (default: every available core)")
+    command.add_argument('--chunk-size', type=int, default=32, help="Files per task (default 32)")
+
+
+def _add_logs_arguments(command):
+    """Arguments of the logs command."""
+    command.add_argument('files', nargs='+', help="ADIF (.adi) or Cabrillo (.log/.cbr) files")
+    command.add_argument('-o', '--output', default='-',
+                         help="JSON lines file for the out-of-band QSOs, or '-' for stdout (default)")
+    command.add_argument('--workers', type=int, default=1, help="Processes to use for several files (default 1)")
+    command.add_argument('--plan', help="Band plan: country code (e.g. US) or IARU region (e.g. R1) (default: RAC)")
+
+
+def _add_build_cache_arguments(command):
+    """Arguments of the build-cache command."""
+    command.add_argument('-o', '--output', help="Cache file (default: bandplans.cache in BandPlans/)")
+
+
+def _add_cluster_arguments(command):
+    """Arguments of the cluster command."""
+    command.add_argument('host', help="DX cluster host")
+    command.add_argument('port', type=int, help="DX cluster telnet port")
+    command.add_argument('--login', help="Callsign to log in with")
+    command.add_argument('--bands', nargs='+', help="Bands to keep (default: every band in the plan)")
+    command.add_argument('--plan', help="Band plan: country code (e.g. US) or IARU region (e.g. R1) (default: RAC)")
+    command.add_argument('--antenna', type=float, action='append', default=[],
+                         help="Length in feet of a dipole we have up (repeat for several)")
+
+
+def _add_replay_arguments(command):
+    """Arguments of the replay command."""
+    command.add_argument('file', help="Recorded spot file (one cluster line per line)")
+    command.add_argument('--port', type=int, default=7300, help="Port to listen on (default 7300)")
+    command.add_argument('--rate', type=float, help="Lines per second (default: as fast as the client reads)")
+    command.add_argument('--repeat', type=int, default=1, help="Times to play the file (default 1)")
+
+
+def _add_trim_arguments(command):
+    """Arguments of the trim command."""
+    command.add_argument('session', help="Trim session file (JSON); created on first use")
+    command.add_argument('--band', help="Band the antenna is cut for (needed to start a session)")
+    command.add_argument('--name', default='', help="Label for a new session's antenna")
+    command.add_argument('--length', type=float, help="Antenna length now, in feet")
+    command.add_argument('--measured', type=float, help="Measured resonance now, in MHz")
+
+
+def _add_serve_arguments(command):
+    """Arguments of the serve command."""
+    command.add_argument('--host', default='127.0.0.1', help="Address to listen on (default 127.0.0.1)")
+    command.add_argument('--port', type=int, default=8073, help="Port to listen on (default 8073)")
+
+
+def _help_formatter(prog):
+    """
+    argparse's help formatter, sized to the terminal without importing shutil.
+
+    argparse makes a formatter for every argument it adds, and the first one
+    imports shutil (and with it bz2, lzma and fnmatch) just to read the
+    terminal width: a noticeable share of a short command's run time.
+    """
+    import argparse
+
+    try:
+        columns = int(os.environ['COLUMNS'])
+    except (KeyError, ValueError):
+        try:
+            columns = os.get_terminal_size(sys.__stdout__.fileno()).columns
+        except (AttributeError, ValueError, OSError):
+            columns = 80
+    return argparse.HelpFormatter(prog, width=max(columns, 1) - 2)
+
+
+def build_parser(command_name=None):
+    """
+    Builds the command line parser for the non-interactive commands.
+
+    Setting up every subcommand's arguments costs more than most commands
+    take to run, so with a command name only that subcommand is set up.
+
+    Args:
+        command_name (str): The subcommand about to run. Default None builds them all (e.g. for --help).
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    import argparse  # Not needed by the interactive menu
+
+    parser = argparse.ArgumentParser(
+        prog='DipoleToolKit_v7.py',
+        description="Antenna Tool Kit. Run with no command for the interactive menu.",
+        formatter_class=_help_formatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, (help_text, add_arguments, _) in COMMANDS.items():
+        if command_name is None or name == command_name:
+            add_arguments(commands.add_parser(name, help=help_text, formatter_class=_help_formatter))
+    return parser
+
+
+def run_command(argv):
+    """
+    Runs a non-interactive command, e.g. ``length bands.csv -o lengths.csv``.
+
+    Only the command's own runner is called, and each runner imports the
+    companion modules it needs, so a command never pays for another's imports.
+
+    Args:
+        argv (list): The command line arguments (without the program name).
+
+    Returns:
+        int: The exit status.
+    """
+    command_name = argv[0] if argv and argv[0] in COMMANDS else None
+    args = build_parser(command_name).parse_args(argv)
+    return COMMANDS[args.command][2](args)
+
+
+def run_sweep(args):
+    """
+    Runs the sweep command: one JSON line per sweep file with its resonance and correction.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status (1 if any file could not be used).
+    """
+    import json
+    import DipoleToolKit_Vna  # Only sweep files need NumPy
+
+    if get_band_resonance_center_frequency(args.band) is None:
+        print(f"Unknown band: {args.band}", file=sys.stderr)
+        return 1
+    status = 0
+    for path in args.files:
+        try:
+            result = DipoleToolKit_Vna.sweep_length_correction(path, args.band)
+        except (OSError, ValueError) as error:
+            result = {'band': args.band, 'error': str(error)}
+            status = 1
+        result['file'] = path
+        print(json.dumps(result))
+    return status
+
+
+def run_analyze(args):
+    """
+    Runs the analyze command over a sweep archive.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status.
+    """
+    import DipoleToolKit_Vna  # Only sweep files need NumPy
+
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 1
+    try:
+        output_stream = sys.stdout if args.output == '-' else open(args.output, 'w')
+    except OSError as error:
+        print(f"Cannot open file: {error}", file=sys.stderr)
+        return 1
+    try:
+        counts = DipoleToolKit_Vna.analyze_sweep_archive(args.directory, output_stream,
+                                                         args.workers, args.chunk_size)
+    finally:
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    print(f"Analysed {counts['files']} sweep files ({counts['errors']} unreadable).", file=sys.stderr)
+    return 0
+
+
+def run_logs(args):
+    """
+    Runs the logs command: writes the out-of-band QSOs and prints the per-band counts.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status (1 if a log could not be read).
+    """
+    import DipoleToolKit_Logs  # Only log checking needs NumPy
+
+    try:
+        get_band_table(args.plan)
+    except ValueError as error:  # Unknown country or region
+        print(error, file=sys.stderr)
+        return 1
+    try:
+        output_stream = sys.stdout if args.output == '-' else open(args.output, 'w')
+    except OSError as error:
+        print(f"Cannot open file: {error}", file=sys.stderr)
+        return 1
+    try:
+        totals = DipoleToolKit_Logs.classify_logs(args.files, output_stream, args.workers, args.plan)
+    except (OSError, ValueError) as error:
+        print(f"Cannot read log: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    print(f"Checked {totals['records']} QSOs in {totals['files']} log(s): {totals['out_of_band']} out of band,"
+          f" {totals['no_frequency']} without a frequency.", file=sys.stderr)
+    for band, count in totals['per_band'].items():
+        print(f"\t{band}: {count}", file=sys.stderr)
+    return 0
+
+
+def run_build_cache(args):
+    """
+    Runs the build-cache command: compiles the band plans into the binary cache.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status.
+    """
+    try:
+        built = build_band_plan_cache(args.output)
+    except (OSError, ValueError) as error:
+        print(f"Cannot build the band plan cache: {error}", file=sys.stderr)
+        return 1
+    print(f"Cached {len(built['plans'])} band plans in {built['path']}: {', '.join(built['plans'])}")
+    if built['skipped']:
+        print(f"Not cached (parsed as before): {', '.join(built['skipped'])}")
+    return 0
+
+
+def run_cluster(args):
+    """
+    Runs the cluster command: prints each matching spot as a JSON line until the feed ends.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status.
+    """
+    import asyncio
+    import json
+    import DipoleToolKit_Cluster  # Only the cluster tools need asyncio
+
+    try:
+        unknown = [band for band in args.bands or ()
+                   if get_band_resonance_center_frequency(band, plan=args.plan) is None]
+    except ValueError as error:  # Unknown country or region
+        print(error, file=sys.stderr)
+        return 1
+    if unknown:
+        print(f"Unknown band: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+    client = DipoleToolKit_Cluster.ClusterClient(
+        DipoleToolKit_Cluster.SpotFilter(args.bands, args.antenna, plan=args.plan))
+    spots = client.subscribe()
+
+    async def show():
+        while True:
+            spot = await spots.get()
+            if spot is None:
+                return
+            del spot['received']
+            print(json.dumps(spot), flush=True)
+
+    async def follow():
+        await asyncio.gather(client.connect(args.host, args.port, args.login), show())
+
+    try:
+        asyncio.run(follow())
+    except KeyboardInterrupt:
+        pass
+    except OSError as error:
+        print(f"Cluster connection error: {error}", file=sys.stderr)
+        return 1
+    print(f"{client.passed} of {client.spots} spots shown. 73!", file=sys.stderr)
+    return 0
+
+
+def run_replay(args):
+    """
+    Runs the replay command: plays a recorded spot file as a local stand-in DX cluster.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status.
+    """
+    import DipoleToolKit_Cluster  # Only the cluster tools need asyncio
+
+    return DipoleToolKit_Cluster.run_replay_server(args.file, port=args.port, rate=args.rate, repeat=args.repeat)
+
+
+def run_serve(args):
+    """
+    Runs the serve command: the HTTP/JSON service, until interrupted.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status.
+    """
+    import DipoleToolKit_Service  # Only the service needs asyncio
+
+    return DipoleToolKit_Service.run_service(args.host, args.port)
+
+
+def run_trim(args):
+    """
+    Runs the trim command: records a measurement in a trim session and shows the next cut.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status.
+    """
+    from DipoleToolKit_TrimSession import TrimSession
+
+    try:
+        if os.path.exists(args.session):
+            session = TrimSession.load(args.session)
+        else:
+            session = TrimSession(args.band, name=args.name)
+        if args.length is not None or args.measured is not None:
+            if args.length is None or args.measured is None:
+                print("Give both --length and --measured to record a measurement.", file=sys.stderr)
+                return 1
+            session.record(args.length, args.measured)
+        session.save(args.session)
+    except (OSError, ValueError, KeyError) as error:
+        print(f"Trim session error: {error}", file=sys.stderr)
+        return 1
+
+    print(f"\n{session.name or 'Antenna'} ({session.band or 'custom'}): target {session.target_mhz:.3f} MHz,"
+          f" {session.count} measurement(s).")
+    correction_feet = session.next_correction()
+    if correction_feet is None:
+        print("------ Record a measurement with --length and --measured.\n")
+        return 0
+    a, b = session.fit()
+    print(f"------ Learned fit: length = {a:.1f} / f {'+' if b >= 0 else '-'} {abs(b):.3f} feet"
+          f" (the ideal rule is 468 / f).")
+    print(f"------ Cut to {session.predicted_length():.3f} feet:"
+          f" {'lengthen' if correction_feet > 0 else 'shorten'} by approximately {abs(correction_feet) * 12:.2f} inches"
+          f" (468 / f alone says {session.ideal_correction() * 12:+.2f} inches).\n")
+    return 0
+
+
+def run_batch(args):
+    """
+    Runs the length or correct batch command.
+
+    Args:
+        args (argparse.Namespace): The parsed command line (see build_parser).
+
+    Returns:
+        int: The exit status.
+    """
+    import csv  # For csv.Error; the menu does not need it
+
+    row_function = batch_length_row if args.command == 'length' else batch_correct_row
+    if args.model:
+        row_function = functools.partial(row_function, model=args.model)
+    input_format = args.format or _guess_format(args.input)
+    output_format = args.output_format or input_format
+
+    try:
+        input_stream = sys.stdin if args.input == '-' else open(args.input, newline='')
+        output_stream = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    except OSError as error:
+        print(f"Cannot open file: {error}", file=sys.stderr)
+        return 1
+
+    try:
+        rows = _batch_results(read_batch_rows(input_stream, input_format), row_function)
+        write_batch_rows(rows, output_stream, output_format, BATCH_FIELDS[args.command])
+    except (ValueError, csv.Error) as error:  # Unreadable input (e.g. a broken CSV file)
+        print(f"Invalid input: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 0
+
+
+# Subcommand -> (help, adds its arguments, runs it)
+COMMANDS = {
+    'length': ("Dipole lengths from 'band' or 'frequency' columns (Option A)", _add_batch_arguments, run_batch),
+    'correct': ("Length corrections from 'band' (or 'frequency') and 'measured' columns (Option B)",
+                _add_batch_arguments, run_batch),
+    'sweep': ("Resonance and length correction from VNA sweep files (Option B)", _add_sweep_arguments, run_sweep),
+    'analyze': ("Analyse a directory of archived sweeps in parallel", _add_analyze_arguments, run_analyze),
+    'logs': ("Check ADIF/Cabrillo logs against the band plan", _add_logs_arguments, run_logs),
+    'build-cache': ("Compile the band plans into a binary cache for fast loading", _add_build_cache_arguments,
+                    run_build_cache),
+    'cluster': ("Show DX cluster spots on the bands our antennas cover", _add_cluster_arguments, run_cluster),
+    'replay': ("Play a recorded spot file as a local stand-in DX cluster", _add_replay_arguments, run_replay),
+    'trim': ("Record a cut/measure cycle and predict the next cut", _add_trim_arguments, run_trim),
+    'serve': ("Serve the calculations as HTTP/JSON on localhost", _add_serve_arguments, run_serve),
+}
+
+
+if __name__ == "__main__":
+    sys.modules.setdefault('DipoleToolKit_v7', sys.modules[__name__])  # Companion modules share this copy
+    if len(sys.argv) > 1:
+        sys.exit(run_command(sys.argv[1:]))
+    main()